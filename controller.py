@@ -19,13 +19,13 @@
 # Imports #
 ###########
 # Standard library
+import contextlib
 import datetime
 import json
 import logging.config
 import logging.handlers
 import os
 import sys
-import time
 import tkinter as tk
 import webbrowser
 from pathlib import Path
@@ -84,6 +84,19 @@ class Application(tk.Tk):
         # Intervals
         self.INTERVALS = [1, 2]
 
+        # Trial functions profiled when the profiling setting is on
+        # (in addition to the bound event callbacks)
+        self.PROFILED_METHODS = [
+            'start_new_run',
+            '_new_trial',
+            '_present_trial_audio',
+            'present_audio',
+            '_on_submit',
+            '_save_trial_data',
+            '_calc_level',
+            'bind_keys',
+        ]
+
         ######################################
         # Initialize Models, Menus and Views #
         ######################################
@@ -116,11 +129,17 @@ class Application(tk.Tk):
             app_name=self.NAME
             )
         self._load_settings()
+        self.settings_store = models.SettingsStore(
+            root=self,
+            settings_model=self.settings_model,
+            settings=self.settings
+        )
 
         # Set up custom logger as soon as config dir is created
         # (i.e., after settings model has been initialized)
         config = tmpy.functions.logging_funcs.setup_logging(self.NAME)
         logging.config.dictConfig(config)
+        self.config_dir = self._find_config_dir(config)
         logger.debug("Started custom logger")
         logger.debug("Initializing Application")
 
@@ -128,7 +147,26 @@ class Application(tk.Tk):
         #self.calmodel = calmodel.CalModel(self.settings)
 
         # Load stimulus model
-        self.stim_model = models.StimulusModel(self.settings)
+        self.stim_model = models.StimulusModel(
+            self.settings,
+            dtype=self.settings['audio_dtype'].get()
+        )
+
+        # Session audio stream (opened when the task starts): a sound
+        # device, or a null/WAV sink (see the audio_backend setting)
+        self.stream = None
+
+        # Trial data writer (created when the task starts)
+        self.record_writer = None
+
+        # Per-trial timing (created with the record writer)
+        self.trial_timer = None
+
+        # Staircases of an interleaved session (see _start_interleaved)
+        self.interleaver = None
+
+        # Load trial renderer
+        self.renderer = models.TrialRenderer(fs=self.FS)
 
         # Load main view
         self.main_frame = views.MainView(self)
@@ -176,6 +214,18 @@ class Application(tk.Tk):
             '<<MainSubmit>>': lambda _: self._on_submit(),
         }
 
+        # Profile callbacks and trial functions if requested. When
+        # profiling is off nothing is wrapped.
+        self.profiler = None
+        if self.settings['profiling'].get():
+            logger.info("Profiling callbacks")
+            self.profiler = models.CallbackProfiler()
+            self.profiler.wrap_methods(self, self.PROFILED_METHODS)
+            event_callbacks = {
+                sequence: self.profiler.wrap(callback)
+                for sequence, callback in event_callbacks.items()
+            }
+
         # Bind callbacks to sequences
         logger.debug("Binding callbacks to controller")
         for sequence, callback in event_callbacks.items():
@@ -275,8 +325,61 @@ class Application(tk.Tk):
 
     def _quit(self):
         """ Exit the application. """
+        # Stop any trial in progress
+        try:
+            self.timeline.cancel()
+        except AttributeError:
+            pass
+        if self.stream is not None:
+            self.stream.close()
+        self.settings_store.flush()
+        if self.record_writer is not None:
+            try:
+                self.record_writer.close(timeout=10)
+            except Exception as e:
+                logger.error("Data may not have been saved: %s", e)
+        if self.trial_timer is not None:
+            try:
+                self.trial_timer.close(timeout=10)
+            except Exception as e:
+                logger.error("Trial timing may not have been saved: %s", e)
+        if self.profiler is not None:
+            try:
+                self.profiler.dump(
+                    self._get_profile_dir(),
+                    name=f"{self.settings['subject'].get()}_"
+                         f"{self.settings['condition'].get()}"
+                )
+            except OSError as e:
+                logger.error("Cannot write profile: %s", e)
         self.destroy()
 
+    @staticmethod
+    def _find_config_dir(log_config):
+        """ Config directory (settings and logs): the folder of the
+            log file set up by setup_logging.
+        """
+        for handler in log_config.get('handlers', {}).values():
+            if 'filename' in handler:
+                return os.path.dirname(os.path.abspath(handler['filename']))
+        logger.warning("No log file configured; using the working "
+                       "directory as the config directory")
+        return os.getcwd()
+
+
+    def _get_profile_dir(self):
+        """ Profiles folder in the config directory. """
+        return os.path.join(self.config_dir, 'profiles')
+
+
+    def _unprofiled(self):
+        """ Context manager that leaves a blocking wait (a modal
+            dialog or plot window) out of the profile.
+        """
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.paused()
+
     ###################
     # File Menu Funcs #
     ###################
@@ -297,64 +400,196 @@ class Application(tk.Tk):
             # Query AFTER the task starts to capture updates to sessioninfo
             self.freqs, self.NUM_FREQS = self.stim_model.get_test_freqs()
 
+            # Create the data file writer
+            self._create_record_writer()
+
+            # Open the audio stream now, so the device is running
+            # before the first trial
+            self._warm_up_stream()
+
             # Set first run flag to False
             self._first_run_flag = False
+
+            # Run all frequencies at once
+            if self.settings['interleave_policy'].get() != 'Off':
+                self._start_interleaved()
+                return
             
         # Get next frequency or end
         try:
             self.current_freq = self.freqs.pop(0)
             logger.debug("Testing %d Hz", self.current_freq)
-            messagebox.showinfo(
-                title="Ready",
-                message="When you are ready, close this window to continue."
-            )
+            # Synthesize the stimulus while the participant reads
+            self._prefetch_stimulus(self.current_freq)
+            with self._unprofiled():
+                messagebox.showinfo(
+                    title="Ready",
+                    message="When you are ready, close this window to "
+                        "continue."
+                )
+            # Waiting for the participant is not trial overhead
+            self.trial_timer.unmark('response')
         except IndexError:
             logger.debug("Session ended successfully by start_new_run")
-            messagebox.showinfo(
-                title="Task Complete",
-                message="You have finished this task. Please let the "
-                    "investigator know."
-            )
+            with self._unprofiled():
+                messagebox.showinfo(
+                    title="Task Complete",
+                    message="You have finished this task. Please let the "
+                        "investigator know."
+                )
             self._quit()
             return
 
+        # Freeze the session settings for this run
+        self.snapshot = models.SessionSnapshot.from_settings(
+            self.settings, test_freq=self.current_freq)
+
         # Generate stimulus
-        self.stim = self.stim_model.create_stimulus(
+        self.stim = self._create_stimulus(self.current_freq)
+
+        # Synthesize the next frequency during this staircase
+        if self.freqs:
+            self._prefetch_stimulus(self.freqs[0])
+
+        # Update progress bar
+        self._advance_progress_bar()
+
+        # Create staircase and precompute its presentation levels
+        self.staircase = self._create_staircase()
+        self.level_plan = self._create_level_plan(
+            self.current_freq, self.stim)
+
+        # Start first trial
+        self._new_trial()
+
+
+    def _start_interleaved(self):
+        """ Run one staircase per test frequency at the same time,
+            choosing the frequency of each trial with the interleaving
+            policy. All stimuli are synthesized up front.
+        """
+        policy = self.settings['interleave_policy'].get()
+        logger.debug("Starting interleaved run (%s)", policy)
+        try:
+            self.interleaver = models.InterleavedStaircases(
+                [(freq, self._create_staircase()) for freq in self.freqs],
+                policy=policy.lower().replace(' ', '_'))
+        except ValueError as e:
+            logger.error("Cannot interleave: %s", e)
+            messagebox.showerror(
+                title="Invalid Frequencies",
+                message="Each test frequency can only be used once " +
+                    "when interleaving.",
+                detail=e
+            )
+            # Let the user fix the settings and start again
+            self.interleaver = None
+            self._first_run_flag = True
+            self.menu.file_menu.entryconfig('Start Task', state='normal')
+            self.show_settings_view()
+            return
+
+        for freq in self.freqs:
+            self._prefetch_stimulus(freq)
+        with self._unprofiled():
+            messagebox.showinfo(
+                title="Ready",
+                message="When you are ready, close this window to continue."
+            )
+
+        self.stimuli = dict()
+        self.snapshots = dict()
+        self.level_plans = dict()
+        for freq in self.freqs:
+            self.stimuli[freq] = self._create_stimulus(freq)
+            self.snapshots[freq] = models.SessionSnapshot.from_settings(
+                self.settings, test_freq=freq)
+            self.level_plans[freq] = self._create_level_plan(
+                freq, self.stimuli[freq])
+
+        # Nothing is left for start_new_run but to end the session
+        self.freqs = []
+
+        # Start first trial
+        self._new_trial()
+
+
+    def _select_interleaved_track(self):
+        """ Make the next frequency's staircase the current one. """
+        freq = self.interleaver.next_freq()
+        self.current_freq = freq
+        self.staircase = self.interleaver.staircase
+        self.stim = self.stimuli[freq]
+        self.snapshot = self.snapshots[freq]
+        self.level_plan = self.level_plans[freq]
+
+
+    def _create_stimulus(self, freq):
+        """ Synthesize (or fetch) the stimulus for freq. """
+        return self.stim_model.create_stimulus(
             dur=self.settings['duration'].get(),
             fs=self.FS,
-            fc=self.current_freq,
+            fc=freq,
             mod_rate=5,
             mod_depth=5
         )
 
-        # Update progress bar
+
+    def _advance_progress_bar(self):
+        """ Add one frequency to the progress bar. """
         if self.progress_bar['value'] < 100:
             self.progress_bar['value'] += 100/self.NUM_FREQS
 
-        # Convert step_sizes to list of ints
-        steps = self.settings['step_sizes'].get()
-        steps = [int(val) for val in steps.split(', ')]
-
-        # Create staircase
-        self.staircase = tmpy.handlers.StaircaseHandler(
-            start_val=self.settings['starting_level'].get(),
-            step_sizes=steps,
-            nUp=1,
-            nDown=2,
-            nTrials=0,
-            nReversals=self.settings['num_reversals'].get(),
-            rapid_descend=self.settings['rapid_descend_bool'].get(),
-            min_val=self.settings['min_level'].get(),
-            max_val=self.settings['max_level'].get()
+
+    def _create_staircase(self):
+        """ Create a staircase (or QUEST track, depending on the
+            estimator setting) with the current settings.
+        """
+        return models.create_staircase(self.settings)
+
+
+    def _create_level_plan(self, freq, stim):
+        """ Precompute presentation levels for freq and warn about
+            levels that would clip.
+        """
+        level_plan = models.create_level_plan(
+            settings=self.settings,
+            stim_model=self.stim_model,
+            freq=freq,
+            calc_level=self._calc_level,
+            crest_factor_db=models.levelplanner.crest_factor_db(stim)
         )
+        clipping = level_plan.clipping_levels()
+        if clipping.size:
+            logger.warning("Staircase levels %s dB will clip at %d Hz",
+                           clipping, freq)
+            messagebox.showwarning(
+                title="Clipping",
+                message=f"Staircase levels of {clipping[0]:g} dB and " +
+                    f"above will clip at {freq} Hz.",
+                detail="Lower the maximum level or recalibrate."
+            )
+        return level_plan
 
-        # Start first trial
-        self._new_trial()
+
+    def _prefetch_stimulus(self, freq):
+        """ Start synthesizing the stimulus for freq in the background. """
+        self.stim_model.prefetch(
+            dur=self.settings['duration'].get(),
+            fs=self.FS,
+            fc=freq,
+            mod_rate=5,
+            mod_depth=5
+        )
 
 
     def _new_trial(self):
         """ Present a 2IAFC trial. """
         logger.debug("Presenting next trial")
+        # Choose the next frequency when interleaving
+        if self.interleaver is not None:
+            self._select_interleaved_track()
+
         # Print message to console
         logger.debug("Trial %d: %d Hz", self.trial, self.current_freq)
 
@@ -364,15 +599,22 @@ class Application(tk.Tk):
         )
         logger.debug("Stimulus is in interval %d", self.stim_interval)
 
-        # Calculate the RETSPL-adjusted, single channel level
-        final_single_chan_level = self.stim_model.calc_presentation_lvl(
-            stair_lvl=self.staircase.current_level,
-            freq = self.current_freq
-        )
-
-        # Apply offset to desired dB level
-        # (Also update settings)
-        self._calc_level(final_single_chan_level)
+        # Record the staircase level for this trial
+        # (the staircase moves on as soon as a response is added)
+        self.staircase_level = self.staircase.current_level
+
+        # Look up the RETSPL-adjusted, single channel level and the
+        # offset (dB FS) level for this staircase level
+        with self.trial_timer.measure('level'):
+            desired, adjusted = models.trial_levels(
+                level_plan=self.level_plan,
+                stim_model=self.stim_model,
+                freq=self.current_freq,
+                staircase_level=self.staircase.current_level,
+                calc_level=self._calc_level
+            )
+            self.settings['desired_level_dB'].set(desired)
+            self.settings['adjusted_level_dB'].set(adjusted)
 
         # # Print values to console
         # print(f"Staircase level: {self.staircase.current_level}")
@@ -380,39 +622,48 @@ class Application(tk.Tk):
         # print(f"Scaled final single chan level: " +
         #       f"{self.settings['adjusted_level_dB'].get()}")
 
-        # Pause
-        time.sleep(0.5)
-        
-        # Interval 1
-        self.main_frame.interval_1_colors()
-        if self.stim_interval == 1:
-            self.present_audio(
-                audio=self.stim,
-                pres_level=self.settings['adjusted_level_dB'].get(),
-                sampling_rate=self.FS
+        # Render the whole trial into one buffer:
+        # 0.5 s lead-in, interval 1, 0.5 s ISI, interval 2
+        interval_dur = self.settings['duration'].get() + 0.15
+        with self.trial_timer.measure('render'):
+            trial_audio, bounds = self.renderer.render(
+                stim=self.stim,
+                stim_interval=self.stim_interval,
+                interval_dur=interval_dur
             )
-        time.sleep(self.settings['duration'].get() + 0.15)
+            pres_level = self.renderer.buffer_level(
+                self.settings['adjusted_level_dB'].get())
+
+        # Submit the audio once and drive the visual cues from the
+        # interval boundaries of the buffer
+        self.timeline = models.TrialTimeline(self, f"Trial {self.trial + 1}")
+        self.timeline.add(0, lambda: self._present_trial_audio(
+            audio=trial_audio,
+            pres_level=pres_level
+            ), 'audio')
+        self.timeline.add(bounds[1][0], self.main_frame.interval_1_colors,
+                          'interval 1')
+        self.timeline.add(bounds[1][1], self.main_frame.clear_interval_colors,
+                          'ISI')
+        self.timeline.add(bounds[2][0], self.main_frame.interval_2_colors,
+                          'interval 2')
+        self.timeline.add(bounds[2][1], self.main_frame.clear_interval_colors,
+                          'end')
 
-        # ISI
-        self.main_frame.clear_interval_colors()
-        time.sleep(0.5)
+        # Wait to bind keys until after trial has finished
+        #   to avoid multiple submissions during the presentation
+        self.timeline.start(on_done=lambda: self.after(10, self.bind_keys))
 
-        # Interval 2
-        self.main_frame.interval_2_colors()
-        if self.stim_interval == 2:
+    def _present_trial_audio(self, audio, pres_level):
+        """ Present the trial buffer and end the trial's timing row. """
+        with self.trial_timer.measure('audio_submit'):
             self.present_audio(
-                audio=self.stim,
-                pres_level=self.settings['adjusted_level_dB'].get(),
+                audio=audio,
+                pres_level=pres_level,
                 sampling_rate=self.FS
             )
-        time.sleep(self.settings['duration'].get() + 0.15)
-
-        # End
-        self.main_frame.clear_interval_colors()
-
-        # Wait to bind keys until after trial has finished
-        #   to avoid multiple submissions during the presentation
-        self.after(10, lambda: self.bind_keys())
+        self.trial_timer.mark('onset')
+        self.trial_timer.end_trial(self.trial + 1)
 
     ######################
     # MainView Functions #
@@ -435,16 +686,25 @@ class Application(tk.Tk):
             Present next trial.
         """
         logger.debug("Submit button pressed")
+        # Start of the response-to-onset time of the next trial
+        self.trial_timer.mark('response')
+
         # Assign response value
+        # (the interleaver also keeps per-frequency counts)
+        add_response = self.staircase.add_response
+        if self.interleaver is not None:
+            add_response = self.interleaver.add_response
         if (self.response == 1) and (self.stim_interval == 1):
-            self.staircase.add_response(1)
+            add_response(1)
         elif (self.response == 2) and (self.stim_interval == 2):
-            self.staircase.add_response(1)
+            add_response(1)
         else: 
-            self.staircase.add_response(-1)
+            add_response(-1)
 
-        # Save the trial data
-        self._save_trial_data()
+        # Save the trial data (the app is closed if that fails)
+        with self.trial_timer.measure('save'):
+            if not self._save_trial_data():
+                return
 
         # Update trial counter
         self.trial += 1
@@ -455,42 +715,53 @@ class Application(tk.Tk):
         # Check for end of staircase
         if not self.staircase.status:
             logger.debug("End of staircase!")
+            # Write this staircase (and settings) to disk
+            with self.trial_timer.measure('flush'):
+                if not self._flush_records():
+                    return
+                self.settings_store.flush()
             if self.settings['disp_plots'].get() == 1:
-                self.staircase.plot_data()
-            # Call start_new_run to get next frequency
-            self.start_new_run()
+                # plot_data() blocks in plt.show()
+                with self._unprofiled():
+                    self.staircase.plot_data()
+                # Looking at the plot is not trial overhead
+                self.trial_timer.unmark('response')
+            if self.interleaver is not None:
+                self._advance_progress_bar()
+            if self.interleaver is not None and self.interleaver.status:
+                # Other frequencies are still running
+                self._new_trial()
+            else:
+                # Call start_new_run to get next frequency
+                self.start_new_run()
         else:
             self._new_trial()
 
 
     def _save_trial_data(self):
-        """ Select data to save and write to CSV. """
-        # Get tk variable values
-        converted = dict()
-        for key in self.settings:
-            converted[key] = self.settings[key].get()
-
-        # Add most recent datapoint object attributes to dict
-        converted.update(self.staircase.dw.datapoints[-1].__dict__)
-
-        # Add 1 to trial number
-        converted['trial'] = self.trial + 1
-
-        # Add current test frequency to dict
-        converted['test_freq'] = self.current_freq
-
-        # Define selected items for writing to file
-        save_list = [
-            'trial', 'subject', 'condition', 'min_level', 'max_level', 
-            'duration', 'step_sizes', 'num_reversals', 'rapid_descend', 
-            'slm_reading', 'cal_level_dB', 'slm_offset', 'adjusted_level_dB',
-             'desired_level_dB', 'test_freq', 'response', 'reversal'
-        ]
+        """ Build the trial record and write to CSV.
 
-        # Create new dict with desired items
+            Returns: False if the app was closed because the record
+                could not be saved
+        """
+        # Run-level values come from the snapshot taken at the
+        # start of the run; only per-trial values are read here
+        datapoint = self.staircase.dw.datapoints[-1]
         try:
-            data = dict((k, converted[k]) for k in save_list)
-        except KeyError as e:
+            desired = self.settings['desired_level_dB'].get()
+            data = self.snapshot.record(
+                trial=self.trial + 1,
+                adjusted_level_dB=self.settings['adjusted_level_dB'].get(),
+                desired_level_dB=desired,
+                response=datapoint.response,
+                reversal=datapoint.reversal,
+                # Level of the staircase itself (before RETSPL/calibration)
+                staircase_level=self.staircase_level,
+                # Posterior estimate (QUEST only)
+                **models.estimate_fields(self.staircase, desired,
+                                         self.staircase_level)
+            )
+        except (AttributeError, KeyError) as e:
             logger.error("Unexpected variable when attempting " +
                   "to save: %s", e)
             messagebox.showerror(
@@ -499,21 +770,64 @@ class Application(tk.Tk):
                 detail=f'{e} is undefined.'
             )
             self.destroy()
-            return
+            return False
 
-        # Write data to file
-        logger.debug("Attempting to save record")
+        # Queue data for writing to file
+        logger.debug("Queueing record (%d waiting)",
+                     self.record_writer.queue_depth)
+        # Any error from the writer thread is raised here
         try:
-            self.csvmodel.save_record(data)
-        except PermissionError as e:
-            print(e)
-            messagebox.showerror(
-                title="Access Denied",
-                message="Data not saved! Cannot write to file!",
-                detail=e
-            )
-            self.destroy()
-            return
+            self.record_writer.write(data)
+        except Exception as e:
+            self._show_write_error(e)
+            return False
+        return True
+
+
+    def _create_record_writer(self):
+        """ Create the background CSV writer for this session. """
+        datestamp = datetime.datetime.now().strftime("%Y_%m_%d_%H%M")
+        filename = (f"{datestamp}_{self.settings['subject'].get()}_"
+                    f"{self.settings['condition'].get()}.csv")
+        self.record_writer = models.RecordWriter(
+            os.path.join('Data', filename))
+        logger.debug("Saving data to %s", self.record_writer.filepath)
+
+        # Timing sidecar, in a folder that scoring skips
+        self.trial_timer = models.TrialTimer(os.path.join(
+            'Data', models.trialtimer.TIMING_DIRNAME,
+            os.path.splitext(filename)[0] + '_timing.csv'))
+
+
+    def _flush_records(self):
+        """ Make sure all records so far are on disk.
+
+            Returns: False if the app was closed because the records
+                could not be written
+        """
+        try:
+            self.record_writer.flush(timeout=10)
+        except TimeoutError as e:
+            # A slow disk: the writer keeps the queued records and
+            # carries on in the background
+            logger.warning("Still writing records: %s", e)
+        except Exception as e:
+            # Any error from the writer thread is raised here
+            self._show_write_error(e)
+            return False
+        return True
+
+
+    def _show_write_error(self, e):
+        """ Report a failed write and close the app. """
+        logger.error("Cannot write to file: %s", e)
+        messagebox.showerror(
+            title="Access Denied",
+            message="Data not saved! Cannot write to file!",
+            detail=e
+        )
+        # Closes the writer (and the rest of the session) first
+        self._quit()
 
     ##########################
     # SettingsView Functions #
@@ -544,11 +858,9 @@ class Application(tk.Tk):
 
 
     def _save_settings(self, *_):
-        """ Save current runtime parameters to file. """
-        logger.debug("Calling settings model set and save funcs")
-        for key, variable in self.settings.items():
-            self.settings_model.set(key, variable.get())
-            self.settings_model.save()
+        """ Save changed runtime parameters to file (debounced). """
+        logger.debug("Requesting settings save")
+        self.settings_store.save()
 
 
     ########################
@@ -604,11 +916,15 @@ class Application(tk.Tk):
 
 
     def _calc_level(self, desired_spl):
-        """ Calculate new dB FS level using slm_offset. """
+        """ Calculate new dB FS level using slm_offset.
+
+            Returns: the new level (also in adjusted_level_dB)
+        """
         # Calculate new presentation level
         self.calmodel.calc_level(desired_spl)
-        # Save level - this must be called here!
-        self._save_settings()
+        # The new level is saved with the other settings at the end
+        # of the staircase, to keep file I/O out of trials
+        return self.settings['adjusted_level_dB'].get()
 
 
     #######################
@@ -648,26 +964,60 @@ class Application(tk.Tk):
     ###################
     # Audio Functions #
     ###################
-    def _create_audio_object(self, audio, **kwargs):
-        # Create audio object
+    def _get_routing(self):
+        """ Get routing either from a trial handler or settings. """
         try:
-            self.a = tmpy.audio_handlers.AudioPlayer(
-                audio=audio,
-                **kwargs
-            )
-        except FileNotFoundError:
-            logger.exception("Cannot find audio file!")
-            messagebox.showerror(
-                title="File Not Found",
-                message="Cannot find the audio file!",
-                detail="Go to File>Session to specify a valid audio path."
-            )
-            self.show_settings_view()
-            return
-        except tmpy.audio_handlers.InvalidAudioType:
-            raise
-        except tmpy.audio_handlers.MissingSamplingRate:
-            raise
+            return [self.th.trial_info['speaker']]
+        except AttributeError:
+            return tmpy.functions.helper_funcs.string_to_list(
+                self.settings['channel_routing'].get(), 'int')
+
+
+    def _get_stream(self, fs):
+        """ Return the session audio stream, (re)opening it if the
+            backend, device, routing or sampling rate has changed.
+        """
+        backend = self.settings['audio_backend'].get()
+        key = (self.settings['audio_device'].get(),
+               tuple(self._get_routing()), fs)
+        if self.stream is not None and self.stream.key == key \
+                and self.stream.backend == backend:
+            return self.stream
+
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        kwargs = dict()
+        if backend == 'wav':
+            kwargs['filepath'] = self._get_audio_filepath()
+        try:
+            stream = models.create_backend(
+                backend, device=key[0], routing=key[1], fs=fs, **kwargs)
+        except ValueError as e:
+            raise models.audiostream.InvalidAudioDevice(e) from e
+        stream.open()
+        self.stream = stream
+        return self.stream
+
+
+    def _get_audio_filepath(self):
+        """ WAV file for the 'wav' audio backend: next to the data
+            file once the task has started.
+        """
+        if self.record_writer is not None:
+            return os.path.splitext(self.record_writer.filepath)[0] + '.wav'
+        return os.path.join('Data', 'audio.wav')
+
+
+    def _warm_up_stream(self):
+        """ Open the session stream ahead of time. Errors are shown
+            when audio is first presented.
+        """
+        try:
+            self._get_stream(self.FS)
+        except (models.audiostream.InvalidAudioDevice,
+                models.audiostream.InvalidRouting) as e:
+            logger.warning("Could not open audio stream: %s", e)
 
 
     def _format_routing(self, routing):
@@ -680,23 +1030,11 @@ class Application(tk.Tk):
         return routing
     
 
-    def _play(self, pres_level):
-        """ Format channel routing, present audio and catch exceptions. """
-        # Get routing either from a trial handler or settings
-        try:
-            routing=[self.th.trial_info['speaker']]
-        except AttributeError:
-            routing = tmpy.functions.helper_funcs.string_to_list(
-                self.settings['channel_routing'].get(), 'int')
-            
-        # Attempt to present audio
+    def _play(self, audio, pres_level, sampling_rate):
+        """ Queue audio on the session stream and catch exceptions. """
         try:
-            self.a.play(
-                level=pres_level,
-                device_id=self.settings['audio_device'].get(),
-                routing=routing
-            )
-        except tmpy.audio_handlers.InvalidAudioDevice as e:
+            self._get_stream(sampling_rate).play(audio, level=pres_level)
+        except models.audiostream.InvalidAudioDevice as e:
             logger.error("Invalid audio device: %s", e)
             messagebox.showerror(
                 title="Invalid Device",
@@ -706,7 +1044,7 @@ class Application(tk.Tk):
             )
             # Open Audio Settings window
             self._show_audio_dialog()
-        except tmpy.audio_handlers.InvalidRouting as e:
+        except models.audiostream.InvalidRouting as e:
             logger.error("Invalid routing: %s", e)
             messagebox.showerror(
                 title="Invalid Routing",
@@ -717,7 +1055,7 @@ class Application(tk.Tk):
             )
             # Open Audio Settings window
             self._show_audio_dialog()
-        except tmpy.audio_handlers.Clipping:
+        except models.audiostream.Clipping as e:
             logger.error("Clipping has occurred - aborting!")
             messagebox.showerror(
                 title="Clipping",
@@ -725,41 +1063,51 @@ class Application(tk.Tk):
                 detail="The waveform will be plotted when this message is " +
                     "closed for visual inspection."
             )
-            self.a.plot_waveform("Clipped Waveform")
+            # Plot the scaled output, i.e., the samples that clipped
+            tmpy.audio_handlers.AudioPlayer(
+                audio=e.audio,
+                sampling_rate=sampling_rate
+            ).plot_waveform("Clipped Waveform")
 
 
-    def present_audio(self, audio, pres_level, **kwargs):
+    def present_audio(self, audio, pres_level, sampling_rate=None):
+        """ Present an ndarray (with sampling_rate) or an audio file
+            on the session stream.
+        """
         # Load audio
-        try:
-            self._create_audio_object(audio, **kwargs)
-        except tmpy.audio_handlers.InvalidAudioType as e:
-            logger.error("Invalid audio format: %s", e)
-            messagebox.showerror(
-                title="Invalid Audio Type",
-                message="The audio type is invalid!",
-                detail=f"{e} Please provide a Path or ndarray object."
-            )
-            return
-        except tmpy.audio_handlers.MissingSamplingRate as e:
-            logger.error("Missing sampling rate: %s", e)
+        if isinstance(audio, Path):
+            import soundfile
+            try:
+                audio, sampling_rate = soundfile.read(audio, always_2d=True)
+            except (RuntimeError, FileNotFoundError):
+                logger.exception("Cannot find audio file!")
+                messagebox.showerror(
+                    title="File Not Found",
+                    message="Cannot find the audio file!",
+                    detail="Go to File>Session to specify a valid audio path."
+                )
+                self.show_settings_view()
+                return
+        elif sampling_rate is None:
+            logger.error("Missing sampling rate")
             messagebox.showerror(
                 title="Missing Sampling Rate",
                 message="No sampling rate was provided!",
-                detail=f"{e} Please provide a Path or ndarray object."
+                detail="Please provide a Path or ndarray object."
             )
             return
 
         # Play audio
-        self._play(pres_level)
+        self._play(audio, pres_level, sampling_rate)
 
 
     def stop_audio(self):
         """ Stop audio playback. """
         logger.debug("User stopped audio playback")
         try:
-            self.a.stop()
+            self.stream.stop()
         except AttributeError:
-            logger.debug("Stop called, but there is no audio object!")
+            logger.debug("Stop called, but there is no audio stream!")
 
 
 if __name__ == "__main__":
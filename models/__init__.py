@@ -1,18 +1,60 @@
-""" Imports. """
+""" Imports.
 
-from .scoringmodel import (
-    ScoringModel
-)
+    Names are imported from their modules on first use, so importing
+    one model (e.g., models.scoringmodel for the headless scorer)
+    does not import the others and their dependencies (tmpy,
+    sounddevice, etc.).
+"""
 
-__all__ = [
-    'ScoringModel'
-]
+import importlib
 
+# Public name: module it is defined in
+_EXPORTS = {
+    'ScoringModel': 'scoringmodel',
+    'ScoringCache': 'scoringcache',
+    'StimulusModel': 'stimulusmodel',
+    'TrialTimeline': 'trialtimeline',
+    'TrialRenderer': 'trialrenderer',
+    'AudioStream': 'audiostream',
+    'NullSink': 'audiobackends',
+    'WavSink': 'audiobackends',
+    'create_backend': 'audiobackends',
+    'RecordWriter': 'recordwriter',
+    'SettingsStore': 'settingsstore',
+    'SessionSnapshot': 'sessionsnapshot',
+    'LevelPlanner': 'levelplanner',
+    'create_staircase': 'trackfactory',
+    'create_level_plan': 'trackfactory',
+    'trial_levels': 'trackfactory',
+    'estimate_fields': 'trackfactory',
+    'Observer': 'observer',
+    'simulate_session': 'sessionsimulator',
+    'run_simulations': 'sessionsimulator',
+    'evaluate_grid': 'staircaseoptimizer',
+    'simulate_tracks': 'staircaseoptimizer',
+    'InterleavedStaircases': 'interleavedstaircases',
+    'QuestHandler': 'questhandler',
+    'TrialTimer': 'trialtimer',
+    'CallbackProfiler': 'callbackprofiler',
+}
 
-from .stimulusmodel import (
-    StimulusModel
-)
+__all__ = list(_EXPORTS)
 
-__all__ += [
-    'StimulusModel'
-]
+
+def __getattr__(name):
+    """ Import a public name (or a submodule, e.g., models.audiostream)
+        when it is first used.
+    """
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        value = getattr(module, name)
+    elif name in _EXPORTS.values():
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
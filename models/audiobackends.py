@@ -0,0 +1,160 @@
+""" Audio backends that can stand in for the sound device stream. """
+
+###########
+# Imports #
+###########
+# Standard library
+import logging
+import os
+import time
+import wave
+
+# Third party
+import numpy as np
+
+# Custom Modules
+from .audiostream import AudioStream
+from .audiostream import InvalidAudioDevice
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+############
+# NullSink #
+############
+class NullSink(AudioStream):
+    """ Accept presentations like AudioStream (level scaling, channel
+        routing and the clipping check all still run) and discard
+        them. No sound device is opened, so the app can run without
+        audio hardware, e.g., to benchmark the trial loop.
+
+        submit_latency_ms holds the time each play() call took.
+    """
+    backend = 'null'
+
+    def __init__(self, device, routing, fs, blocksize=256):
+        super().__init__(device, routing, fs, blocksize)
+        self._open = False
+
+        # Totals, for diagnostics
+        self.presentations = 0
+        self.frames = 0
+
+
+    @property
+    def active(self):
+        """ Presentations finish as soon as they are submitted. """
+        return False
+
+
+    def open(self, timeout=2.0):
+        """ Mark the sink as open. """
+        start = time.perf_counter()
+        self._open = True
+        self.open_latency_ms = (time.perf_counter() - start) * 1000
+        logger.info("Opened %s audio sink (%d channels)", self.backend,
+                    self.out_chans)
+
+
+    def close(self):
+        """ Mark the sink as closed. """
+        if self._open:
+            self._open = False
+            logger.info("Closed %s audio sink after %d presentations "
+                        "(%.1f s of audio)", self.backend,
+                        self.presentations, self.frames / self.fs)
+
+
+    def play(self, audio, level):
+        """ Scale and route audio at level (dB RMS per channel), then
+            hand it to _write().
+        """
+        submitted = time.perf_counter()
+        if not self._open:
+            self.open()
+        out = self.prepare(audio, level)
+        self._write(out)
+        self.presentations += 1
+        self.frames += out.shape[0]
+        self.submit_latency_ms.append(
+            (time.perf_counter() - submitted) * 1000)
+
+
+    def stop(self):
+        """ Nothing is ever playing. """
+        self._generation += 1
+
+
+    def _write(self, out):
+        """ Discard the samples. """
+        pass
+
+###########
+# WavSink #
+###########
+class WavSink(NullSink):
+    """ Write every presentation to a WAV file instead of a sound
+        device, to check stimuli offline. Presentations are written
+        back-to-back (no silence between trials), as 32-bit PCM with
+        one channel per output channel of the routing.
+    """
+    backend = 'wav'
+
+    def __init__(self, device, routing, fs, filepath, blocksize=256):
+        super().__init__(device, routing, fs, blocksize)
+        self.filepath = filepath
+        self._file = None
+
+
+    def open(self, timeout=2.0):
+        """ Create the WAV file. """
+        directory = os.path.dirname(os.fspath(self.filepath))
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = wave.open(os.fspath(self.filepath), 'wb')
+        except OSError as e:
+            raise InvalidAudioDevice(e) from e
+        self._file.setnchannels(self.out_chans)
+        self._file.setsampwidth(4)
+        self._file.setframerate(self.fs)
+        super().open(timeout)
+        logger.debug("Writing audio to %s", self.filepath)
+
+
+    def close(self):
+        """ Finish the WAV header and close the file. """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        super().close()
+
+
+    def _write(self, out):
+        """ Append the samples to the file. """
+        pcm = np.round(out.astype(np.float64) * (2 ** 31 - 1))
+        self._file.writeframes(pcm.astype('<i4').tobytes())
+
+#############
+# Functions #
+#############
+BACKENDS = {
+    AudioStream.backend: AudioStream,
+    NullSink.backend: NullSink,
+    WavSink.backend: WavSink,
+}
+
+
+def create_backend(backend, device, routing, fs, **kwargs):
+    """ Create an (unopened) audio backend by name (see BACKENDS).
+        Extra keyword arguments go to the backend class, e.g.,
+        filepath for 'wav'.
+    """
+    try:
+        backend_class = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown audio backend: {backend}")
+    return backend_class(device=device, routing=routing, fs=fs, **kwargs)
@@ -0,0 +1,220 @@
+""" Long-lived audio output stream shared by all presentations. """
+
+###########
+# Imports #
+###########
+# Standard library
+import logging
+import queue
+import threading
+import time
+
+# Third party
+import numpy as np
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+##############
+# Exceptions #
+##############
+class InvalidAudioDevice(Exception):
+    pass
+
+
+class InvalidRouting(Exception):
+    pass
+
+
+class Clipping(Exception):
+    """ The scaled audio exceeds full scale. audio holds the scaled,
+        routed samples, for plotting.
+    """
+    def __init__(self, message, audio=None):
+        super().__init__(message)
+        self.audio = audio
+
+###############
+# AudioStream #
+###############
+class AudioStream:
+    """ Output stream opened once per session for a given device,
+        channel routing and sampling rate. Presentations are queued
+        and played back-to-back by the stream callback, so no device
+        is opened or closed between trials.
+
+        Timing:
+            open_latency_ms: time to open and start the stream, up to
+                the first callback
+            submit_latency_ms: per presentation, time from play() to
+                the callback picking up the first samples
+    """
+    # Name of this backend (see audiobackends.BACKENDS)
+    backend = 'device'
+
+    def __init__(self, device, routing, fs, blocksize=256):
+        # Assign variables
+        self.device = device
+        self.routing = [int(chan) for chan in routing]
+        self.fs = fs
+        self.blocksize = blocksize
+
+        if not self.routing or min(self.routing) < 1:
+            raise InvalidRouting(f"Invalid channel routing: {routing}")
+        self.out_chans = max(self.routing)
+
+        # Buffers waiting to be played: (samples, time of play(),
+        # generation). stop() starts a new generation, and buffers
+        # from earlier generations are dropped by the callback.
+        self._queue = queue.Queue()
+        self._current = None
+        self._current_gen = 0
+        self._pos = 0
+        self._generation = 0
+        self._warm = threading.Event()
+
+        self._stream = None
+        self.open_latency_ms = None
+        self.submit_latency_ms = []
+
+
+    @property
+    def key(self):
+        """ Settings this stream was opened with. """
+        return (self.device, tuple(self.routing), self.fs)
+
+
+    @property
+    def active(self):
+        """ True while a presentation is queued or playing. """
+        return self._current is not None or not self._queue.empty()
+
+
+    def open(self, timeout=2.0):
+        """ Open and start the stream, and wait for the first
+            callback so the device is running before the first trial.
+        """
+        import sounddevice as sd
+
+        start = time.perf_counter()
+        try:
+            self._stream = sd.OutputStream(
+                samplerate=self.fs,
+                blocksize=self.blocksize,
+                device=self.device,
+                channels=self.out_chans,
+                dtype='float32',
+                latency='low',
+                callback=self._callback
+            )
+            self._stream.start()
+        except (sd.PortAudioError, ValueError) as e:
+            self._stream = None
+            raise InvalidAudioDevice(e) from e
+
+        if not self._warm.wait(timeout):
+            logger.warning("Audio stream did not start within %.1f s",
+                           timeout)
+        self.open_latency_ms = (time.perf_counter() - start) * 1000
+        logger.info("Opened audio stream on device %s (%d channels) "
+                    "in %.1f ms", self.device, self.out_chans,
+                    self.open_latency_ms)
+
+
+    def close(self):
+        """ Stop and close the stream. """
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+            if self.submit_latency_ms:
+                logger.info(
+                    "Audio submission latency over %d presentations: "
+                    "median %.1f ms, max %.1f ms",
+                    len(self.submit_latency_ms),
+                    np.median(self.submit_latency_ms),
+                    max(self.submit_latency_ms)
+                )
+            logger.debug("Closed audio stream")
+
+
+    def prepare(self, audio, level):
+        """ Scale each channel of audio to level (dB RMS re full
+            scale) and route it to its output channel.
+
+            Level semantics are those of tmpy's AudioPlayer, which
+            this replaces: play(level=...) set the RMS of each channel
+            separately with tmsignals.setRMS, so every channel is at
+            level regardless of the others. Silent channels stay
+            silent.
+
+            Returns: float32 (samples, output channels) array
+        """
+        if audio.ndim == 1:
+            audio = audio[:, np.newaxis]
+        if audio.shape[1] != len(self.routing):
+            raise InvalidRouting(
+                f"{audio.shape[1]} audio channel(s) but routing is "
+                f"{self.routing}")
+
+        rms = np.sqrt(np.einsum('ij,ij->j', audio, audio, dtype=np.float64)
+                      / audio.shape[0])
+        gain = np.divide(10 ** (level / 20), rms, out=np.zeros_like(rms),
+                         where=rms > 0)
+
+        out = np.zeros((audio.shape[0], self.out_chans), dtype=np.float32)
+        out[:, np.array(self.routing) - 1] = audio * gain
+        if np.max(np.abs(out)) > 1:
+            raise Clipping(f"Level {level} dB causes clipping", out)
+        return out
+
+
+    def play(self, audio, level):
+        """ Queue audio for playback at level (dB RMS per channel). """
+        submitted = time.perf_counter()
+        if self._stream is None:
+            self.open()
+        self._queue.put(
+            (self.prepare(audio, level), submitted, self._generation))
+
+
+    def stop(self):
+        """ Drop the current and all queued presentations. """
+        self._generation += 1
+
+
+    def _callback(self, outdata, frames, time_info, status):
+        """ Sound device callback: copy the next frames of queued
+            audio into outdata, padding with silence.
+        """
+        if status:
+            logger.warning("Audio stream status: %s", status)
+        self._warm.set()
+
+        written = 0
+        while written < frames:
+            if self._current_gen != self._generation:
+                self._current = None
+            if self._current is None:
+                try:
+                    self._current, submitted, self._current_gen = \
+                        self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if self._current_gen != self._generation:
+                    continue
+                self._pos = 0
+                self.submit_latency_ms.append(
+                    (time.perf_counter() - submitted) * 1000)
+
+            chunk = self._current[self._pos:self._pos + frames - written]
+            outdata[written:written + chunk.shape[0]] = chunk
+            written += chunk.shape[0]
+            self._pos += chunk.shape[0]
+            if self._pos >= self._current.shape[0]:
+                self._current = None
+
+        outdata[written:] = 0
@@ -0,0 +1,107 @@
+""" Opt-in cProfile collection around Tk callbacks. """
+
+###########
+# Imports #
+###########
+# Standard library
+import contextlib
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import time
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+####################
+# CallbackProfiler #
+####################
+class CallbackProfiler:
+    """ Profile only while a wrapped callback is running, so time the
+        app spends idle in the Tk event loop (e.g., waiting for a
+        response) does not add overhead or show up in the profile.
+        Calls between wrapped callbacks (nested wrappers) are
+        collected by the outermost one.
+
+        Blocking waits inside a callback (modal dialogs, plot
+        windows) are left out with paused().
+
+        Nothing is wrapped unless wrap() is called, so an app that
+        does not create a profiler pays nothing.
+
+        dump() writes a pstats file, which can be opened with
+        pstats, snakeviz, gprof2dot, etc.
+    """
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.calls = 0
+        self._depth = 0
+        self._started = time.strftime("%Y_%m_%d_%H%M")
+
+
+    def wrap(self, func):
+        """ Return func, profiled whenever it is called. """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if self._depth:
+                return func(*args, **kwargs)
+            self._depth += 1
+            self.calls += 1
+            self.profile.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.profile.disable()
+                self._depth -= 1
+        return wrapper
+
+
+    @contextlib.contextmanager
+    def paused(self):
+        """ Stop profiling for the duration of the block, e.g.,
+            while a callback waits for the user to close a dialog.
+        """
+        if not self._depth:
+            yield
+            return
+        self.profile.disable()
+        try:
+            yield
+        finally:
+            self.profile.enable()
+
+
+    def wrap_methods(self, obj, names):
+        """ Replace each method in names on obj (an instance) with a
+            profiled wrapper.
+        """
+        for name in names:
+            setattr(obj, name, self.wrap(getattr(obj, name)))
+
+
+    def dump(self, directory, name='session', top=20):
+        """ Write the profile to <directory>/<start time>_<name>.prof
+            and log the top functions by cumulative time.
+
+            Returns: the file path, or None if nothing was profiled
+        """
+        if not self.calls:
+            logger.debug("No profiled callbacks - nothing to write")
+            return None
+
+        os.makedirs(directory, exist_ok=True)
+        filepath = os.path.join(directory, f"{self._started}_{name}.prof")
+        self.profile.dump_stats(filepath)
+
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=stream)
+        stats.sort_stats('cumulative').print_stats(top)
+        logger.info("Profiled %d callbacks; wrote %s\n%s", self.calls,
+                    filepath, stream.getvalue())
+        return filepath
@@ -0,0 +1,131 @@
+""" Run one staircase per test frequency, interleaved trial by trial. """
+
+###########
+# Imports #
+###########
+# Standard library
+import logging
+import random
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+############
+# Policies #
+############
+# A policy picks the frequency of the next trial from the frequencies
+# whose staircases are still running: policy(freqs, interleaver)
+
+def random_policy(freqs, interleaver):
+    """ Any running frequency, with equal probability. """
+    return interleaver.rng.choice(freqs)
+
+
+def round_robin_policy(freqs, interleaver):
+    """ The next running frequency after the previous trial's, in
+        test_freqs order.
+    """
+    order = interleaver.freqs
+    if interleaver.current_freq is None:
+        return freqs[0]
+    start = order.index(interleaver.current_freq) + 1
+    for freq in order[start:] + order[:start]:
+        if freq in freqs:
+            return freq
+
+
+def most_uncertain_policy(freqs, interleaver):
+    """ The frequency furthest from its threshold estimate: fewest
+        reversals, then fewest trials.
+    """
+    return min(freqs, key=lambda freq: (interleaver.reversals[freq],
+                                        interleaver.trials[freq]))
+
+
+POLICIES = {
+    'random': random_policy,
+    'round_robin': round_robin_policy,
+    'most_uncertain': most_uncertain_policy,
+}
+
+#########################
+# InterleavedStaircases #
+#########################
+class InterleavedStaircases:
+    """ Hold one staircase handler per frequency and pick which one
+        runs the next trial. Each staircase keeps its own history;
+        trial and reversal counts are tracked per frequency.
+
+        staircases: dict or (freq, staircase) pairs. Frequencies must
+            be unique: records, levels and stimuli are kept per
+            frequency, so a repeated one would silently replace the
+            first.
+        policy: a name in POLICIES or a callable(freqs, interleaver)
+    """
+    def __init__(self, staircases, policy='random', seed=None):
+        # Assign variables
+        if isinstance(staircases, dict):
+            staircases = staircases.items()
+        pairs = list(staircases)
+        self.freqs = [freq for freq, _ in pairs]
+        duplicates = sorted({freq for freq in self.freqs
+                             if self.freqs.count(freq) > 1})
+        if duplicates:
+            raise ValueError("Cannot interleave repeated test frequencies: "
+                             + ", ".join(str(freq) for freq in duplicates))
+        self.staircases = dict(pairs)
+        if callable(policy):
+            self.policy = policy
+        else:
+            try:
+                self.policy = POLICIES[policy]
+            except KeyError:
+                raise ValueError(f"Unknown interleaving policy: {policy}")
+        self.rng = random.Random(seed)
+
+        self.current_freq = None
+        self.trials = {freq: 0 for freq in self.freqs}
+        self.reversals = {freq: 0 for freq in self.freqs}
+
+        # Order in which frequencies were tested: [(freq, level), ...]
+        self.history = []
+
+
+    @property
+    def status(self):
+        """ True while any staircase is still running. """
+        return bool(self.running())
+
+
+    @property
+    def staircase(self):
+        """ Staircase of the current trial. """
+        return self.staircases[self.current_freq]
+
+
+    def running(self):
+        """ Frequencies whose staircases have not finished. """
+        return [freq for freq in self.freqs if self.staircases[freq].status]
+
+
+    def next_freq(self):
+        """ Choose the frequency of the next trial. """
+        freqs = self.running()
+        if not freqs:
+            raise IndexError("All staircases have finished")
+        self.current_freq = self.policy(freqs, self)
+        logger.debug("Next trial: %d Hz", self.current_freq)
+        return self.current_freq
+
+
+    def add_response(self, response):
+        """ Add a response to the current staircase. """
+        staircase = self.staircase
+        self.history.append((self.current_freq, staircase.current_level))
+        staircase.add_response(response)
+        self.trials[self.current_freq] += 1
+        if staircase.dw.datapoints[-1].reversal:
+            self.reversals[self.current_freq] += 1
@@ -0,0 +1,122 @@
+""" Per-run lookup table of presentation levels. """
+
+###########
+# Imports #
+###########
+# Standard library
+import logging
+from collections import deque
+
+# Third party
+import numpy as np
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#############
+# Constants #
+#############
+# Peak-to-RMS ratio (dB) of a sinusoid
+SINE_CREST_FACTOR_DB = 20 * np.log10(np.sqrt(2))
+
+# Upper bound on the number of reachable staircase levels
+MAX_LEVELS = 100000
+
+#############
+# Functions #
+#############
+def crest_factor_db(sig):
+    """ Largest peak-to-RMS ratio (dB) across the channels of sig. """
+    sig = np.asarray(sig, dtype=np.float64)
+    if sig.ndim == 1:
+        sig = sig[:, np.newaxis]
+    rms = np.sqrt(np.mean(sig ** 2, axis=0))
+    peak = np.max(np.abs(sig), axis=0)
+    return float(np.max(20 * np.log10(peak / rms)))
+
+################
+# LevelPlanner #
+################
+class LevelPlanner:
+    """ Precompute the presentation levels for every staircase level
+        that can be reached in a run, so a trial only needs a table
+        lookup.
+
+        For each reachable level (start_level plus/minus any sequence
+        of step_sizes, held within [min_level, max_level]):
+            desired: RETSPL- and channel-adjusted single channel level
+                (StimulusModel.calc_presentation_lvl)
+            adjusted: calc_level(desired), the dB FS level from the
+                calibration (the same callable the app uses for
+                levels that are not in the table, so both agree)
+    """
+    def __init__(self, stim_model, freq, start_level, step_sizes,
+                 min_level, max_level, calc_level,
+                 crest_factor_db=SINE_CREST_FACTOR_DB):
+        logger.debug("Planning presentation levels for %s Hz", freq)
+        # Assign variables
+        self.freq = freq
+        self.crest_factor_db = crest_factor_db
+
+        self.levels = self.reachable_levels(
+            start_level, step_sizes, min_level, max_level)
+        self.desired = np.array([
+            stim_model.calc_presentation_lvl(stair_lvl=level, freq=freq)
+            for level in self.levels
+        ])
+        self.adjusted = np.array([float(calc_level(desired))
+                                  for desired in self.desired])
+
+        # Staircase level -> table index
+        self._index = {self._key(level): i
+                       for i, level in enumerate(self.levels)}
+
+
+    @staticmethod
+    def _key(level):
+        # Guards against float noise from repeated steps
+        return round(float(level), 6)
+
+
+    @classmethod
+    def reachable_levels(cls, start_level, step_sizes, min_level,
+                         max_level):
+        """ Breadth-first search over all levels reachable from
+            start_level in steps of step_sizes, limited to
+            [min_level, max_level].
+
+            Returns: sorted array of levels
+        """
+        start = cls._key(min(max(start_level, min_level), max_level))
+        seen = {start}
+        todo = deque([start])
+        while todo:
+            level = todo.popleft()
+            for step in step_sizes:
+                for nxt in (level + step, level - step):
+                    nxt = cls._key(min(max(nxt, min_level), max_level))
+                    if nxt not in seen:
+                        seen.add(nxt)
+                        todo.append(nxt)
+            if len(seen) > MAX_LEVELS:
+                raise ValueError(
+                    "Too many reachable levels - check the step sizes")
+        return np.array(sorted(seen))
+
+
+    def lookup(self, level):
+        """ Return (desired, adjusted) levels for a staircase level.
+            Raises KeyError if the level is not in the table.
+        """
+        i = self._index[self._key(level)]
+        return self.desired[i], self.adjusted[i]
+
+
+    def clipping_levels(self):
+        """ Return the staircase levels whose stimulus peak would
+            exceed 0 dB FS.
+        """
+        return self.levels[self.adjusted + self.crest_factor_db > 0]
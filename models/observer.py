@@ -0,0 +1,73 @@
+""" Simulated observer and settings for headless simulations.
+
+    Kept free of tmpy and Tk, so the staircase optimizer and its
+    command line tool run without them.
+"""
+
+###########
+# Imports #
+###########
+# Third party
+import numpy as np
+
+# Custom Modules
+from setup import settings_vars
+
+###########
+# Classes #
+###########
+class SimVar:
+    """ Plain stand-in for a Tk variable. """
+    def __init__(self, value):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+
+class Observer:
+    """ Simulated listener with a logistic psychometric function
+        per frequency. In a 2IAFC task:
+
+            p(correct) = guess + (1 - guess - lapse) /
+                (1 + exp(-(level - threshold) / slope))
+
+        Levels and thresholds are staircase levels (dB).
+    """
+    def __init__(self, thresholds, slope=2.0, guess=0.5, lapse=0.02,
+                 seed=None):
+        # Assign variables
+        self.thresholds = thresholds
+        self.slope = slope
+        self.guess = guess
+        self.lapse = lapse
+        self.rng = np.random.default_rng(seed)
+
+
+    def p_correct(self, level, freq):
+        """ Probability of a correct response. """
+        x = (level - self.thresholds[freq]) / self.slope
+        return self.guess + (1 - self.guess - self.lapse) / (1 + np.exp(-x))
+
+
+    def respond(self, level, freq):
+        """ Return True for a correct response. """
+        return self.rng.random() < self.p_correct(level, freq)
+
+#############
+# Functions #
+#############
+def default_settings(**overrides):
+    """ Settings dict of SimVars with the app defaults, updated with
+        overrides.
+    """
+    settings = {key: SimVar(data['value'])
+                for key, data in settings_vars.fields.items()}
+    for key, value in overrides.items():
+        if key not in settings:
+            raise KeyError(f"Unknown setting: {key}")
+        settings[key].set(value)
+    return settings
@@ -0,0 +1,185 @@
+""" Bayesian (QUEST-style) threshold estimation with early stopping. """
+
+###########
+# Imports #
+###########
+# Standard library
+import logging
+
+# Third party
+import numpy as np
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#############
+# Constants #
+#############
+# Proportion correct tracked by the 1-up/2-down staircase
+TARGET_P = np.sqrt(0.5)
+
+###########
+# Classes #
+###########
+class QuestDatapoint:
+    """ One trial of a QuestHandler track. """
+    __slots__ = ('level', 'response', 'reversal')
+
+    def __init__(self, level, response, reversal):
+        self.level = level
+        self.response = response
+        self.reversal = reversal
+
+
+class QuestData:
+    """ Trial history of a QuestHandler track. """
+    def __init__(self):
+        self.datapoints = []
+
+
+class QuestHandler:
+    """ Drop-in alternative to StaircaseHandler (current_level,
+        add_response(1 or -1), status, dw.datapoints, plot_data).
+
+        Keeps a posterior over the level at which the listener is
+        TARGET_P correct (the level the staircase converges on),
+        assuming a logistic psychometric function. Each trial is
+        presented at the level (start_val plus a multiple of step,
+        within [min_val, max_val]) that minimizes the expected
+        posterior variance. The likelihood of both responses at every
+        level is tabulated up front, so an update is one multiply
+        over the grid.
+
+        The track stops once the posterior SD is at most stop_sd (dB)
+        after at least min_trials, or after max_trials. The posterior
+        estimate is recorded with each trial (threshold_estimate), and
+        ScoringModel scores QUEST tracks from the last one. A trial
+        whose level moves in the opposite direction from the previous
+        move is marked as a reversal for the plots and trial records
+        only.
+    """
+    def __init__(self, start_val, min_val, max_val, step=1, stop_sd=3.0,
+                 slope=2.0, guess=0.5, lapse=0.02, prior_sd=20.0,
+                 grid_step=0.25, min_trials=8, max_trials=80):
+        # Assign variables
+        self.start_val = start_val
+        self.min_val = min_val
+        self.max_val = max_val
+        self.step = step
+        self.stop_sd = stop_sd
+        self.min_trials = min_trials
+        self.max_trials = max_trials
+
+        # Threshold grid and prior (normal around the starting level)
+        self.grid = np.arange(min_val, max_val + grid_step / 2, grid_step)
+        prior = np.exp(-0.5 * ((self.grid - start_val) / prior_sd) ** 2)
+        self.posterior = prior / prior.sum()
+
+        # Presentation levels: start_val + k * step within the limits
+        k_min = np.ceil((min_val - start_val) / step)
+        k_max = np.floor((max_val - start_val) / step)
+        self.levels = np.clip(start_val + step * np.arange(k_min, k_max + 1),
+                              min_val, max_val)
+
+        # Likelihood of a correct response, levels x thresholds.
+        # The logistic midpoint sits above the threshold by the
+        # distance from the TARGET_P point to the midpoint.
+        offset = slope * np.log((1 - guess - lapse) / (TARGET_P - guess) - 1)
+        x = (self.levels[:, np.newaxis] - self.grid[np.newaxis, :] - offset) \
+            / slope
+        p_correct = guess + (1 - guess - lapse) / (1 + np.exp(-x))
+        self._likelihood = {1: p_correct, -1: 1 - p_correct}
+
+        self.dw = QuestData()
+        self.status = True
+        self._level_index = self._nearest_level(start_val)
+        self._direction = 0
+
+
+    @property
+    def current_level(self):
+        """ Level of the next trial. """
+        return float(self.levels[self._level_index])
+
+
+    @property
+    def threshold(self):
+        """ Posterior mean threshold (dB). """
+        return float(self.grid @ self.posterior)
+
+
+    @property
+    def threshold_sd(self):
+        """ Posterior standard deviation (dB). """
+        return float(np.sqrt(((self.grid - self.threshold) ** 2)
+                             @ self.posterior))
+
+
+    def _nearest_level(self, level):
+        return int(np.argmin(np.abs(self.levels - level)))
+
+
+    def _best_level(self):
+        """ Index of the level that minimizes the expected posterior
+            variance after the next response.
+        """
+        expected = 0
+        for likelihood in self._likelihood.values():
+            # Unnormalized posteriors for every level (levels x grid)
+            weights = likelihood * self.posterior
+            p_response = weights.sum(axis=1)
+            mean = weights @ self.grid / p_response
+            var = weights @ self.grid ** 2 / p_response - mean ** 2
+            expected = expected + p_response * var
+        return int(np.argmin(expected))
+
+
+    def add_response(self, response):
+        """ Update the posterior with a response (1 = correct,
+            -1 = incorrect) and choose the next level.
+        """
+        if not self.status:
+            raise RuntimeError("The track has finished")
+        level_index = self._level_index
+        self.posterior *= self._likelihood[response][level_index]
+        self.posterior /= self.posterior.sum()
+
+        next_index = self._best_level()
+        direction = int(np.sign(next_index - level_index))
+        reversal = bool(direction and self._direction
+                        and direction != self._direction)
+        if direction:
+            self._direction = direction
+        self.dw.datapoints.append(QuestDatapoint(
+            self.levels[level_index], response, reversal))
+        self._level_index = next_index
+
+        trials = len(self.dw.datapoints)
+        if (trials >= self.min_trials and self.threshold_sd <= self.stop_sd) \
+                or trials >= self.max_trials:
+            self.status = False
+            logger.info("Threshold %.1f dB (SD %.2f dB) after %d trials",
+                        self.threshold, self.threshold_sd, trials)
+
+
+    def plot_data(self):
+        """ Plot presentation levels and the final estimate. """
+        from matplotlib import pyplot as plt
+
+        levels = [dp.level for dp in self.dw.datapoints]
+        trials = np.arange(1, len(levels) + 1)
+        correct = np.array([dp.response == 1 for dp in self.dw.datapoints])
+        plt.plot(trials, levels, color='gray')
+        plt.scatter(trials[correct], np.array(levels)[correct],
+                    marker='o', label='Correct')
+        plt.scatter(trials[~correct], np.array(levels)[~correct],
+                    marker='x', label='Incorrect')
+        plt.axhline(self.threshold, linestyle='--',
+                    label=f"Threshold: {self.threshold:.1f} dB")
+        plt.xlabel("Trial")
+        plt.ylabel("Level (dB)")
+        plt.legend()
+        plt.show()
@@ -0,0 +1,165 @@
+""" Write trial records to CSV on a background thread.
+
+    Crash safety:
+        - write() only queues a record. Records still in the queue
+          are lost if the app crashes before the worker writes them
+          (normally within milliseconds of the response).
+        - Written batches are flushed to the operating system, so
+          they survive an app crash, but may still be lost if the
+          computer or network share goes down.
+        - flush() (end of each staircase) and close() (on quit) also
+          fsync the file, after which records are on disk.
+"""
+
+###########
+# Imports #
+###########
+# Standard library
+import csv
+import logging
+import os
+import queue
+import threading
+import time
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+################
+# RecordWriter #
+################
+class RecordWriter:
+    """ Append dict records to a CSV file from a worker thread, in
+        batches. The header is written from the keys of the first
+        record if the file is new.
+
+        The queue holds at most max_queue records; write() blocks
+        when it is full. Errors from the worker (e.g., PermissionError,
+        or a value that cannot be written) stop the writing and are
+        raised by the next call to write(), flush() or close().
+    """
+    def __init__(self, filepath, max_queue=1000, batch_size=50):
+        # Assign variables
+        self.filepath = filepath
+        self.batch_size = batch_size
+
+        # Records, or an Event to set once everything before it is
+        # on disk. None stops the worker.
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._error = None
+
+        # Milliseconds taken by each batch write
+        self.write_latency_ms = []
+
+
+    @property
+    def queue_depth(self):
+        """ Number of records waiting to be written. """
+        return self._queue.qsize()
+
+
+    def write(self, record):
+        """ Queue a record (dict) for writing. """
+        self._raise_error()
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name='RecordWriter', daemon=True)
+            self._thread.start()
+        self._queue.put(dict(record))
+
+
+    def flush(self, timeout=None):
+        """ Wait until all queued records are written and fsynced. """
+        self._raise_error()
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        if not done.wait(timeout):
+            raise TimeoutError(f"Records not written within {timeout} s")
+        self._raise_error()
+
+
+    def close(self, timeout=None):
+        """ Flush and stop the worker thread. """
+        if self._thread is None:
+            return
+        try:
+            self.flush(timeout)
+        finally:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+
+    def _run(self):
+        """ Worker thread: write queued records in batches. """
+        writer = None
+        file = None
+        items = []
+        try:
+            while True:
+                # Wait for the next item, then take whatever else is
+                # already queued (up to batch_size records)
+                items = [self._queue.get()]
+                while items[-1] is not None \
+                        and not isinstance(items[-1], threading.Event) \
+                        and len(items) < self.batch_size:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                records = [item for item in items if isinstance(item, dict)]
+                if records and self._error is None:
+                    start = time.perf_counter()
+                    if file is None:
+                        file, writer = self._open(records[0])
+                    writer.writerows(records)
+                    file.flush()
+                    self.write_latency_ms.append(
+                        (time.perf_counter() - start) * 1000)
+                    logger.debug("Wrote %d record(s) in %.1f ms",
+                                 len(records), self.write_latency_ms[-1])
+
+                if isinstance(items[-1], threading.Event):
+                    if file is not None and self._error is None:
+                        os.fsync(file.fileno())
+                    items[-1].set()
+                elif items[-1] is None:
+                    break
+        except Exception as e:
+            logger.error("Cannot write records to %s: %s", self.filepath, e)
+            self._error = e
+            # Keep draining so flush() and write() do not block
+            item = items[-1] if items else False
+            while item is not None:
+                if isinstance(item, threading.Event):
+                    item.set()
+                item = self._queue.get()
+        finally:
+            if file is not None:
+                file.close()
+
+
+    def _open(self, first_record):
+        """ Open the file for appending; write a header if it is new. """
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        new_file = not os.path.exists(self.filepath) \
+            or os.path.getsize(self.filepath) == 0
+        file = open(self.filepath, 'a', newline='')
+        writer = csv.DictWriter(file, fieldnames=list(first_record))
+        if new_file:
+            writer.writeheader()
+        return file, writer
@@ -0,0 +1,182 @@
+""" Sidecar cache of per-file reversal data for incremental scoring. """
+
+###########
+# Imports #
+###########
+# Data Science
+import pandas as pd
+
+# System
+import hashlib
+import json
+import logging
+import os
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#############
+# Constants #
+#############
+# Name of the sidecar folder created inside the data directory
+CACHE_DIRNAME = '.peat_scoring'
+
+# Bump when the cache layout changes to invalidate old caches
+CACHE_VERSION = 3
+
+################
+# ScoringCache #
+################
+class ScoringCache:
+    """ Manifest of scored files (size, mtime and content hash) and
+        the reversal rows read from each of them. Scoring only needs
+        reversal rows (and, for QUEST tracks, the rows with a
+        threshold estimate), so rescoring a directory only has to
+        read files that are new or have changed since the last visit.
+        The last row of each track (identified by keys) is kept too,
+        so a track without reversals still scores (as NaN).
+    """
+    def __init__(self, directory, dtypes, keys):
+        logger.debug("Initializing ScoringCache")
+
+        # Assign variables
+        self.directory = directory
+        self.dtypes = dtypes
+        self.keys = keys
+        self.cache_dir = os.path.join(directory, CACHE_DIRNAME)
+        self.manifest_path = os.path.join(self.cache_dir, 'manifest.json')
+        self.reversals_path = os.path.join(self.cache_dir, 'reversals.csv')
+
+        # File name -> {'size', 'mtime_ns', 'sha1'}
+        self.manifest = dict()
+        # File name -> DataFrame of reversal rows
+        self.reversals = dict()
+
+        self._load()
+
+
+    def _load(self):
+        """ Load manifest and cached reversals, if they exist. """
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+            cached = pd.read_csv(
+                self.reversals_path,
+                dtype=dict(self.dtypes, source=str)
+            )
+        except (OSError, ValueError) as e:
+            logger.debug("No usable scoring cache: %s", e)
+            return
+
+        if manifest.get('version') != CACHE_VERSION:
+            logger.info("Discarding outdated scoring cache")
+            return
+
+        self.manifest = manifest['files']
+        # Files without threshold estimates have blank estimate columns
+        cached = cached.reindex(columns=list(self.dtypes) + ['source'])
+        empty = cached.iloc[0:0][list(self.dtypes)]
+        groups = dict(list(cached.groupby('source', sort=False)))
+        for name in self.manifest:
+            # Files without reversals have no rows in the cache
+            df = groups.get(name, empty)
+            self.reversals[name] = df[list(self.dtypes)].reset_index(drop=True)
+        logger.debug("Loaded scoring cache with %d files", len(self.manifest))
+
+
+    @staticmethod
+    def _hash_file(path):
+        """ Return the SHA-1 hex digest of a file's contents. """
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha1.update(block)
+        return sha1.hexdigest()
+
+
+    def is_current(self, path):
+        """ Return True if the cached reversals for path are still valid.
+            Size and mtime are checked first; the content hash is only
+            computed when they differ (e.g., a file was copied or touched).
+        """
+        name = os.path.basename(path)
+        entry = self.manifest.get(name)
+        if entry is None:
+            return False
+
+        stat = os.stat(path)
+        if (entry['size'] == stat.st_size
+                and entry['mtime_ns'] == stat.st_mtime_ns):
+            return True
+
+        if entry['size'] == stat.st_size \
+                and entry['sha1'] == self._hash_file(path):
+            # Contents unchanged: refresh the stat fields only
+            entry['mtime_ns'] = stat.st_mtime_ns
+            return True
+
+        return False
+
+
+    def update(self, path, data):
+        """ Store the reversal (and threshold estimate) rows of a
+            freshly read file, plus the last row of each track.
+        """
+        name = os.path.basename(path)
+        stat = os.stat(path)
+        self.manifest[name] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha1': self._hash_file(path),
+        }
+        keep = data['reversal'] == True
+        if 'threshold_estimate' in data:
+            keep |= data['threshold_estimate'].notna()
+        # Placeholder row, so tracks without reversals are not lost
+        keep |= ~data.duplicated(subset=self.keys, keep='last')
+        # Optional columns may be missing from older files
+        columns = [col for col in self.dtypes if col in data]
+        self.reversals[name] = data.loc[keep, columns].reset_index(drop=True)
+
+
+    def prune(self, paths):
+        """ Forget files that are no longer in the directory. """
+        keep = {os.path.basename(path) for path in paths}
+        for name in list(self.manifest):
+            if name not in keep:
+                del self.manifest[name]
+                self.reversals.pop(name, None)
+
+
+    def get_reversals(self, paths):
+        """ Return the cached reversal rows for paths, in order. """
+        frames = [self.reversals[os.path.basename(path)] for path in paths]
+        return pd.concat(frames, ignore_index=True)
+
+
+    def save(self):
+        """ Write manifest and reversals to the sidecar folder.
+            Each file is written to a temporary file and renamed so
+            an interrupted save never leaves a half-written cache.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Reversals
+        frames = [df.assign(source=name) for name, df in self.reversals.items()]
+        if frames:
+            cached = pd.concat(frames, ignore_index=True)
+        else:
+            cached = pd.DataFrame(columns=list(self.dtypes) + ['source'])
+        tmp = self.reversals_path + '.tmp'
+        cached.to_csv(tmp, index=False)
+        os.replace(tmp, self.reversals_path)
+
+        # Manifest last, so it never describes reversals that were not saved
+        tmp = self.manifest_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'files': self.manifest}, f)
+        os.replace(tmp, self.manifest_path)
+        logger.debug("Saved scoring cache with %d files", len(self.manifest))
@@ -3,42 +3,341 @@
 ###########
 # Imports #
 ###########
-# GUI
-from tkinter import filedialog
-
 # Data Science
 import numpy as np
 import pandas as pd
 
 # System
 import glob
+import logging
 import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+# Custom
+from . import trialarchive
+from .scoringcache import CACHE_DIRNAME, ScoringCache
+from .trialtimer import TIMING_DIRNAME
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#############
+# Constants #
+#############
+# Columns required for scoring, with fixed data types. Pinning the
+# schema skips type inference and keeps subject IDs such as '0012'
+# from being parsed as integers.
+DTYPES = {
+    'subject': str,
+    'condition': str,
+    # Nullable, so a blank cell does not fail the whole file
+    'test_freq': 'Int64',
+    'desired_level_dB': 'float64',
+    'reversal': 'bool',
+}
+USECOLS = list(DTYPES)
+
+# Optional columns used by sweep() to flag tracks that ended at the
+# staircase floor or ceiling (read only when present)
+LIMIT_DTYPES = {
+    'staircase_level': 'float64',
+    'min_level': 'float64',
+    'max_level': 'float64',
+}
+
+# Optional columns with the posterior threshold estimate of QUEST
+# tracks, which are scored from their last estimate rather than from
+# reversals (read when present; older files have neither)
+ESTIMATE_DTYPES = {
+    'estimator': str,
+    'threshold_estimate': 'float64',
+}
+
+# Columns that identify a track
+KEYS = ['subject', 'condition', 'test_freq']
+
+# Rows per chunk when scoring in streaming mode
+STREAM_CHUNKSIZE = 100000
+
+
+def _file_dtypes(path, diagnostics=False):
+    """ Scoring columns of a trial CSV or columnar archive, with the
+        optional columns it has (only the header is read).
+
+        diagnostics: also include the LIMIT_DTYPES columns
+
+        Returns: dict of column: dtype
+    """
+    if trialarchive.is_archive(path):
+        columns = set(trialarchive.archive_columns(path))
+    else:
+        columns = set(pd.read_csv(path, nrows=0).columns)
+    optional = dict(ESTIMATE_DTYPES, **LIMIT_DTYPES) if diagnostics \
+        else ESTIMATE_DTYPES
+    return dict(DTYPES, **{col: dtype for col, dtype in optional.items()
+                           if col in columns})
+
+
+def _read_trial_file(path, diagnostics=False):
+    """ Read only the scoring columns from a single trial CSV or
+        columnar archive. Defined at module level so it can be sent
+        to a process pool.
+
+        diagnostics: also read the LIMIT_DTYPES columns, if present
+    """
+    dtypes = _file_dtypes(path, diagnostics)
+    if trialarchive.is_archive(path):
+        data = trialarchive.read_archive(path, columns=list(dtypes))
+        return data.astype(dtypes)
+    return pd.read_csv(path, usecols=list(dtypes), dtype=dtypes)
+
+
+def _final_estimates(data):
+    """ Last threshold estimate of each QUEST track.
+
+        Returns: a Series of estimates indexed by
+            (subject, condition, test_freq) (empty for data without
+            estimates)
+    """
+    if not all(col in data for col in ESTIMATE_DTYPES):
+        return pd.Series(dtype='float64')
+    quest = data.loc[(data['estimator'] == 'QUEST')
+                     & data['threshold_estimate'].notna(),
+                     KEYS + ['threshold_estimate']]
+    quest = quest.dropna(subset=KEYS)
+    return quest.groupby(KEYS)['threshold_estimate'].last().round(2)
+
+
+def _tail_stats(levels, counts, num_reversals):
+    """ Mean and SD of the last n values of each track.
+
+        levels: values grouped by track, in trial order
+        counts: number of values in each track
+
+        Tracks keeping the same number of values are stacked into one
+        matrix and reduced along its rows. Row sums match np.mean() in
+        _avg_revs(), so rounding ties break the same way.
 
+        Returns: arrays of means and sample SDs (NaN where undefined)
+    """
+    ends = np.cumsum(counts)
+    kept = np.minimum(counts, num_reversals)
+    means = np.full(len(counts), np.nan)
+    sds = np.full(len(counts), np.nan)
+    for n in np.unique(kept[kept > 0]):
+        tracks = np.flatnonzero(kept == n)
+        rows = levels[ends[tracks, None] - n + np.arange(n)]
+        means[tracks] = rows.sum(axis=1) / n
+        if n > 1:
+            sds[tracks] = rows.std(axis=1, ddof=1)
+    return means, sds
 
+
+def _iter_trial_chunks(path, chunksize):
+    """ Yield the scoring columns of a trial CSV or columnar archive
+        in chunks of at most chunksize rows.
+    """
+    dtypes = _file_dtypes(path)
+    if trialarchive.is_archive(path):
+        for chunk in trialarchive.iter_archive(path, list(dtypes),
+                                               chunksize):
+            yield chunk.astype(dtypes)
+    else:
+        yield from pd.read_csv(path, usecols=list(dtypes), dtype=dtypes,
+                               chunksize=chunksize)
+
+
+def find_trial_files(paths, recursive=False):
+    """ Expand directories and glob patterns into a sorted list of
+        trial files (.csv and columnar archives). Directories matched
+        by a pattern are searched too. Sidecar cache and timing
+        folders are skipped.
+    """
+    skipped = {CACHE_DIRNAME, TIMING_DIRNAME}
+    suffixes = ('.csv',) + trialarchive.ARCHIVE_SUFFIXES
+    files = set()
+    for path in paths:
+        for match in glob.glob(path, recursive=recursive):
+            if os.path.isdir(match):
+                pattern = os.path.join(match, '**', '*') if recursive \
+                    else os.path.join(match, '*')
+                candidates = glob.glob(pattern, recursive=recursive)
+            else:
+                candidates = [match]
+            for file in candidates:
+                if os.path.isfile(file) \
+                        and file.lower().endswith(suffixes) \
+                        and not skipped.intersection(file.split(os.sep)):
+                    files.add(os.path.normpath(file))
+    return sorted(files)
+
+
+################
+# ScoringModel #
+################
 class ScoringModel:
-    def __init__(self):
-        """ Display system file browser and save data dir. """
-        try:
-            self.directory = filedialog.askdirectory()
-        except KeyError:
+    def __init__(self, directory=None, workers=1, use_processes=False,
+                 incremental=False, stream=False, recursive=False,
+                 output='thresholds.csv', diagnostics=False):
+        """ Load trial data for scoring. If no directory is given,
+            display system file browser and save data dir.
+
+            directory: a data directory, glob pattern, or a list of
+                them (no GUI is needed when provided)
+            workers: number of files to read at once (None uses
+                all available cores)
+            use_processes: read files in a process pool instead
+                of a thread pool
+            incremental: only read files that are new or changed
+                since the last visit, using a sidecar cache in each
+                data directory
+            stream: do not load the data up front; score() reads
+                the files in chunks and only keeps the last n 
+                reversals of each track in memory
+            recursive: also search subdirectories
+            output: path of the thresholds CSV written by score()
+            diagnostics: also read the staircase level and limits,
+                so sweep() can flag tracks that ended at a limit
+        """
+        if directory is None:
+            # Only import Tk when a dialog is actually needed
+            from tkinter import filedialog
+            try:
+                directory = filedialog.askdirectory()
+            except KeyError:
+                pass
+
+        if isinstance(directory, (list, tuple)):
+            self.paths = [str(path) for path in directory]
+        else:
+            self.paths = [str(directory)]
+        self.directory = self.paths[0]
+
+        self.workers = workers
+        self.use_processes = use_processes
+        self.incremental = incremental
+        self.stream = stream
+        self.diagnostics = diagnostics
+        self.recursive = recursive
+        self.output = output
+
+        if stream:
             pass
+        elif incremental:
+            self._organize_data_incremental()
+        else:
+            self._organize_data()
 
-        self._organize_data()
+
+    def _read_files(self, files):
+        """ Read trial files, in parallel if requested.
+
+            Returns: a list of DataFrames in the same order as files
+        """
+        read = partial(_read_trial_file, diagnostics=self.diagnostics)
+        if self.workers == 1 or len(files) < 2:
+            return [read(file) for file in files]
+
+        pool = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        with pool(max_workers=self.workers) as executor:
+            # map() preserves file order
+            return list(executor.map(read, files))
+
+
+    def _get_files(self):
+        """ Return all trial files from the provided directories
+            (sorted so file order does not depend on the file system).
+        """
+        files = find_trial_files(self.paths, self.recursive)
+        if not files:
+            raise ValueError(
+                f"No trial data found in: {', '.join(self.paths)}")
+        return files
+
+
+    def _report_ingest(self, num_files, num_rows, start):
+        """ Log and store ingestion throughput. """
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        self.ingest_stats = {
+            'files': num_files,
+            'rows': num_rows,
+            'seconds': elapsed,
+            'files_per_sec': num_files / elapsed,
+            'rows_per_sec': num_rows / elapsed,
+        }
+        logger.info(
+            "Read %d files (%d rows) in %.3f s: %.1f files/s, %.1f rows/s",
+            num_files, num_rows, elapsed,
+            self.ingest_stats['files_per_sec'],
+            self.ingest_stats['rows_per_sec']
+        )
 
 
     def _organize_data(self):
         """ Concatenate data from all CSVs in dir. """
-        # Get all .csv file names from provided directory
-        all_files = glob.glob(os.path.join(self.directory, "*.csv"))
+        all_files = self._get_files()
 
         # Create single dataframe
-        li = []
-        for file in all_files:
-            df = pd.read_csv(file)
-            li.append(df)
-        self.data = pd.concat(li)
+        start = time.perf_counter()
+        self.data = pd.concat(self._read_files(all_files))
         self.data.reset_index(drop=True, inplace=True)
 
+        self._report_ingest(len(all_files), len(self.data), start)
+
+
+    def _organize_data_incremental(self):
+        """ Concatenate reversal data from all CSVs in dir, reading
+            only files that changed since the last visit. Unchanged
+            files are served from the sidecar cache.
+
+            NOTE: self.data only holds reversal, threshold estimate
+            and last-of-track rows in this mode, which is all score()
+            needs.
+        """
+        all_files = self._get_files()
+
+        # One sidecar cache per data directory
+        caches = dict()
+        for file in all_files:
+            folder = os.path.dirname(file)
+            if folder not in caches:
+                caches[folder] = ScoringCache(
+                    folder, dict(DTYPES, **ESTIMATE_DTYPES), KEYS)
+
+        # Read new and changed files only
+        start = time.perf_counter()
+        stale = [file for file in all_files
+                 if not caches[os.path.dirname(file)].is_current(file)]
+        frames = self._read_files(stale)
+        for file, df in zip(stale, frames):
+            caches[os.path.dirname(file)].update(file, df)
+        self._report_ingest(len(stale), sum(len(df) for df in frames), start)
+        logger.info("Reused cached reversals for %d files",
+                    len(all_files) - len(stale))
+
+        for folder, cache in caches.items():
+            cache.prune([file for file in all_files
+                         if os.path.dirname(file) == folder])
+            # A read-only data directory should not prevent scoring:
+            # the data read this time are scored without a cache
+            try:
+                cache.save()
+            except OSError as e:
+                logger.warning("Could not save scoring cache (scoring "
+                               "without it): %s", e)
+
+        self.data = pd.concat(
+            [caches[os.path.dirname(file)].get_reversals([file])
+             for file in all_files],
+            ignore_index=True
+        )
+
 
     def _avg_revs(self, df, num_reversals) -> float:
         """ Custom function for use with Pandas apply().
@@ -52,7 +351,159 @@ class ScoringModel:
         # Calculate thresholds
         thresholds = np.round(np.mean(df['desired_level_dB'][last_n_indexes]), 2)
         return thresholds
-        
+
+
+    def _track_arrays(self, data):
+        """ Sort rows by track, keeping trial order within each track.
+            Rows with a missing key must be dropped first (as groupby
+            does), since ngroup() numbers them -1.
+
+            Returns: the track index, the track number of each sorted
+                row, and the sort order of the rows
+        """
+        grouped = data.groupby(KEYS)
+        track_ids = grouped.ngroup().to_numpy()
+        order = np.argsort(track_ids, kind='stable')
+        return grouped.size().index, track_ids[order], order
+
+
+    def _last_n_means(self, data, num_reversals):
+        """ Vectorized equivalent of grouping by track and applying
+            _avg_revs(). Reversal levels are sorted by track and the
+            last n are averaged without a Python call per track.
+
+            Returns: a Series of thresholds indexed by
+                (subject, condition, test_freq)
+        """
+        data = data.dropna(subset=KEYS)
+        tracks, track_ids, order = self._track_arrays(data)
+        is_rev = data['reversal'].to_numpy(dtype=bool)[order]
+        levels = data['desired_level_dB'].to_numpy()[order][is_rev]
+        counts = np.bincount(track_ids[is_rev], minlength=len(tracks))
+
+        # Tracks without reversals score NaN, as with _avg_revs()
+        means, _ = _tail_stats(levels, counts, num_reversals)
+        return pd.Series(np.round(means, 2), index=tracks)
+
+
+    def sweep(self, num_reversals_list):
+        """ Calculate thresholds for several numbers of reversals at
+            once, plus per-track diagnostics, and write to CSV. All
+            values come from the same sorted reversal arrays.
+
+            Columns: threshold_<n> and sd_<n> (SD of the averaged
+                reversals; QUEST tracks have their final estimate
+                and no SD) for each n, num_trials, num_reversals,
+                trials_to_first_reversal and ended_at_limit 
+                ('min_level', 'max_level' or '', if the data were
+                loaded with diagnostics=True)
+        """
+        # Validation
+        if not num_reversals_list or min(num_reversals_list) <= 0:
+            raise ValueError("Number of reversals cannot be 0 or negative!")
+        if self.stream or self.incremental:
+            raise ValueError("A sweep needs every trial row; load the data "
+                             "without stream or incremental mode.")
+
+        data = self.data.dropna(subset=KEYS)
+        tracks, track_ids, order = self._track_arrays(data)
+        is_rev = data['reversal'].to_numpy(dtype=bool)[order]
+        levels = data['desired_level_dB'].to_numpy()[order][is_rev]
+        rev_counts = np.bincount(track_ids[is_rev], minlength=len(tracks))
+        num_trials = np.bincount(track_ids, minlength=len(tracks))
+
+        estimates = _final_estimates(data)
+        is_quest = tracks.isin(estimates.index)
+        quest_estimates = estimates.reindex(tracks[is_quest]).to_numpy()
+
+        sweep_df = pd.DataFrame(index=tracks)
+        for n in sorted(set(num_reversals_list)):
+            means, sds = _tail_stats(levels, rev_counts, n)
+            sweep_df[f'threshold_{n}'] = np.round(means, 2)
+            sweep_df.loc[is_quest, f'threshold_{n}'] = quest_estimates
+            sweep_df[f'sd_{n}'] = np.where(is_quest, np.nan,
+                                           np.round(sds, 2))
+
+        sweep_df['num_trials'] = num_trials
+        sweep_df['num_reversals'] = rev_counts
+
+        # Trial number (within the track) of the first reversal
+        starts = np.cumsum(num_trials) - num_trials
+        position = np.arange(len(track_ids)) - starts[track_ids]
+        rev_tracks, first = np.unique(track_ids[is_rev], return_index=True)
+        trials_to_first = np.full(len(tracks), np.nan)
+        trials_to_first[rev_tracks] = position[is_rev][first] + 1
+        sweep_df['trials_to_first_reversal'] = trials_to_first
+
+        # Whether the last trial was presented at a staircase limit
+        if all(col in data for col in LIMIT_DTYPES):
+            last_rows = order[np.cumsum(num_trials) - 1]
+            final = data['staircase_level'].to_numpy()[last_rows]
+            sweep_df['ended_at_limit'] = np.select(
+                [final <= data['min_level'].to_numpy()[last_rows],
+                 final >= data['max_level'].to_numpy()[last_rows]],
+                ['min_level', 'max_level'],
+                default=''
+            )
+        else:
+            sweep_df['ended_at_limit'] = None
+
+        self.sweep_df = sweep_df.reset_index()
+        self.write_to_csv(self.sweep_df)
+
+
+    def _stream_thresholds(self, num_reversals, chunksize=STREAM_CHUNKSIZE):
+        """ Out-of-core equivalent of _last_n_means(). Files are read
+            in chunks and a ring buffer holds the last n reversal
+            levels of each track, so memory grows with the number of
+            tracks rather than the number of trials. QUEST tracks
+            keep their latest threshold estimate instead.
+
+            Returns: a Series of thresholds indexed by
+                (subject, condition, test_freq)
+        """
+        tails = dict()
+        estimates = dict()
+
+        start = time.perf_counter()
+        all_files = self._get_files()
+        num_rows = 0
+        for file in all_files:
+            for chunk in _iter_trial_chunks(file, chunksize):
+                num_rows += len(chunk)
+                chunk = chunk.dropna(subset=KEYS)
+
+                # Register every track, including those without reversals
+                for track in chunk[KEYS].drop_duplicates().itertuples(
+                        index=False, name=None):
+                    if track not in tails:
+                        tails[track] = deque(maxlen=num_reversals)
+
+                # Only the last n reversals of a chunk can reach the buffer
+                revs = chunk.loc[chunk['reversal'] == True,
+                                 KEYS + ['desired_level_dB']]
+                from_end = revs.groupby(KEYS, sort=False).cumcount(
+                    ascending=False)
+                revs = revs[from_end < num_reversals]
+                for track, levels in revs.groupby(KEYS, sort=False)[
+                        'desired_level_dB']:
+                    tails[track].extend(levels.to_numpy())
+
+                # Later chunks hold later estimates
+                estimates.update(_final_estimates(chunk).items())
+        self._report_ingest(len(all_files), num_rows, start)
+
+        # Average each ring buffer
+        tracks = sorted(tails)
+        thresholds = [
+            estimates[track] if track in estimates
+            else np.round(np.mean(tails[track]), 2) if tails[track]
+            else np.nan
+            for track in tracks
+        ]
+        index = pd.MultiIndex.from_tuples(tracks, names=KEYS)
+        return pd.Series(thresholds, index=index, dtype='float64')
+
 
     def score(self, num_reversals):
         """ Calculate thresholds and write to CSV. """
@@ -61,17 +512,18 @@ class ScoringModel:
             raise ValueError("Number of reversals cannot be 0 or negative!")
 
         # Get dataframe of thresholds derived from the last n reversals
-        thresholds = self.data.groupby(
-            by=[
-                'subject', 
-                'condition', 
-                'test_freq'
-            ]
-        ).apply(self._avg_revs, num_reversals=num_reversals)
+        # (or, for QUEST tracks, the final threshold estimate)
+        if self.stream:
+            thresholds = self._stream_thresholds(num_reversals)
+        else:
+            thresholds = self._last_n_means(self.data, num_reversals)
+            estimates = _final_estimates(self.data)
+            is_quest = thresholds.index.isin(estimates.index)
+            thresholds[is_quest] = estimates.reindex(
+                thresholds.index[is_quest]).to_numpy()
 
         # Organize dataframe
-        thresholds_df = thresholds.reset_index()
-        self.thresholds_df = thresholds_df.rename(columns={0:'threshold'})
+        self.thresholds_df = thresholds.rename('threshold').reset_index()
 
         self.write_to_csv(self.thresholds_df)
 
@@ -79,5 +531,5 @@ class ScoringModel:
     def write_to_csv(self, data_to_write):
         """ Wrapper 'to_csv' function for easier unit testing. """
         # Write thresholds to CSV
-        data_to_write.to_csv('thresholds.csv', index=False)
+        data_to_write.to_csv(self.output, index=False)
         print(f"\nscoringmodel: Thresholds written to CSV successfully")
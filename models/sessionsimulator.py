@@ -0,0 +1,150 @@
+""" Headless simulation of P.E.A.T. sessions.
+
+    Runs the same staircase configuration as the app against a
+    simulated observer, without Tk or an audio device, and writes
+    trial CSVs in the same format as a real session. Use it to try
+    out staircase settings, to generate data for ScoringModel and to
+    benchmark the trial logic (see simulate_sessions.py).
+"""
+
+###########
+# Imports #
+###########
+# Standard library
+import csv
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Third party
+import numpy as np
+
+# Custom Modules
+from .observer import Observer
+from .observer import default_settings
+from .sessionsnapshot import RECORD_FIELDS
+from .sessionsnapshot import SessionSnapshot
+from .stimulusmodel import StimulusModel
+from .trackfactory import create_level_plan
+from .trackfactory import create_staircase
+from .trackfactory import estimate_fields
+from .trackfactory import trial_levels
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#############
+# Functions #
+#############
+def _calc_level(settings):
+    """ Stand-in for the app's calibration (calmodel), which the
+        simulator does not have: dB FS = desired SPL - slm_offset.
+    """
+    slm_offset = settings['slm_offset'].get()
+    return lambda desired_spl: desired_spl - slm_offset
+
+
+def simulate_session(filepath, thresholds, settings=None, slope=2.0,
+                     lapse=0.02, seed=None):
+    """ Run every test frequency of one simulated session, the way
+        start_new_run and _on_submit do, and write the trial CSV.
+
+        Returns: number of trials
+    """
+    if settings is None:
+        settings = default_settings()
+    observer = Observer(thresholds, slope=slope, lapse=lapse, seed=seed)
+    stim_model = StimulusModel(settings)
+    freqs, _ = stim_model.get_test_freqs()
+    calc_level = _calc_level(settings)
+
+    records = []
+    for freq in freqs:
+        snapshot = SessionSnapshot.from_settings(settings, test_freq=freq)
+        staircase = create_staircase(settings)
+        level_plan = create_level_plan(settings, stim_model, freq,
+                                       calc_level)
+
+        while staircase.status:
+            staircase_level = staircase.current_level
+            desired, adjusted = trial_levels(level_plan, stim_model, freq,
+                                             staircase_level, calc_level)
+            if observer.respond(staircase_level, freq):
+                staircase.add_response(1)
+            else:
+                staircase.add_response(-1)
+            datapoint = staircase.dw.datapoints[-1]
+            records.append(snapshot.record(
+                trial=len(records) + 1,
+                adjusted_level_dB=adjusted,
+                desired_level_dB=desired,
+                response=datapoint.response,
+                reversal=datapoint.reversal,
+                staircase_level=staircase_level,
+                **estimate_fields(staircase, desired, staircase_level)
+            ))
+
+    with open(filepath, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RECORD_FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+    return len(records)
+
+
+def _simulate_one(args):
+    """ Process pool entry point. """
+    filepath, thresholds, overrides, slope, lapse, seed = args
+    return simulate_session(filepath, thresholds,
+        settings=default_settings(**overrides), slope=slope, lapse=lapse,
+        seed=seed)
+
+
+def run_simulations(directory, num_sessions, thresholds=None, slope=2.0,
+                    lapse=0.02, workers=None, seed=0, **overrides):
+    """ Simulate num_sessions sessions across a process pool, one
+        CSV per session (subject SIM00000, SIM00001, ...). Sessions
+        are seeded from seed, so results are reproducible. overrides
+        replace default settings (e.g., num_reversals=8).
+
+        thresholds maps frequency to threshold (staircase dB);
+        frequencies without one use 0.
+
+        Returns: dict of run statistics
+    """
+    os.makedirs(directory, exist_ok=True)
+    freqs = [int(val) for val in default_settings(**overrides)[
+        'test_freqs'].get().split(', ')]
+    thresholds = {freq: (thresholds or {}).get(freq, 0) for freq in freqs}
+
+    seeds = np.random.SeedSequence(seed).generate_state(num_sessions)
+    jobs = []
+    for i in range(num_sessions):
+        session_overrides = dict(overrides, subject=f"SIM{i:05d}")
+        session_overrides.setdefault('condition', 'SIM')
+        filepath = os.path.join(directory, "{subject}_{condition}.csv"
+                                .format(**session_overrides))
+        jobs.append((filepath, thresholds, session_overrides, slope, lapse,
+                     int(seeds[i])))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        trials = sum(executor.map(_simulate_one, jobs,
+                                  chunksize=max(1, num_sessions // 64)))
+    seconds = time.perf_counter() - start
+
+    stats = {
+        'sessions': num_sessions,
+        'trials': trials,
+        'seconds': seconds,
+        'sessions_per_sec': num_sessions / seconds if seconds else 0.0,
+        'trials_per_sec': trials / seconds if seconds else 0.0,
+    }
+    logger.info("Simulated %d sessions (%d trials) in %.2f s "
+                "(%.0f trials/s)", num_sessions, trials, seconds,
+                stats['trials_per_sec'])
+    return stats
+
@@ -0,0 +1,78 @@
+""" Frozen snapshot of the session settings for one run. """
+
+###########
+# Imports #
+###########
+# Standard library
+import logging
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#############
+# Constants #
+#############
+# Columns of a trial record, in file order
+RECORD_FIELDS = (
+    'trial', 'subject', 'condition', 'min_level', 'max_level',
+    'duration', 'step_sizes', 'num_reversals', 'rapid_descend',
+    'slm_reading', 'cal_level_dB', 'slm_offset', 'adjusted_level_dB',
+    'desired_level_dB', 'test_freq', 'response', 'reversal',
+    'staircase_level', 'estimator', 'threshold_estimate', 'threshold_sd'
+)
+
+# Columns that change from trial to trial
+# (threshold_estimate and threshold_sd are blank for staircases)
+TRIAL_FIELDS = (
+    'trial', 'adjusted_level_dB', 'desired_level_dB', 'response',
+    'reversal', 'staircase_level', 'threshold_estimate', 'threshold_sd'
+)
+
+# Columns that are fixed for a run (i.e., one test frequency)
+RUN_FIELDS = tuple(field for field in RECORD_FIELDS
+                   if field not in TRIAL_FIELDS)
+
+###################
+# SessionSnapshot #
+###################
+class SessionSnapshot:
+    """ Run-level record values, read from the settings once at the
+        start of a run. Instances cannot be modified, so every record
+        in a run has the same metadata.
+    """
+    __slots__ = RUN_FIELDS
+
+    def __init__(self, **values):
+        for field in RUN_FIELDS:
+            object.__setattr__(self, field, values[field])
+
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SessionSnapshot is read-only")
+
+
+    @classmethod
+    def from_settings(cls, settings, test_freq):
+        """ Read run-level values from the settings dict of Tk
+            variables.
+        """
+        logger.debug("Taking session snapshot for %s Hz", test_freq)
+        values = {field: settings[field].get() for field in RUN_FIELDS
+                  if field != 'test_freq'}
+        return cls(test_freq=test_freq, **values)
+
+
+    def record(self, **trial_values):
+        """ Build a trial record from this snapshot and the values
+            in TRIAL_FIELDS.
+
+            Returns: dict in RECORD_FIELDS order
+        """
+        missing = set(TRIAL_FIELDS) - set(trial_values)
+        if missing:
+            raise KeyError(", ".join(sorted(missing)))
+        return {field: trial_values[field] if field in TRIAL_FIELDS
+                else getattr(self, field) for field in RECORD_FIELDS}
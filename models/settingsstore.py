@@ -0,0 +1,88 @@
+""" Debounced, dirty-tracking persistence of the runtime settings. """
+
+###########
+# Imports #
+###########
+# Standard library
+import logging
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#################
+# SettingsStore #
+#################
+class SettingsStore:
+    """ Persist the runtime settings dict (of Tk variables) through
+        the settings model, writing the file only when values have
+        changed since the last write.
+
+        save() merges rapid requests into a single write delay_ms
+        later. During trials nothing needs to be called: changes are
+        picked up by the next save() or flush().
+
+        The file itself is written by the settings model's save(),
+        in the model's format and at the model's location.
+    """
+    def __init__(self, root, settings_model, settings, delay_ms=500):
+        # Assign variables
+        self.root = root
+        self.settings_model = settings_model
+        self.settings = settings
+        self.delay_ms = delay_ms
+
+        # Values as of the last write
+        self._saved = {key: data['value']
+                       for key, data in settings_model.fields.items()}
+        self._after_id = None
+
+        # Number of writes, for diagnostics
+        self.writes = 0
+
+
+    def dirty(self):
+        """ Return the keys whose values differ from the last write. """
+        return [key for key, variable in self.settings.items()
+                if self._saved.get(key) != variable.get()]
+
+
+    def save(self):
+        """ Write changed settings after delay_ms, merging any other
+            requests in the meantime into the same write.
+        """
+        if self._after_id is None:
+            self._after_id = self.root.after(self.delay_ms, self.flush)
+
+
+    def flush(self):
+        """ Write changed settings now. Returns True if the file was
+            written.
+        """
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+        changed = self.dirty()
+        if not changed:
+            logger.debug("Settings unchanged - nothing to write")
+            return False
+
+        for key in changed:
+            self.settings_model.set(key, self.settings[key].get())
+        self._write()
+        for key in changed:
+            self._saved[key] = self.settings[key].get()
+        self.writes += 1
+        logger.debug("Saved settings: %s", ", ".join(changed))
+        return True
+
+
+    def _write(self):
+        """ Write the settings model to its file with the model's own
+            serializer, so the file format is always the one the
+            model reads back.
+        """
+        self.settings_model.save()
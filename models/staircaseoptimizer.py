@@ -0,0 +1,186 @@
+""" Vectorized Monte Carlo simulation of staircase settings.
+
+    Simulates the 1-up/2-down track used by start_new_run for many
+    tracks at once, with one NumPy array per track variable, and
+    summarises trial counts and threshold bias/variance over a grid
+    of staircase settings.
+
+    Track rules (as in the app):
+        - Two correct responses in a row: step down. An incorrect
+          response: step up.
+        - Rapid descend: until the first incorrect response, every
+          correct response steps down.
+        - A reversal is a change of direction. The step size is
+          step_sizes[number of reversals so far], holding the last
+          value.
+        - Levels are held within [min_level, max_level].
+        - A track ends at num_reversals reversals. Its threshold is
+          the mean level of the last score_reversals reversals.
+"""
+
+###########
+# Imports #
+###########
+# Standard library
+import itertools
+import logging
+import time
+
+# Third party
+import numpy as np
+import pandas as pd
+
+# Custom Modules
+from .observer import Observer
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#############
+# Constants #
+#############
+# Proportion correct tracked by a 1-up/2-down staircase (Levitt, 1971)
+TARGET_P = np.sqrt(0.5)
+
+#############
+# Functions #
+#############
+def target_level(threshold, slope=2.0, guess=0.5, lapse=0.02):
+    """ Level at which the observer is TARGET_P correct, i.e., the
+        level the staircase converges on.
+    """
+    return threshold - slope * np.log(
+        (1 - guess - lapse) / (TARGET_P - guess) - 1)
+
+
+def simulate_tracks(num_tracks, step_sizes, num_reversals, rapid_descend,
+                    starting_level, min_level, max_level, threshold,
+                    slope=2.0, lapse=0.02, score_reversals=None,
+                    max_trials=500, seed=None, responses=None,
+                    record_levels=False):
+    """ Simulate num_tracks independent staircase tracks.
+
+        responses: optional (num_tracks, max_trials) boolean array of
+            responses (True = correct) to use instead of the observer
+
+        Returns: dict of per-track arrays
+            trials: number of trials
+            threshold: mean of the last score_reversals reversal
+                levels (NaN if the track did not finish)
+            finished: True if the track reached num_reversals within
+                max_trials
+            levels: (num_tracks, max_trials) level of each trial, NaN
+                after the track ended (only with record_levels)
+    """
+    if score_reversals is None:
+        score_reversals = num_reversals
+    if not 0 < score_reversals <= num_reversals:
+        raise ValueError("score_reversals must be between 1 and "
+                         "num_reversals")
+
+    observer = Observer({0: threshold}, slope=slope, lapse=lapse, seed=seed)
+    steps = np.asarray(step_sizes, dtype=np.float64)
+
+    level = np.full(num_tracks, float(starting_level))
+    streak = np.zeros(num_tracks, dtype=np.int64)
+    direction = np.zeros(num_tracks, dtype=np.int64)
+    num_revs = np.zeros(num_tracks, dtype=np.int64)
+    descending = np.full(num_tracks, bool(rapid_descend))
+    trials = np.zeros(num_tracks, dtype=np.int64)
+    rev_levels = np.full((num_tracks, num_reversals), np.nan)
+    active = np.arange(num_tracks)
+    if record_levels:
+        levels = np.full((num_tracks, max_trials), np.nan)
+
+    for trial in range(max_trials):
+        if not active.size:
+            break
+        lv = level[active]
+        if responses is None:
+            correct = observer.rng.random(active.size) \
+                < observer.p_correct(lv, 0)
+        else:
+            correct = np.asarray(responses[active, trial], dtype=bool)
+        if record_levels:
+            levels[active, trial] = lv
+        trials[active] += 1
+
+        # 1 up, 2 down (1 down while rapid descending)
+        st = np.where(correct, streak[active] + 1, 0)
+        needed = np.where(descending[active], 1, 2)
+        move = np.where(correct, np.where(st >= needed, -1, 0), 1)
+        st[move == -1] = 0
+        streak[active] = st
+        descending[active] &= correct
+
+        # Reversals are recorded at the level of the reversing trial
+        d = direction[active]
+        is_rev = (move != 0) & (d != 0) & (move != d)
+        rev_levels[active[is_rev], num_revs[active[is_rev]]] = lv[is_rev]
+        revs = num_revs[active] + is_rev
+        num_revs[active] = revs
+        direction[active] = np.where(move != 0, move, d)
+
+        step = steps[np.minimum(revs, steps.size - 1)]
+        level[active] = np.clip(lv + move * step, min_level, max_level)
+        active = active[revs < num_reversals]
+
+    finished = num_revs >= num_reversals
+    thresholds = np.where(
+        finished, rev_levels[:, -score_reversals:].mean(axis=1), np.nan)
+    tracks = {
+        'trials': trials,
+        'threshold': thresholds,
+        'finished': finished,
+    }
+    if record_levels:
+        tracks['levels'] = levels
+    return tracks
+
+
+def evaluate_grid(step_sizes, num_reversals, rapid_descend,
+                  starting_level, threshold, min_level=-50, max_level=90,
+                  slope=2.0, lapse=0.02, score_reversals=None,
+                  num_tracks=10000, max_trials=500, seed=0):
+    """ Simulate every combination of the lists step_sizes (each a
+        list of steps), num_reversals, rapid_descend and
+        starting_level.
+
+        Bias is relative to the level the observer gets TARGET_P
+        correct (see target_level).
+
+        Returns: DataFrame with one row per setting, fewest expected
+            trials first
+    """
+    target = target_level(threshold, slope=slope, lapse=lapse)
+    rng = np.random.SeedSequence(seed)
+    rows = []
+    start = time.perf_counter()
+    for steps, revs, rapid, start_level in itertools.product(
+            step_sizes, num_reversals, rapid_descend, starting_level):
+        tracks = simulate_tracks(
+            num_tracks, steps, revs, rapid, start_level, min_level,
+            max_level, threshold, slope=slope, lapse=lapse,
+            score_reversals=min(score_reversals or revs, revs),
+            max_trials=max_trials, seed=rng.spawn(1)[0]
+        )
+        error = tracks['threshold'][tracks['finished']] - target
+        rows.append({
+            'step_sizes': ", ".join(f"{step:g}" for step in steps),
+            'num_reversals': revs,
+            'rapid_descend': rapid,
+            'starting_level': start_level,
+            'mean_trials': tracks['trials'].mean(),
+            'p95_trials': np.percentile(tracks['trials'], 95),
+            'finished': tracks['finished'].mean(),
+            'bias': error.mean() if error.size else np.nan,
+            'sd': error.std(ddof=1) if error.size > 1 else np.nan,
+            'rmse': np.sqrt(np.mean(error ** 2)) if error.size else np.nan,
+        })
+    logger.info("Simulated %d settings x %d tracks in %.2f s", len(rows),
+                num_tracks, time.perf_counter() - start)
+    return pd.DataFrame(rows).sort_values(
+        'mean_trials', ignore_index=True)
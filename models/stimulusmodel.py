@@ -8,6 +8,9 @@ import logging
 import os
 import random
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 # Third party
 import numpy as np
@@ -28,16 +31,37 @@ from tmpy.dsp import tmsignals
 # Create new logger
 logger = logging.getLogger(__name__)
 
+#############
+# Constants #
+#############
+# Maximum level error (dB) allowed for reduced-precision stimuli
+LEVEL_TOLERANCE_DB = 0.01
+
 #################
 # StimulusModel #
 #################
 class StimulusModel:
-    def __init__(self, sessionpars):
+    def __init__(self, sessionpars, cache_budget_mb=256, dtype='float64'):
         logger.debug("Initializing StimulusModel")
 
         # Assign variables
         self.sessionpars = sessionpars
 
+        # Sample format of synthesized stimuli. float32 halves memory
+        # and matches what the sound device consumes.
+        self.dtype = np.dtype(dtype)
+
+        # Stimulus cache: least recently used stimuli are evicted
+        # once the cache exceeds its memory budget
+        self.cache_budget = cache_budget_mb * 2**20
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
+
+        # Background synthesis (see prefetch)
+        self._executor = None
+        self._pending = dict()
+
         # RETSPL levels for binaural listening in a sound field,
         # in a diffuse field. From ANSI S3.6 (Table 9a). 
         self.RETSPL = {
@@ -142,48 +166,144 @@ class StimulusModel:
         return np.radians(degrees[:stim_chans])
 
 
+    def _stimulus_key(self, dur, fs, fc, mod_rate, mod_depth):
+        """ Cache key for a stimulus. Reads the current number of
+            channels, so must be called from the main thread.
+        """
+        stim_chans = self.sessionpars['num_stim_chans'].get()
+        return (dur, fs, fc, mod_rate, mod_depth, self.dtype, stim_chans)
+
+
+    def _cache_get(self, key):
+        """ Return a cached stimulus (or None) and mark it as
+            recently used.
+        """
+        with self._cache_lock:
+            sig = self._cache.get(key)
+            if sig is not None:
+                self._cache.move_to_end(key)
+            return sig
+
+
+    def _cache_put(self, key, sig):
+        """ Add a stimulus to the cache and evict least recently used
+            stimuli until the cache fits its budget. The newest stimulus 
+            is always kept.
+        """
+        with self._cache_lock:
+            if key in self._cache:
+                return
+            self._cache[key] = sig
+            self._cache_bytes += sig.nbytes
+            while self._cache_bytes > self.cache_budget \
+                    and len(self._cache) > 1:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted.nbytes
+                logger.debug("Evicted stimulus from cache")
+
+
+    def prefetch(self, dur, fs, fc, mod_rate, mod_depth):
+        """ Start synthesizing a stimulus on a worker thread, so a 
+            later call to create_stimulus() with the same arguments
+            returns without delay.
+        """
+        key = self._stimulus_key(dur, fs, fc, mod_rate, mod_depth)
+        if key in self._pending or self._cache_get(key) is not None:
+            return
+
+        logger.debug("Prefetching %s Hz stimulus", fc)
+        # Channel phases are read here because Tk variables must
+        # not be accessed from the worker thread
+        phi_rad = self._get_random_phis()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending[key] = self._executor.submit(
+            self._synthesize, key, dur, fs, fc, mod_rate, mod_depth, phi_rad)
+
+
     def create_stimulus(self, dur, fs, fc, mod_rate, mod_depth):
         """ Synthesize n-channel gated warble tones with pseudo-random
             starting phases. Scale to -40 dB.
 
+            Stimuli are cached (and may have been prefetched), so the
+            returned array is shared and must not be modified in place.
+
             Returns: N-channel warble tone (FM)
         """
-        logger.debug("Creating stimulus")
-        # Get number of sources/channels
-        stim_chans = self.sessionpars['num_stim_chans'].get()
+        key = self._stimulus_key(dur, fs, fc, mod_rate, mod_depth)
+
+        # Prefetched on a worker thread (waits if still running)
+        future = self._pending.pop(key, None)
+        if future is not None:
+            logger.debug("Using prefetched stimulus")
+            return future.result()
+
+        sig = self._cache_get(key)
+        if sig is not None:
+            logger.debug("Using cached stimulus")
+            return sig
 
         # Get random phi values in radians based on number of sources
         phi_rad = self._get_random_phis()
-        
-        # Generate an n-channel warble tone array
-        sig_list = []
-        for ii in range(0, stim_chans):
-            # Generate warble tone based on current freq
-            wt = tmsignals.warble_tone(
-                dur=dur,
-                fs=fs, 
-                fc=fc,
-                phi=phi_rad[ii],
-                mod_rate=mod_rate,
-                mod_depth=mod_depth
-            )
-            # Apply gating
-            wt = tmsignals.doGate(wt, rampdur=0.04, fs=fs)
-
-            # Scale to -40 (default for this system)
-            wt = tmsignals.setRMS(wt, -40)
-
-            # # Plot first two cycles to illustrate random starting phase
-            # period = 1/fc
-            # samps = int(period * fs)
-            # samps = samps * 2
-            # plt.plot(wt[:samps])
-            # plt.show()
-            # plt.close()
-
-            # Add individual wt to list
-            sig_list.append(np.array(wt))
-
-        sig_list = np.array(sig_list).T
 
+        return self._synthesize(key, dur, fs, fc, mod_rate, mod_depth,
+                                phi_rad)
+
+
+    def _check_level(self, sig, level):
+        """ Raise ValueError if any channel of sig deviates from the
+            expected RMS level by more than LEVEL_TOLERANCE_DB.
+        """
+        rms = np.sqrt(np.einsum('ij,ij->j', sig, sig, dtype=np.float64)
+                      / sig.shape[0])
+        error = np.max(np.abs(20 * np.log10(rms) - level))
+        logger.debug("%s level error: %.6f dB", sig.dtype, error)
+        if error > LEVEL_TOLERANCE_DB:
+            raise ValueError(f"{sig.dtype} stimulus level is off by "
+                             f"{error:.4f} dB")
+
+
+    def _synthesize(self, key, dur, fs, fc, mod_rate, mod_depth, phi_rad):
+        """ Synthesize a stimulus and add it to the cache. Does not
+            touch Tk variables, so it can run on a worker thread.
+
+            Returns: N-channel warble tone (FM)
+        """
+        logger.debug("Creating stimulus")
+        # Get number of sources/channels
+        stim_chans = key[-1]
+
+        # Channels only differ in the starting phase of the carrier:
+        #   sin(theta(t) + phi) = cos(phi)*sin(theta(t)) + sin(phi)*cos(theta(t))
+        # so two warble tones (phi = 0 and pi/2) are enough to build 
+        # any number of channels with a single matrix product.
+        basis = np.column_stack([
+            tmsignals.warble_tone(dur=dur, fs=fs, fc=fc, phi=phi,
+                mod_rate=mod_rate, mod_depth=mod_depth)
+            for phi in (0, np.pi/2)
+        ])
+
+        # Apply gating (the same window for every channel)
+        window = tmsignals.doGate(np.ones(basis.shape[0]), rampdur=0.04, fs=fs)
+        basis *= window[:, np.newaxis]
+
+        # Channel mixing weights, scaled so each channel is -40 dB RMS
+        # (default for this system). Channel RMS follows from the 2x2
+        # Gram matrix of the basis, so no pass over the output is needed.
+        weights = np.array([np.cos(phi_rad[:stim_chans]),
+                            np.sin(phi_rad[:stim_chans])])
+        gram = basis.T @ basis
+        rms = np.sqrt(np.einsum('ij,ik,kj->j', weights, gram, weights)
+                      / basis.shape[0])
+        weights *= 10 ** (-40 / 20) / rms
+
+        # Mix into a preallocated, C-contiguous (samples, channels) array
+        sig_list = np.empty((basis.shape[0], stim_chans), dtype=key[-2])
+        np.matmul(basis, weights, out=sig_list, casting='same_kind')
+
+        # Reduced precision must not change the presentation level
+        if sig_list.dtype != np.float64:
+            self._check_level(sig_list, -40)
+
+        self._cache_put(key, sig_list)
         return sig_list
@@ -0,0 +1,119 @@
+""" Staircase and level plan creation shared by the app and the
+    session simulator, so a simulated run uses the same tracks and
+    presentation levels as a real one.
+"""
+
+###########
+# Imports #
+###########
+# Standard library
+import logging
+import os
+import sys
+
+# Add custom path
+try:
+    sys.path.append(os.environ['TMPY'])
+except KeyError:
+    sys.path.append('C:\\Users\\MooTra\\Code\\Python')
+
+# Custom Modules
+from tmpy import handlers
+from .levelplanner import SINE_CREST_FACTOR_DB
+from .levelplanner import LevelPlanner
+from .questhandler import QuestHandler
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#############
+# Functions #
+#############
+def get_step_sizes(settings):
+    """ Convert step_sizes to list of ints. """
+    steps = settings['step_sizes'].get()
+    return [int(val) for val in steps.split(', ')]
+
+
+def create_staircase(settings):
+    """ Create a staircase (or QUEST track, depending on the
+        estimator setting) with the current settings.
+    """
+    if settings['estimator'].get() == 'QUEST':
+        return QuestHandler(
+            start_val=settings['starting_level'].get(),
+            min_val=settings['min_level'].get(),
+            max_val=settings['max_level'].get(),
+            step=min(get_step_sizes(settings)),
+            stop_sd=settings['stop_sd_dB'].get(),
+            min_trials=settings['quest_min_trials'].get(),
+            max_trials=settings['quest_max_trials'].get()
+        )
+    return handlers.StaircaseHandler(
+        start_val=settings['starting_level'].get(),
+        step_sizes=get_step_sizes(settings),
+        nUp=1,
+        nDown=2,
+        nTrials=0,
+        nReversals=settings['num_reversals'].get(),
+        rapid_descend=settings['rapid_descend_bool'].get(),
+        min_val=settings['min_level'].get(),
+        max_val=settings['max_level'].get()
+    )
+
+
+def create_level_plan(settings, stim_model, freq, calc_level,
+                      crest_factor_db=SINE_CREST_FACTOR_DB):
+    """ Precompute the presentation levels of freq's staircase.
+        calc_level converts a desired level to dB FS (see
+        LevelPlanner).
+    """
+    return LevelPlanner(
+        stim_model=stim_model,
+        freq=freq,
+        start_level=settings['starting_level'].get(),
+        step_sizes=get_step_sizes(settings),
+        min_level=settings['min_level'].get(),
+        max_level=settings['max_level'].get(),
+        calc_level=calc_level,
+        crest_factor_db=crest_factor_db
+    )
+
+
+def estimate_fields(staircase, desired_level, staircase_level):
+    """ Threshold estimate and SD of a QUEST track after its latest
+        response, for the trial record. The estimate is moved from
+        staircase levels to desired_level_dB (by this trial's RETSPL
+        and channel offset), the units thresholds are scored in.
+
+        Returns: dict of threshold_estimate and threshold_sd (blank
+            for staircases)
+    """
+    if not isinstance(staircase, QuestHandler):
+        return {'threshold_estimate': '', 'threshold_sd': ''}
+    return {
+        'threshold_estimate': round(
+            staircase.threshold + desired_level - staircase_level, 2),
+        'threshold_sd': round(staircase.threshold_sd, 2),
+    }
+
+
+def trial_levels(level_plan, stim_model, freq, staircase_level, calc_level):
+    """ Look up the RETSPL-adjusted, single channel level and the
+        offset (dB FS) level for staircase_level, calculating them
+        if the level is not in the plan.
+
+        Returns: (desired, adjusted)
+    """
+    try:
+        desired, adjusted = level_plan.lookup(staircase_level)
+        return float(desired), float(adjusted)
+    except KeyError:
+        logger.warning("Staircase level %s is not in the level plan",
+                       staircase_level)
+    desired = stim_model.calc_presentation_lvl(
+        stair_lvl=staircase_level, freq=freq)
+    return float(desired), float(calc_level(desired))
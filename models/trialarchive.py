@@ -0,0 +1,151 @@
+""" Columnar (Parquet/Feather) archives of raw trial data.
+
+    Trial CSVs repeat every session setting on every row. Compacting
+    a cohort into a single columnar archive stores those columns
+    dictionary-encoded, keeps numeric columns typed, and lets scoring
+    read only the columns it needs.
+
+    Requires pyarrow.
+"""
+
+###########
+# Imports #
+###########
+# Data Science
+import pandas as pd
+
+# System
+import glob
+import logging
+import os
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#############
+# Constants #
+#############
+# Supported archive formats
+ARCHIVE_SUFFIXES = ('.parquet', '.feather')
+
+# Columns always stored as (dictionary-encoded) strings
+STRING_COLUMNS = ['subject', 'condition']
+
+#############
+# Functions #
+#############
+def is_archive(path):
+    """ Return True if path is a columnar trial archive. """
+    return os.path.splitext(path)[1].lower() in ARCHIVE_SUFFIXES
+
+
+def archive_columns(path):
+    """ Return the column names stored in a trial archive, without
+        reading any data.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if os.path.splitext(path)[1].lower() == '.feather':
+        return pa.ipc.open_file(path).schema.names
+    return pq.read_schema(path).names
+
+
+def read_archive(path, columns=None):
+    """ Read a trial archive, loading only the requested columns. """
+    if os.path.splitext(path)[1].lower() == '.feather':
+        return pd.read_feather(path, columns=columns)
+    return pd.read_parquet(path, columns=columns)
+
+
+def iter_archive(path, columns=None, batch_size=65536):
+    """ Yield a trial archive as DataFrames of at most batch_size
+        rows, without loading the whole archive into memory.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if os.path.splitext(path)[1].lower() == '.feather':
+        # Feather files are read one stored record batch at a time,
+        # and larger batches are sliced (without copying)
+        reader = pa.ipc.open_file(path)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size).to_pandas()
+    else:
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size, columns=columns):
+            yield batch.to_pandas()
+
+
+def compact(directory, archive_path):
+    """ Convert all trial CSVs in directory into one columnar archive.
+        The archive format is chosen from the archive_path suffix.
+        Text columns are stored as categoricals (dictionary-encoded)
+        and the source CSV of each row is kept in 'source_file'.
+
+        The archive cannot be written inside directory, where scoring
+        the folder would count every trial twice (once from its CSV
+        and once from the archive).
+
+        Returns: the number of rows written
+    """
+    if not is_archive(archive_path):
+        raise ValueError(
+            f"Archive must end with one of: {', '.join(ARCHIVE_SUFFIXES)}")
+    data_dir = os.path.realpath(directory)
+    archive_dir = os.path.realpath(os.path.dirname(
+        os.path.abspath(archive_path)))
+    if os.path.commonpath([data_dir, archive_dir]) == data_dir:
+        raise ValueError(
+            f"Archive must be saved outside {directory}, or its trials "
+            "would be scored twice")
+
+    all_files = sorted(glob.glob(os.path.join(directory, "*.csv")))
+    if not all_files:
+        raise FileNotFoundError(f"No CSV files found in {directory}")
+
+    # Read every column; keep IDs as strings
+    frames = []
+    dtypes = {col: str for col in STRING_COLUMNS}
+    for file in all_files:
+        df = pd.read_csv(file, dtype=dtypes)
+        df['source_file'] = os.path.basename(file)
+        frames.append(df)
+    data = pd.concat(frames, ignore_index=True)
+
+    # Dictionary-encode all remaining text columns
+    for col in data.columns:
+        if not pd.api.types.is_numeric_dtype(data[col]) \
+                and not pd.api.types.is_bool_dtype(data[col]):
+            data[col] = data[col].astype('category')
+
+    if os.path.splitext(archive_path)[1].lower() == '.feather':
+        data.to_feather(archive_path)
+    else:
+        data.to_parquet(archive_path, index=False)
+
+    csv_bytes = sum(os.path.getsize(file) for file in all_files)
+    logger.info(
+        "Compacted %d files (%d rows, %.1f MB) into %s (%.1f MB)",
+        len(all_files), len(data), csv_bytes / 1e6, archive_path,
+        os.path.getsize(archive_path) / 1e6
+    )
+    return len(data)
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Compact P.E.A.T. trial CSVs into a columnar archive.")
+    parser.add_argument('directory', help="folder of trial CSVs")
+    parser.add_argument('archive', help="output .parquet or .feather file")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    compact(args.directory, args.archive)
@@ -0,0 +1,105 @@
+""" Render a complete 2IAFC trial into a single audio buffer. """
+
+###########
+# Imports #
+###########
+# Standard library
+import logging
+
+# Third party
+import numpy as np
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#################
+# TrialRenderer #
+#################
+class TrialRenderer:
+    """ Build lead-in, interval 1, ISI and interval 2 into one
+        pre-allocated (samples, channels) buffer, with the stimulus
+        at the start of its assigned interval.
+
+        Submitting the whole trial to the sound device at once makes
+        interval timing sample-accurate and avoids setting up a new
+        player for every interval. Interval boundaries are returned
+        in seconds from the start of the buffer, for the visual cues.
+    """
+    def __init__(self, fs, lead_in=0.5, isi=0.5):
+        # Assign variables
+        self.fs = fs
+        self.lead_in = lead_in
+        self.isi = isi
+
+        # Reused between trials while the layout does not change
+        self._buffer = None
+
+        # Sample counts of the most recent render (see buffer_level)
+        self._stim_samples = 0
+        self._total_samples = 0
+
+
+    def _seconds_to_samples(self, seconds):
+        return int(round(seconds * self.fs))
+
+
+    def render(self, stim, stim_interval, interval_dur):
+        """ Render a trial with stim in stim_interval (1 or 2).
+            Each interval lasts interval_dur seconds.
+
+            The returned buffer is overwritten by the next call.
+
+            Returns: buffer, {interval: (start_s, end_s)}
+        """
+        if stim_interval not in (1, 2):
+            raise ValueError(f"Invalid stimulus interval: {stim_interval}")
+
+        if stim.ndim == 1:
+            stim = stim[:, np.newaxis]
+        interval_len = self._seconds_to_samples(interval_dur)
+        if stim.shape[0] > interval_len:
+            raise ValueError("Stimulus is longer than the interval")
+
+        # Interval start samples
+        lead_len = self._seconds_to_samples(self.lead_in)
+        isi_len = self._seconds_to_samples(self.isi)
+        starts = {
+            1: lead_len,
+            2: lead_len + interval_len + isi_len
+        }
+        total = starts[2] + interval_len
+
+        # Allocate only when the trial layout changes
+        shape = (total, stim.shape[1])
+        if self._buffer is None or self._buffer.shape != shape \
+                or self._buffer.dtype != stim.dtype:
+            logger.debug("Allocating %d x %d trial buffer", *shape)
+            self._buffer = np.zeros(shape, dtype=stim.dtype)
+        else:
+            self._buffer.fill(0)
+
+        start = starts[stim_interval]
+        self._buffer[start:start + stim.shape[0]] = stim
+
+        self._stim_samples = stim.shape[0]
+        self._total_samples = total
+
+        boundaries = {
+            interval: (first / self.fs, (first + interval_len) / self.fs)
+            for interval, first in starts.items()
+        }
+        return self._buffer, boundaries
+
+
+    def buffer_level(self, level):
+        """ Level (dB) to present the last rendered buffer at, so the
+            stimulus itself plays at level. The player scales the RMS
+            of the whole buffer, which the surrounding silence lowers
+            by 10*log10(stimulus samples / buffer samples).
+        """
+        if not self._stim_samples:
+            raise RuntimeError("No trial has been rendered")
+        return level + 10 * np.log10(self._stim_samples / self._total_samples)
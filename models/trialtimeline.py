@@ -0,0 +1,123 @@
+""" Non-blocking, deadline-based scheduler for trial events. """
+
+###########
+# Imports #
+###########
+# Standard library
+import logging
+import time
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#################
+# TrialTimeline #
+#################
+class TrialTimeline:
+    """ Run a sequence of callbacks at fixed times after the start of
+        a trial, using the Tk event loop instead of time.sleep() so
+        the window stays responsive.
+
+        Deadlines are measured on the monotonic clock from the start
+        of the timeline, so late events do not push back later ones.
+        Because after() is only accurate to a few milliseconds, each
+        event is first scheduled slightly early and then re-checked
+        every millisecond until its deadline. Events never run early.
+
+        root: anything with Tk's after() and after_cancel()
+        clock: monotonic clock in seconds (tests pass a fake one)
+    """
+    # Seconds before a deadline to switch to fine-grained re-checks
+    COARSE_MARGIN = 0.015
+
+    def __init__(self, root, name='Trial', clock=time.perf_counter):
+        # Assign variables
+        self.root = root
+        self.name = name
+        self.clock = clock
+
+        # List of (offset in seconds, callback, label)
+        self.events = []
+
+        # List of (label, scheduling error in ms) after each event
+        self.jitter = []
+
+        self._t0 = None
+        self._after_id = None
+        self._on_done = None
+
+
+    @property
+    def running(self):
+        """ True while events are still pending. """
+        return self._after_id is not None
+
+
+    def add(self, offset, callback, label=''):
+        """ Schedule callback to run offset seconds after start(). """
+        self.events.append((offset, callback, label))
+        self.events.sort(key=lambda event: event[0])
+
+
+    def start(self, on_done=None):
+        """ Start the timeline. on_done is called after the last event. """
+        self._on_done = on_done
+        self.jitter = []
+        self._t0 = self.clock()
+        self._schedule(0)
+
+
+    def cancel(self):
+        """ Stop the timeline without running the remaining events. """
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+
+    def _schedule(self, index):
+        """ Wait for the deadline of event index. """
+        if index >= len(self.events):
+            self._after_id = None
+            self._finish()
+            return
+
+        deadline = self._t0 + self.events[index][0]
+        remaining = deadline - self.clock()
+        if remaining > self.COARSE_MARGIN:
+            # At least 1 ms, so the event loop is not polled with
+            # after(0) just outside the margin
+            delay_ms = max(1, int((remaining - self.COARSE_MARGIN) * 1000))
+            self._after_id = self.root.after(
+                delay_ms, lambda: self._schedule(index))
+        elif remaining > 0.001:
+            self._after_id = self.root.after(1, lambda: self._schedule(index))
+        else:
+            # Spin for the last (sub-)millisecond
+            while self.clock() < deadline:
+                pass
+            self._fire(index, deadline)
+
+
+    def _fire(self, index, deadline):
+        """ Run event index and record how late it was. """
+        _, callback, label = self.events[index]
+        error_ms = (self.clock() - deadline) * 1000
+        self.jitter.append((label, error_ms))
+        callback()
+        self._schedule(index + 1)
+
+
+    def _finish(self):
+        """ Log scheduling jitter and call on_done. """
+        if self.jitter:
+            logger.info(
+                "%s schedule jitter (ms): %s (max %.2f)",
+                self.name,
+                ", ".join(f"{label} {err:+.2f}" for label, err in self.jitter),
+                max(abs(err) for _, err in self.jitter)
+            )
+        if self._on_done is not None:
+            self._on_done()
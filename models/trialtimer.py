@@ -0,0 +1,130 @@
+""" Per-trial timing of the work between a response and the next
+    stimulus onset.
+"""
+
+###########
+# Imports #
+###########
+# Standard library
+import contextlib
+import logging
+import time
+
+# Third party
+import numpy as np
+
+# Custom Modules
+from .recordwriter import RecordWriter
+
+##########
+# Logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#############
+# Constants #
+#############
+# Folder (inside the data folder) for timing files, which scoring skips
+TIMING_DIRNAME = 'Timing'
+
+# Columns of the timing file (times in ms)
+TIMING_FIELDS = [
+    'trial',
+    'response_to_onset_ms',
+    'save_ms',
+    'flush_ms',
+    'level_ms',
+    'render_ms',
+    'audio_submit_ms',
+]
+
+PERCENTILES = [50, 95, 99]
+
+##############
+# TrialTimer #
+##############
+class TrialTimer:
+    """ Collect timestamps (time.perf_counter) and durations for one
+        trial at a time, and write one row per trial to a CSV sidecar
+        file (on RecordWriter's thread, so the Tk thread never waits
+        on the disk).
+
+        A row belongs to the trial whose stimulus onset ends it:
+        response_to_onset_ms runs from the 'response' mark (submit
+        of the previous trial) to the 'onset' mark (audio submitted),
+        and the durations are the work done in between. Missing
+        values are left empty.
+    """
+    def __init__(self, filepath):
+        # Assign variables
+        self.filepath = filepath
+        self.writer = RecordWriter(filepath)
+
+        self._marks = dict()
+        self._durations = dict()
+
+        # All rows so far, for summary()
+        self.rows = []
+
+
+    def mark(self, name):
+        """ Record the current time under name. """
+        self._marks[name] = time.perf_counter()
+
+
+    def unmark(self, name):
+        """ Forget a mark (e.g., when waiting for the participant). """
+        self._marks.pop(name, None)
+
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        """ Add the duration of the with-block to name (ms). """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._durations[name] = self._durations.get(name, 0.0) \
+                + (time.perf_counter() - start) * 1000
+
+
+    def end_trial(self, trial):
+        """ Write the row for trial and start the next one. """
+        row = {field: '' for field in TIMING_FIELDS}
+        row['trial'] = trial
+        if 'response' in self._marks and 'onset' in self._marks:
+            row['response_to_onset_ms'] = round(
+                (self._marks['onset'] - self._marks['response']) * 1000, 3)
+        for name, duration in self._durations.items():
+            row[f"{name}_ms"] = round(duration, 3)
+        self._marks.clear()
+        self._durations.clear()
+
+        self.rows.append(row)
+        self.writer.write(row)
+
+
+    def summary(self):
+        """ p50/p95/p99 of each timing column (ms).
+
+            Returns: {column: {'p50': ..., 'p95': ..., 'p99': ...}}
+        """
+        summary = dict()
+        for field in TIMING_FIELDS[1:]:
+            values = [row[field] for row in self.rows if row[field] != '']
+            if values:
+                summary[field] = {
+                    f"p{p}": float(np.percentile(values, p))
+                    for p in PERCENTILES
+                }
+        return summary
+
+
+    def close(self, timeout=None):
+        """ Write the remaining rows and log the session summary. """
+        self.writer.close(timeout)
+        for field, stats in self.summary().items():
+            logger.info("%s over %d trials: %s", field, len(self.rows),
+                        ", ".join(f"{key} {value:.2f}"
+                                  for key, value in stats.items()))
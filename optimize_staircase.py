@@ -0,0 +1,101 @@
+""" Compare staircase settings by Monte Carlo simulation.
+
+    Simulates thousands of 1-up/2-down tracks for every combination
+    of the given settings and prints the expected number of trials
+    and the threshold bias/variance for each, e.g.:
+
+        python optimize_staircase.py --steps "10, 5, 2" "5, 2" \\
+            --reversals 5 6 8 --start 30 50 -t 20
+"""
+
+###########
+# Imports #
+###########
+# Standard library
+import argparse
+import logging
+import sys
+
+# Third party
+import pandas as pd
+
+# Custom Modules
+from models.staircaseoptimizer import evaluate_grid
+
+##########
+# logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#############
+# Functions #
+#############
+def _parse_args(argv):
+    """ Parse command line arguments. """
+    parser = argparse.ArgumentParser(
+        description="Compare staircase settings by simulation."
+    )
+    parser.add_argument('--steps', nargs='+', default=["10, 5, 2"],
+        help="step sizes, one comma-separated list per setting "
+        "(default: '10, 5, 2')")
+    parser.add_argument('--reversals', type=int, nargs='+', default=[5],
+        help="number of reversals per track (default: 5)")
+    parser.add_argument('--score-reversals', type=int, default=None,
+        help="number of final reversals to average (default: all)")
+    parser.add_argument('--rapid-descend', choices=['yes', 'no', 'both'],
+        default='both', help="rapid descend (default: both)")
+    parser.add_argument('--start', type=float, nargs='+', default=[30],
+        help="starting level(s) in dB (default: 30)")
+    parser.add_argument('--min-level', type=float, default=-50)
+    parser.add_argument('--max-level', type=float, default=90)
+    parser.add_argument('-t', '--threshold', type=float, default=0,
+        help="observer threshold (staircase dB)")
+    parser.add_argument('--slope', type=float, default=2.0,
+        help="psychometric function slope in dB (default: 2)")
+    parser.add_argument('--lapse', type=float, default=0.02,
+        help="lapse rate (default: 0.02)")
+    parser.add_argument('-n', '--tracks', type=int, default=10000,
+        help="tracks per setting (default: 10000)")
+    parser.add_argument('-o', '--output', default=None,
+        help="also write the results to this CSV")
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """ Command line entry point. Returns a process exit code. """
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    rapid = {'yes': [True], 'no': [False], 'both': [True, False]}
+    try:
+        results = evaluate_grid(
+            step_sizes=[[float(step) for step in steps.split(',')]
+                        for steps in args.steps],
+            num_reversals=args.reversals,
+            rapid_descend=rapid[args.rapid_descend],
+            starting_level=args.start,
+            threshold=args.threshold,
+            min_level=args.min_level,
+            max_level=args.max_level,
+            slope=args.slope,
+            lapse=args.lapse,
+            score_reversals=args.score_reversals,
+            num_tracks=args.tracks,
+            seed=args.seed
+        )
+    except ValueError as e:
+        logger.error("%s", e)
+        return 1
+
+    with pd.option_context('display.width', 120,
+                           'display.max_columns', None):
+        print(results.round(2).to_string(index=False))
+    if args.output:
+        results.to_csv(args.output, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
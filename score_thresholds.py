@@ -0,0 +1,120 @@
+""" Headless batch scoring for P.E.A.T. data.
+
+    Calculates thresholds from raw trial data without opening the GUI,
+    e.g., for scheduled scoring of a whole study tree:
+
+        python score_thresholds.py "S:/study/*/data" -r -n 4 -o out.csv
+
+    Accepts any number of directories and/or glob patterns. Tk is
+    never imported.
+"""
+
+###########
+# Imports #
+###########
+# Standard library
+import argparse
+import logging
+import sys
+
+# Custom Modules
+from models.scoringmodel import ScoringModel
+
+##########
+# logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#############
+# Functions #
+#############
+def score_thresholds(paths, num_reversals, output='thresholds.csv',
+                     recursive=False, workers=1, use_processes=False,
+                     incremental=False, stream=False):
+    """ Score all trial files found in paths and write thresholds
+        to output. If num_reversals is a list of several values, a
+        single-pass sweep with track diagnostics is written instead
+        (see ScoringModel.sweep).
+
+        Returns: a DataFrame of thresholds
+    """
+    if isinstance(num_reversals, int):
+        num_reversals = [num_reversals]
+    sweep = len(set(num_reversals)) > 1
+
+    s = ScoringModel(
+        directory=list(paths),
+        workers=workers,
+        use_processes=use_processes,
+        incremental=incremental,
+        stream=stream,
+        recursive=recursive,
+        output=output,
+        diagnostics=sweep
+    )
+    if sweep:
+        s.sweep(num_reversals)
+        return s.sweep_df
+    s.score(num_reversals[0])
+    return s.thresholds_df
+
+
+def _parse_args(argv):
+    """ Parse command line arguments. """
+    parser = argparse.ArgumentParser(
+        description="Calculate P.E.A.T. thresholds from raw trial data."
+    )
+    parser.add_argument('paths', nargs='+',
+        help="data directories and/or glob patterns")
+    parser.add_argument('-n', '--num-reversals', type=int, nargs='+',
+        required=True, help="number of final reversals to average "
+        "(several values write a sweep with track diagnostics)")
+    parser.add_argument('-o', '--output', default='thresholds.csv',
+        help="output CSV path (default: thresholds.csv)")
+    parser.add_argument('-r', '--recursive', action='store_true',
+        help="search subdirectories (and '**' in patterns)")
+    parser.add_argument('-w', '--workers', type=int, default=1,
+        help="number of files to read at once (0 = all cores)")
+    parser.add_argument('--processes', action='store_true',
+        help="read files in a process pool instead of a thread pool")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--incremental', action='store_true',
+        help="only read new or changed files (uses a sidecar cache)")
+    mode.add_argument('--stream', action='store_true',
+        help="score in chunks with bounded memory")
+    parser.add_argument('-v', '--verbose', action='store_true',
+        help="show progress and throughput")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """ Command line entry point. Returns a process exit code. """
+    args = _parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(levelname)s: %(message)s'
+    )
+
+    try:
+        thresholds = score_thresholds(
+            paths=args.paths,
+            num_reversals=args.num_reversals,
+            output=args.output,
+            recursive=args.recursive,
+            workers=args.workers or None,
+            use_processes=args.processes,
+            incremental=args.incremental,
+            stream=args.stream
+        )
+    except ValueError as e:
+        # Invalid number of reversals or no trial files found
+        logger.error("%s", e)
+        return 1
+
+    logger.info("Wrote %d thresholds to %s", len(thresholds), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
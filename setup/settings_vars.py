@@ -6,6 +6,7 @@ fields = {
     'subject': {'type': 'str', 'value': '999'},
     'condition': {'type': 'str', 'value': 'TEST'},
     'disp_plots': {'type': 'int', 'value': 0},
+    'profiling': {'type': 'int', 'value': 0},
 
     # Stimulus option variables
     'num_stim_chans': {'type': 'int', 'value': 1},
@@ -20,10 +21,17 @@ fields = {
     'num_reversals': {'type': 'int', 'value': 5},
     'rapid_descend': {'type': 'str', 'value': 'Yes'},
     'rapid_descend_bool': {'type': 'bool', 'value': True},
+    'interleave_policy': {'type': 'str', 'value': 'Off'},
+    'estimator': {'type': 'str', 'value': 'Staircase'},
+    'stop_sd_dB': {'type': 'float', 'value': 3.0},
+    'quest_min_trials': {'type': 'int', 'value': 8},
+    'quest_max_trials': {'type': 'int', 'value': 80},
     
     # Audio device variables
     'audio_device': {'type': 'int', 'value': 999},
     'channel_routing': {'type': 'str', 'value': '1'},
+    'audio_dtype': {'type': 'str', 'value': 'float32'},
+    'audio_backend': {'type': 'str', 'value': 'device'},
 
     # Calibration variables
     'cal_file': {'type': 'str', 'value': 'cal_stim.wav'},
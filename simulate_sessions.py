@@ -0,0 +1,72 @@
+""" Simulate P.E.A.T. sessions without the GUI.
+
+    Writes one trial CSV per simulated session, e.g., to try out
+    staircase settings or to generate data for scoring:
+
+        python simulate_sessions.py Sim -s 1000 -t 20 -w 8
+
+    Tk and the audio device are never used.
+"""
+
+###########
+# Imports #
+###########
+# Standard library
+import argparse
+import logging
+import sys
+
+# Custom Modules
+from models.observer import default_settings
+from models.sessionsimulator import run_simulations
+
+##########
+# logger #
+##########
+# Create new logger
+logger = logging.getLogger(__name__)
+
+#############
+# Functions #
+#############
+def _parse_args(argv):
+    """ Parse command line arguments. """
+    parser = argparse.ArgumentParser(
+        description="Simulate P.E.A.T. sessions and write trial CSVs."
+    )
+    parser.add_argument('directory', help="output folder")
+    parser.add_argument('-s', '--sessions', type=int, default=100,
+        help="number of sessions (default: 100)")
+    parser.add_argument('-t', '--threshold', type=float, default=0,
+        help="observer threshold at every frequency (staircase dB)")
+    parser.add_argument('--slope', type=float, default=2.0,
+        help="psychometric function slope in dB (default: 2)")
+    parser.add_argument('--lapse', type=float, default=0.02,
+        help="lapse rate (default: 0.02)")
+    parser.add_argument('-w', '--workers', type=int, default=0,
+        help="number of processes (0 = all cores)")
+    parser.add_argument('--seed', type=int, default=0,
+        help="random seed (default: 0)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """ Command line entry point. Returns a process exit code. """
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    freqs = default_settings()['test_freqs'].get().split(', ')
+    run_simulations(
+        args.directory,
+        args.sessions,
+        thresholds={int(freq): args.threshold for freq in freqs},
+        slope=args.slope,
+        lapse=args.lapse,
+        workers=args.workers or None,
+        seed=args.seed
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+""" Benchmarks for presentation level calculation. """
+
+###########
+# Imports #
+###########
+# Custom Modules
+from models.levelplanner import LevelPlanner
+from models.stimulusmodel import StimulusModel
+from test.benchmarks.datagen import make_sessionpars
+
+##############
+# Benchmarks #
+##############
+def bench_calc_presentation_lvl(suite):
+    """ Per-trial level calculation for 1 and 9 channels. """
+    for num_chans in (1, 9):
+        model = StimulusModel(make_sessionpars(num_chans))
+        suite.time('calc_presentation_lvl',
+                   lambda: model.calc_presentation_lvl(stair_lvl=30,
+                                                       freq=1000),
+                   {'channels': num_chans})
+
+
+def bench_level_plan(suite):
+    """ Building a run's level table, and one per-trial lookup. """
+    model = StimulusModel(make_sessionpars(1))
+
+    def plan():
+        return LevelPlanner(stim_model=model, freq=1000, start_level=30,
+                            step_sizes=[10, 5, 2], min_level=-50,
+                            max_level=90,
+                            calc_level=lambda desired: desired - 100)
+
+    suite.time('LevelPlanner', plan, {'steps': '10, 5, 2'})
+    level_plan = plan()
+    suite.time('LevelPlanner.lookup', lambda: level_plan.lookup(30))
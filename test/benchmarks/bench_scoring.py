@@ -0,0 +1,37 @@
+""" Benchmarks for reading and scoring trial data. """
+
+###########
+# Imports #
+###########
+# System
+import os
+import tempfile
+
+# Custom Modules
+from models.scoringmodel import ScoringModel
+from test.benchmarks.datagen import write_trial_files
+
+##############
+# Benchmarks #
+##############
+def bench_scoring(suite):
+    """ Reading (_organize_data) and scoring (score, without the
+        CSV output) for each data size. Slow sizes are repeated fewer
+        times.
+    """
+    for num_rows in suite.row_sizes():
+        with tempfile.TemporaryDirectory(dir=suite.workdir) as tmp:
+            data_dir = os.path.join(tmp, 'data')
+            num_files = write_trial_files(data_dir, num_rows)
+            model = ScoringModel(directory=data_dir,
+                                 output=os.path.join(tmp, 'thresholds.csv'))
+            # Time the scoring only, not writing (and reporting) the
+            # thresholds CSV
+            model.write_to_csv = lambda data_to_write: None
+            params = {'rows': num_rows, 'files': num_files}
+            repeat = 3 if num_rows >= 1_000_000 else None
+
+            suite.time('ScoringModel._organize_data', model._organize_data,
+                       params, repeat=repeat)
+            suite.time('ScoringModel.score', lambda: model.score(4),
+                       params, repeat=repeat)
@@ -0,0 +1,38 @@
+""" Benchmarks for stimulus synthesis. """
+
+###########
+# Imports #
+###########
+# Custom Modules
+from models.stimulusmodel import StimulusModel
+from test.benchmarks.datagen import make_sessionpars
+
+#############
+# Constants #
+#############
+STIMULUS = {'dur': 2, 'fs': 48000, 'fc': 1000, 'mod_rate': 5,
+            'mod_depth': 5}
+
+##############
+# Benchmarks #
+##############
+def bench_create_stimulus(suite):
+    """ Synthesis from scratch (cache cleared before every call) for
+        1 to 9 channels, in the app's default sample format.
+    """
+    for num_chans in range(1, 10):
+        model = StimulusModel(make_sessionpars(num_chans), dtype='float32')
+
+        def clear_cache():
+            model._cache.clear()
+            model._cache_bytes = 0
+
+        suite.time('create_stimulus', lambda: model.create_stimulus(
+            **STIMULUS), {'channels': num_chans}, setup=clear_cache)
+
+
+def bench_create_stimulus_cached(suite):
+    """ Repeated request for the same stimulus. """
+    model = StimulusModel(make_sessionpars(1), dtype='float32')
+    suite.time('create_stimulus (cached)',
+               lambda: model.create_stimulus(**STIMULUS), {'channels': 1})
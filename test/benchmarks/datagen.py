@@ -0,0 +1,89 @@
+""" Synthetic data for benchmarks. """
+
+###########
+# Imports #
+###########
+# Data Science
+import numpy as np
+import pandas as pd
+
+# System
+import os
+
+# Custom Modules
+from models.observer import default_settings
+from models.sessionsnapshot import RECORD_FIELDS
+
+#############
+# Constants #
+#############
+# Trials per staircase track and tracks per session file
+TRIALS_PER_TRACK = 30
+FREQS = [500, 1000, 2000, 4000]
+
+# Upper bound on the number of files written, so very large data sets
+# have large files rather than a huge number of small ones
+MAX_FILES = 100
+
+#############
+# Functions #
+#############
+def make_trial_data(num_rows, seed=0):
+    """ Trial records in the app's CSV schema: tracks of
+        TRIALS_PER_TRACK trials, one subject per len(FREQS) tracks,
+        about a quarter of trials flagged as reversals.
+    """
+    rng = np.random.default_rng(seed)
+    rows = np.arange(num_rows)
+    track = rows // TRIALS_PER_TRACK
+    level = np.round(rng.normal(40, 10, num_rows), 2)
+
+    data = pd.DataFrame({field: 0 for field in RECORD_FIELDS},
+                        index=rows)
+    data['trial'] = rows % (TRIALS_PER_TRACK * len(FREQS)) + 1
+    data['subject'] = np.char.add(
+        'S', (track // len(FREQS)).astype(str))
+    data['condition'] = 'BENCH'
+    data['min_level'] = -50.0
+    data['max_level'] = 90.0
+    data['duration'] = 2.0
+    data['step_sizes'] = "10, 5, 2"
+    data['num_reversals'] = 5
+    data['rapid_descend'] = 'Yes'
+    data['slm_reading'] = 70.0
+    data['cal_level_dB'] = -30.0
+    data['slm_offset'] = 100.0
+    data['desired_level_dB'] = level
+    data['adjusted_level_dB'] = level - 100
+    data['test_freq'] = np.asarray(FREQS)[track % len(FREQS)]
+    data['response'] = rng.choice([-1, 1], num_rows)
+    data['reversal'] = rng.random(num_rows) < 0.25
+    data['estimator'] = 'Staircase'
+    data['threshold_estimate'] = np.nan
+    data['threshold_sd'] = np.nan
+    data['staircase_level'] = level
+    return data
+
+
+def write_trial_files(directory, num_rows, seed=0):
+    """ Write num_rows trial records to CSVs in directory, split on
+        subject boundaries into at most MAX_FILES files.
+
+        Returns: the number of files written
+    """
+    os.makedirs(directory, exist_ok=True)
+    data = make_trial_data(num_rows, seed)
+    rows_per_session = TRIALS_PER_TRACK * len(FREQS)
+    sessions = max(1, -(-num_rows // rows_per_session))
+    num_files = min(sessions, MAX_FILES)
+    bounds = np.linspace(0, sessions, num_files + 1).astype(int) \
+        * rows_per_session
+    for i in range(num_files):
+        data.iloc[bounds[i]:bounds[i + 1]].to_csv(
+            os.path.join(directory, f"bench_{i:03d}.csv"), index=False)
+    return num_files
+
+
+def make_sessionpars(num_chans, test_freqs="500, 1000, 2000, 4000"):
+    """ Settings dict (without Tk) for StimulusModel. """
+    return default_settings(num_stim_chans=num_chans, test_freqs=test_freqs)
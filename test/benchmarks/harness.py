@@ -0,0 +1,158 @@
+""" Timing, result collection and comparison for benchmarks. """
+
+###########
+# Imports #
+###########
+# Standard library
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Third party
+import numpy as np
+import pandas as pd
+
+#############
+# Constants #
+#############
+# Smallest duration of one timed batch; fast calls are repeated
+# within a batch so timer resolution does not matter
+MIN_BATCH_SECONDS = 0.05
+
+#########
+# Suite #
+#########
+class Suite:
+    """ Collect benchmark results.
+
+        max_rows: largest number of trial rows to generate
+        repeat: number of timed batches per benchmark
+    """
+    def __init__(self, max_rows=1_000_000, repeat=7, workdir='.'):
+        # Assign variables
+        self.max_rows = max_rows
+        self.repeat = repeat
+        self.workdir = workdir
+        self.results = []
+
+
+    def row_sizes(self):
+        """ Trial row counts to benchmark (1k up to max_rows). """
+        sizes = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+        return [size for size in sizes if size <= self.max_rows]
+
+
+    def time(self, name, func, params=None, setup=None, repeat=None):
+        """ Time func() and store the statistics under name.
+
+            setup, if given, runs (untimed) before every call, so
+            every call is timed on its own. repeat overrides the
+            suite's number of batches (e.g., for very slow calls).
+        """
+        repeat = repeat or self.repeat
+        # Warm up (imports, caches of the interpreter, etc.)
+        if setup is not None:
+            setup()
+        func()
+
+        # Calls per batch: enough for MIN_BATCH_SECONDS, unless every
+        # call needs a fresh setup
+        number = 1
+        if setup is None:
+            while True:
+                start = time.perf_counter()
+                for _ in range(number):
+                    func()
+                if time.perf_counter() - start >= MIN_BATCH_SECONDS \
+                        or number >= 1_000_000:
+                    break
+                number *= 10
+
+        times = []
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            times.append((time.perf_counter() - start) / number)
+
+        q1, _, q3 = statistics.quantiles(times, n=4) \
+            if len(times) > 1 else (times[0],) * 3
+        result = {
+            'name': name,
+            'params': params or {},
+            'number': number,
+            'repeat': repeat,
+            'min': min(times),
+            'median': statistics.median(times),
+            'mean': statistics.mean(times),
+            'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+            'iqr': q3 - q1,
+        }
+        self.results.append(result)
+        print(f"{name:<32} {_format_params(result['params']):<24} "
+              f"median {_format_seconds(result['median'])} "
+              f"(IQR {_format_seconds(result['iqr'])})", flush=True)
+        return result
+
+
+    def save(self, path):
+        """ Write results and machine/version information to JSON. """
+        with open(path, 'w') as f:
+            json.dump({'meta': metadata(), 'results': self.results}, f,
+                      indent=2)
+
+#############
+# Functions #
+#############
+def _format_params(params):
+    return ", ".join(f"{key}={value}" for key, value in params.items())
+
+
+def _format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit:<2}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def metadata():
+    """ Where and on what the benchmarks ran. """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def compare(old_path, new_path):
+    """ Median times of two result files, matched by name and params.
+
+        Returns: DataFrame with old, new and new/old ratio
+    """
+    def load(path):
+        with open(path) as f:
+            results = json.load(f)['results']
+        return {(r['name'], _format_params(r['params'])): r['median']
+                for r in results}
+
+    old, new = load(old_path), load(new_path)
+    rows = [{'name': name, 'params': params, 'old': old[key],
+             'new': new[key], 'ratio': new[key] / old[key]}
+            for key in old if key in new for name, params in [key]]
+    return pd.DataFrame(rows)
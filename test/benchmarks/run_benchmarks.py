@@ -0,0 +1,88 @@
+""" Run the benchmark suite, or compare two result files.
+
+    From the repository root:
+
+        python -m test.benchmarks.run_benchmarks -o before.json
+        (make changes)
+        python -m test.benchmarks.run_benchmarks -o after.json
+        python -m test.benchmarks.run_benchmarks --compare before.json after.json
+
+    Only compare results from the same machine.
+"""
+
+###########
+# Imports #
+###########
+# Standard library
+import argparse
+import glob
+import importlib
+import os
+import sys
+
+# Custom Modules
+from test.benchmarks.harness import Suite
+from test.benchmarks.harness import compare
+
+#############
+# Functions #
+#############
+def find_benchmarks(keyword=None):
+    """ Return all bench_* functions of the bench_*.py modules,
+        optionally only those whose name contains keyword. Modules
+        whose dependencies are missing (e.g., tmpy for stimulus
+        synthesis) are skipped.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    benchmarks = []
+    for path in sorted(glob.glob(os.path.join(here, 'bench_*.py'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            module = importlib.import_module(f"test.benchmarks.{name}")
+        except ImportError as e:
+            print(f"Skipping {name}: {e}")
+            continue
+        for attr in sorted(dir(module)):
+            if attr.startswith('bench_') and (keyword is None
+                                              or keyword in attr):
+                benchmarks.append(getattr(module, attr))
+    return benchmarks
+
+
+def _parse_args(argv):
+    """ Parse command line arguments. """
+    parser = argparse.ArgumentParser(
+        description="Run P.E.A.T. micro-benchmarks.")
+    parser.add_argument('-o', '--output', default='benchmarks.json',
+        help="results file (default: benchmarks.json)")
+    parser.add_argument('-k', '--keyword', default=None,
+        help="only run benchmarks whose name contains this")
+    parser.add_argument('--max-rows', type=int, default=1_000_000,
+        help="largest trial data size (up to 10000000; default: 1000000)")
+    parser.add_argument('--repeat', type=int, default=7,
+        help="timed batches per benchmark (default: 7)")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+        help="compare two results files instead of running")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """ Command line entry point. Returns a process exit code. """
+    args = _parse_args(argv)
+
+    if args.compare:
+        results = compare(*args.compare)
+        print(results.to_string(index=False,
+                                float_format=lambda x: f"{x:.4g}"))
+        return 0
+
+    suite = Suite(max_rows=args.max_rows, repeat=args.repeat)
+    for benchmark in find_benchmarks(args.keyword):
+        benchmark(suite)
+    suite.save(args.output)
+    print(f"Saved {len(suite.results)} results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
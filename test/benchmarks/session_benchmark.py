@@ -0,0 +1,238 @@
+""" End-to-end benchmark of the trial loop.
+
+    Runs the real Application (Tk window, staircases, level lookup,
+    trial rendering, timeline, record writer and settings store) with
+    the null audio backend, and answers every trial with a simulated
+    listener as soon as the response keys are bound. Intervals are
+    kept short and the lead-in/ISI are removed, so the run is not
+    dominated by waiting for the presentation.
+
+    Per-trial overhead is the time the Tk thread spends on:
+        response: selecting the response (MainView.on_1/on_2)
+        submit: the <<MainSubmit>> handler, which scores the trial,
+            queues the record, and sets up and starts the next trial
+        audio: present_audio (part of submit)
+        bind_keys: re-enabling the response keys
+
+    From the repository root (needs a display):
+
+        python -m test.benchmarks.session_benchmark --trials 300 -o session.json
+
+    The output has the same format as run_benchmarks, so two runs can
+    be compared with run_benchmarks --compare. The session's data,
+    settings and log files are written to a temporary directory (the
+    home/app data environment variables point there while the app
+    runs), so the user's own settings are neither used nor changed.
+"""
+
+###########
+# Imports #
+###########
+# Standard library
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+# Third party
+import numpy as np
+
+# Custom Modules
+import controller
+import models
+from test.benchmarks.harness import metadata
+
+#############
+# Constants #
+#############
+PERCENTILES = [50, 90, 95, 99]
+
+COMPONENTS = ['total', 'response', 'submit', 'audio', 'bind_keys']
+
+# Environment variables that locate the user's config directory
+CONFIG_ENV_VARS = ['HOME', 'USERPROFILE', 'APPDATA', 'LOCALAPPDATA',
+                   'XDG_CONFIG_HOME']
+
+#############
+# Functions #
+#############
+def summarize(times_ms):
+    """ Percentiles, mean and max of a list of times (ms). """
+    times = np.asarray(times_ms) / 1000
+    summary = {f"p{p}": float(np.percentile(times, p)) for p in PERCENTILES}
+    summary.update({
+        'median': summary['p50'],
+        'mean': float(times.mean()),
+        'max': float(times.max()),
+        'count': int(times.size),
+    })
+    return summary
+
+
+def _timed(func, times):
+    """ Wrap func to append its duration (ms) to times. """
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            times.append((time.perf_counter() - start) * 1000)
+    return wrapper
+
+
+def _calc_level(app, desired_spl):
+    """ Stand-in for Application._calc_level, whose calibration
+        model (calmodel) is not loaded by the app: dB FS = desired
+        SPL - slm_offset, as in the session simulator.
+    """
+    level = desired_spl - app.settings['slm_offset'].get()
+    app.settings['adjusted_level_dB'].set(level)
+    return level
+
+
+def run_session(num_trials, settings, threshold=20.0, seed=0):
+    """ Run the app until num_trials trials have been answered (or
+        the session ends).
+
+        Returns: dict of per-trial times (ms) for each component
+    """
+    times = {component: [] for component in COMPONENTS}
+    times['jitter'] = []
+
+    # The app finds its config directory (settings, logs) from the
+    # user's home/app data folders. Point them at the working
+    # directory before the app starts, so it loads default settings
+    # and never writes the benchmark settings into the real config.
+    home = os.path.abspath('home')
+    os.makedirs(home, exist_ok=True)
+    config_env = {name: home for name in CONFIG_ENV_VARS}
+
+    # Dialogs would wait for a click
+    with mock.patch.dict(os.environ, config_env), \
+            mock.patch.multiple(controller.messagebox,
+                                showinfo=mock.DEFAULT,
+                                showwarning=mock.DEFAULT,
+                                showerror=mock.DEFAULT), \
+            mock.patch.object(controller.Application, '_calc_level',
+                              _calc_level):
+        app = controller.Application()
+
+        for key, value in settings.items():
+            app.settings[key].set(value)
+        app.renderer = models.TrialRenderer(fs=app.FS, lead_in=0, isi=0)
+
+        freqs, _ = app.stim_model.get_test_freqs()
+        observer = models.Observer({freq: threshold for freq in freqs},
+                                   seed=seed)
+
+        app._on_submit = _timed(app._on_submit, times['submit'])
+        app.present_audio = _timed(app.present_audio, times['audio'])
+        bind_keys = _timed(app.bind_keys, times['bind_keys'])
+
+        def on_trial_done():
+            bind_keys()
+            app.after_idle(respond)
+
+        def respond():
+            times['jitter'].append(
+                max(abs(err) for _, err in app.timeline.jitter))
+            if app.trial >= num_trials:
+                app._quit()
+                return
+            correct = observer.respond(app.staircase_level,
+                                       app.current_freq)
+            interval = app.stim_interval if correct \
+                else 3 - app.stim_interval
+            start = time.perf_counter()
+            if interval == 1:
+                app.main_frame.on_1()
+            else:
+                app.main_frame.on_2()
+            times['response'].append((time.perf_counter() - start) * 1000)
+            app.main_frame._on_submit()
+            times['total'].append(times['response'][-1]
+                                  + times['submit'][-1]
+                                  + times['bind_keys'][-1])
+
+        app.bind_keys = on_trial_done
+        app.after_idle(app.start_new_run)
+        app.mainloop()
+
+    return times
+
+
+def _parse_args(argv):
+    """ Parse command line arguments. """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the P.E.A.T. trial loop with a null "
+                    "audio backend and a simulated listener.")
+    parser.add_argument('--trials', type=int, default=300,
+        help="number of trials to answer (default: 300)")
+    parser.add_argument('--duration', type=float, default=0.05,
+        help="interval duration in seconds (default: 0.05)")
+    parser.add_argument('--reversals', type=int, default=16,
+        help="reversals per staircase (default: 16)")
+    parser.add_argument('--channels', type=int, default=1,
+        help="number of stimulus channels (default: 1)")
+    parser.add_argument('--interleave', default='Off',
+        help="interleaving policy (default: Off)")
+    parser.add_argument('--estimator', default='Staircase',
+        help="Staircase or QUEST (default: Staircase)")
+    parser.add_argument('--seed', type=int, default=0,
+        help="seed of the simulated listener (default: 0)")
+    parser.add_argument('-o', '--output', default=None,
+        help="results file (JSON)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """ Command line entry point. Returns a process exit code. """
+    args = _parse_args(argv)
+    settings = {
+        'subject': 'BENCH',
+        'condition': 'SESSION',
+        'disp_plots': 0,
+        'duration': args.duration,
+        'num_reversals': args.reversals,
+        'num_stim_chans': args.channels,
+        'channel_routing': " ".join(
+            str(chan) for chan in range(1, args.channels + 1)),
+        'interleave_policy': args.interleave,
+        'estimator': args.estimator,
+        'audio_backend': 'null',
+    }
+    output = os.path.abspath(args.output) if args.output else None
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            times = run_session(args.trials, settings, seed=args.seed)
+        finally:
+            os.chdir(cwd)
+
+    params = {'trials': len(times['total']), 'channels': args.channels,
+              'interleave': args.interleave, 'estimator': args.estimator}
+    results = []
+    for component in COMPONENTS + ['jitter']:
+        if not times[component]:
+            continue
+        result = {'name': f"session {component}", 'params': params}
+        result.update(summarize(times[component]))
+        results.append(result)
+        print(f"{component:<10} " + "  ".join(
+            f"p{p} {result[f'p{p}'] * 1000:7.2f} ms" for p in PERCENTILES)
+            + f"  max {result['max'] * 1000:7.2f} ms")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump({'meta': metadata(), 'results': results}, f, indent=2)
+        print(f"Saved {len(results)} results to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
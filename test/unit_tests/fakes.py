@@ -0,0 +1,39 @@
+""" Stand-ins shared by the unit tests. """
+
+###########
+# Imports #
+###########
+# Third party
+import numpy as np
+
+
+#########
+# Fakes #
+#########
+class FakeVar:
+    """ Stand-in for a Tk variable that counts reads. """
+    def __init__(self, value):
+        self.value = value
+        self.reads = 0
+
+    def get(self):
+        self.reads += 1
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class FakeStimulusModel:
+    """ Presentation level = staircase level + 10 dB, counting calls. """
+    def __init__(self):
+        self.calls = 0
+
+    def calc_presentation_lvl(self, stair_lvl, freq):
+        self.calls += 1
+        return np.round(stair_lvl + 10, 2)
+
+
+def calc_level(desired_spl):
+    """ Calibration with a 100 dB SLM offset. """
+    return desired_spl - 100
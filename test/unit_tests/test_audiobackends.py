@@ -0,0 +1,87 @@
+""" Unit tests for the null and WAV audio backends. """
+
+###########
+# Imports #
+###########
+# Standard library
+import wave
+
+# Third party
+import numpy as np
+
+# Testing
+import pytest
+
+# Custom Modules
+from models.audiobackends import NullSink
+from models.audiobackends import WavSink
+from models.audiobackends import create_backend
+from models.audiostream import AudioStream
+from models.audiostream import Clipping
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def audio():
+    return np.column_stack([np.full(100, 0.5), np.full(100, 2.0)])
+
+##############
+# Unit Tests #
+##############
+def test_null_sink_counts_presentations(audio):
+    # Arrange
+    sink = NullSink(device=0, routing=[1, 2], fs=1000)
+    # Act
+    sink.play(audio, level=-20)
+    sink.play(audio, level=-20)
+    sink.close()
+    # Assert
+    assert sink.presentations == 2
+    assert sink.frames == 200
+    assert len(sink.submit_latency_ms) == 2
+    assert not sink.active
+
+
+def test_null_sink_checks_clipping(audio):
+    # Arrange
+    sink = NullSink(device=0, routing=[1, 2], fs=1000)
+    # Act/Assert
+    with pytest.raises(Clipping):
+        sink.play(audio, level=6)
+
+
+def test_wav_sink_writes_routed_audio(tmp_path, audio):
+    # Arrange
+    filepath = tmp_path / 'out' / 'audio.wav'
+    sink = WavSink(device=0, routing=[1, 3], fs=1000, filepath=filepath)
+    # Act
+    sink.play(audio, level=-20)
+    sink.play(audio, level=-20)
+    sink.close()
+    # Assert
+    with wave.open(str(filepath), 'rb') as f:
+        assert f.getnchannels() == 3
+        assert f.getframerate() == 1000
+        assert f.getnframes() == 200
+        frames = f.readframes(f.getnframes())
+    samples = np.frombuffer(frames, dtype='<i4').reshape(-1, 3) / 2 ** 31
+    assert np.allclose(samples[:, [0, 2]], 0.1, atol=1e-6)
+    assert not np.any(samples[:, 1])
+
+
+def test_create_backend():
+    # Act
+    stream = create_backend('device', device=0, routing=[1], fs=1000)
+    sink = create_backend('null', device=0, routing=[1], fs=1000)
+    # Assert
+    assert type(stream) is AudioStream
+    assert type(sink) is NullSink
+    assert sink.key == (0, (1,), 1000)
+
+
+def test_create_backend_unknown():
+    # Act/Assert
+    with pytest.raises(ValueError):
+        create_backend('tape', device=0, routing=[1], fs=1000)
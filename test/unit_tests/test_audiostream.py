@@ -0,0 +1,119 @@
+""" Unit tests for AudioStream. The stream callback is driven
+    directly, so no sound device is needed.
+"""
+
+###########
+# Imports #
+###########
+# Third party
+import numpy as np
+
+# Testing
+import pytest
+
+# Custom Modules
+from models.audiostream import AudioStream
+from models.audiostream import Clipping
+from models.audiostream import InvalidRouting
+
+
+############
+# Fixtures #
+############
+class FakeStream:
+    """ Stand-in for an open sounddevice stream. """
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def stream():
+    stream = AudioStream(device=0, routing=[1, 3], fs=1000, blocksize=4)
+    stream._stream = FakeStream()
+    return stream
+
+
+def pull(stream, frames):
+    """ Run one callback and return its output. """
+    outdata = np.full((frames, stream.out_chans), np.nan, dtype=np.float32)
+    stream._callback(outdata, frames, None, None)
+    return outdata
+
+##############
+# Unit Tests #
+##############
+def test_prepare_scales_and_routes(stream):
+    # Arrange
+    audio = np.column_stack([np.full(8, 0.5), np.full(8, 2.0)])
+    # Act
+    out = stream.prepare(audio, level=-20)
+    # Assert
+    assert out.shape == (8, 3)
+    assert out.dtype == np.float32
+    assert np.allclose(out[:, [0, 2]], 0.1)
+    assert not np.any(out[:, 1])
+
+
+def test_prepare_matches_tmpy_levels(stream):
+    # Arrange: the level scaling of tmpy's AudioPlayer, per channel
+    tmsignals = pytest.importorskip('tmpy.dsp.tmsignals')
+    t = np.arange(1000) / 1000
+    audio = np.column_stack([0.3 * np.sin(2 * np.pi * 50 * t),
+                             0.05 * np.sin(2 * np.pi * 120 * t) + 0.01])
+    # Act
+    out = stream.prepare(audio, level=-25)
+    # Assert
+    for chan, out_chan in enumerate([0, 2]):
+        expected = tmsignals.setRMS(audio[:, chan].copy(), -25)
+        np.testing.assert_allclose(out[:, out_chan], np.ravel(expected),
+                                   rtol=1e-5, atol=1e-7)
+
+
+def test_prepare_invalid_routing(stream):
+    # Assert
+    with pytest.raises(InvalidRouting):
+        stream.prepare(np.ones((8, 1)), level=-20)
+
+
+def test_prepare_clipping(stream):
+    # Assert
+    with pytest.raises(Clipping) as e:
+        stream.prepare(np.ones((8, 2)), level=6)
+    assert np.max(e.value.audio) > 1
+
+
+def test_buffers_play_back_to_back(stream):
+    # Arrange
+    stream.play(np.ones((3, 2)), level=-20)
+    stream.play(np.ones((3, 2)), level=-40)
+    # Act
+    first = pull(stream, 4)
+    second = pull(stream, 4)
+    # Assert
+    assert np.allclose(first[:3, 0], 0.1)
+    assert np.allclose(first[3:, 0], 0.01)
+    assert np.allclose(second[:2, 0], 0.01)
+    assert not np.any(second[2:])
+    assert len(stream.submit_latency_ms) == 2
+    assert not stream.active
+
+
+def test_silence_when_idle(stream):
+    # Assert
+    assert not np.any(pull(stream, 4))
+
+
+def test_stop_drops_queued_audio(stream):
+    # Arrange
+    stream.play(np.ones((10, 2)), level=-20)
+    pull(stream, 4)
+    # Act
+    stream.stop()
+    stream.play(np.ones((2, 2)), level=-40)
+    out = pull(stream, 4)
+    # Assert
+    assert np.allclose(out[:2, 0], 0.01)
+    assert not np.any(out[2:])
@@ -0,0 +1,97 @@
+""" Unit tests for CallbackProfiler. """
+
+###########
+# Imports #
+###########
+# Standard library
+import os
+import pstats
+
+# Testing
+import pytest
+
+# Custom Modules
+from models.callbackprofiler import CallbackProfiler
+
+
+############
+# Fixtures #
+############
+class Target:
+    """ Object with methods to profile. """
+    def outer(self):
+        return self.inner() + 1
+
+    def inner(self):
+        return sum(range(100))
+
+    def fail(self):
+        raise ValueError("failed")
+
+##############
+# Unit Tests #
+##############
+def test_wrap_methods_counts_outermost_calls():
+    # Arrange
+    profiler = CallbackProfiler()
+    target = Target()
+    profiler.wrap_methods(target, ['outer', 'inner'])
+    # Act
+    result = target.outer()
+    target.inner()
+    # Assert
+    assert result == 4951
+    assert profiler.calls == 2
+
+
+def test_wrap_reraises_and_disables():
+    # Arrange
+    profiler = CallbackProfiler()
+    fail = profiler.wrap(Target().fail)
+    # Act
+    with pytest.raises(ValueError):
+        fail()
+    # Assert
+    assert profiler._depth == 0
+
+
+def test_paused_leaves_out_blocking_calls(tmp_path):
+    # Arrange
+    profiler = CallbackProfiler()
+    target = Target()
+
+    def callback():
+        with profiler.paused():
+            # Stands in for a modal dialog
+            target.inner()
+
+    # Act
+    profiler.wrap(callback)()
+    with profiler.paused():
+        pass
+    filepath = profiler.dump(tmp_path)
+    # Assert
+    stats = pstats.Stats(filepath)
+    names = {func[2] for func in stats.stats}
+    assert 'callback' in names
+    assert 'inner' not in names
+
+
+def test_dump_writes_pstats_file(tmp_path):
+    # Arrange
+    profiler = CallbackProfiler()
+    profiler.wrap(Target().outer)()
+    # Act
+    filepath = profiler.dump(tmp_path / 'profiles', name='S1_TEST')
+    # Assert
+    assert filepath.endswith('_S1_TEST.prof')
+    stats = pstats.Stats(filepath)
+    assert any(func[2] == 'inner' for func in stats.stats)
+
+
+def test_dump_without_calls(tmp_path):
+    # Act
+    filepath = CallbackProfiler().dump(tmp_path)
+    # Assert
+    assert filepath is None
+    assert not os.listdir(tmp_path)
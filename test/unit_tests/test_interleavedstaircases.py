@@ -0,0 +1,129 @@
+""" Unit tests for InterleavedStaircases. """
+
+###########
+# Imports #
+###########
+# Standard library
+from collections import Counter
+from types import SimpleNamespace
+
+# Testing
+import pytest
+
+# Custom Modules
+from models.interleavedstaircases import InterleavedStaircases
+
+
+############
+# Fixtures #
+############
+class FakeStaircase:
+    """ Reverses on every incorrect response; ends after
+        num_reversals reversals.
+    """
+    def __init__(self, num_reversals=2):
+        self.num_reversals = num_reversals
+        self.current_level = 30
+        self.status = True
+        self.dw = SimpleNamespace(datapoints=[])
+
+    def add_response(self, response):
+        reversal = response == -1
+        self.dw.datapoints.append(
+            SimpleNamespace(response=response, reversal=reversal))
+        reversals = sum(dp.reversal for dp in self.dw.datapoints)
+        self.status = reversals < self.num_reversals
+
+
+@pytest.fixture
+def staircases():
+    return {freq: FakeStaircase() for freq in (500, 1000, 2000)}
+
+##############
+# Unit Tests #
+##############
+def test_round_robin(staircases):
+    # Arrange
+    interleaver = InterleavedStaircases(staircases, policy='round_robin')
+    # Act
+    order = []
+    for _ in range(6):
+        order.append(interleaver.next_freq())
+        interleaver.add_response(1)
+    # Assert
+    assert order == [500, 1000, 2000, 500, 1000, 2000]
+
+
+def test_round_robin_skips_finished(staircases):
+    # Arrange
+    interleaver = InterleavedStaircases(staircases, policy='round_robin')
+    staircases[1000].status = False
+    # Act
+    order = []
+    for _ in range(4):
+        order.append(interleaver.next_freq())
+        interleaver.add_response(1)
+    # Assert
+    assert order == [500, 2000, 500, 2000]
+
+
+def test_most_uncertain_prefers_fewest_reversals(staircases):
+    # Arrange
+    interleaver = InterleavedStaircases(staircases,
+                                        policy='most_uncertain')
+    # Act: a reversal at 500 Hz sends the next trials elsewhere
+    assert interleaver.next_freq() == 500
+    interleaver.add_response(-1)
+    # Assert
+    assert interleaver.next_freq() == 1000
+    interleaver.add_response(1)
+    assert interleaver.next_freq() == 2000
+    interleaver.add_response(1)
+    assert interleaver.next_freq() == 1000
+
+
+def test_separate_histories_and_counts(staircases):
+    # Arrange
+    interleaver = InterleavedStaircases(staircases, policy='random',
+                                        seed=4)
+    # Act
+    while interleaver.status:
+        interleaver.next_freq()
+        interleaver.add_response(-1)
+    # Assert
+    assert interleaver.reversals == {500: 2, 1000: 2, 2000: 2}
+    assert all(len(s.dw.datapoints) == 2 for s in staircases.values())
+    assert Counter(freq for freq, _ in interleaver.history) \
+        == interleaver.trials
+    with pytest.raises(IndexError):
+        interleaver.next_freq()
+
+
+def test_custom_policy(staircases):
+    # Arrange
+    interleaver = InterleavedStaircases(
+        staircases, policy=lambda freqs, _: freqs[-1])
+    # Assert
+    assert interleaver.next_freq() == 2000
+
+
+def test_unknown_policy(staircases):
+    # Assert
+    with pytest.raises(ValueError):
+        InterleavedStaircases(staircases, policy='fastest')
+
+
+def test_accepts_pairs():
+    # Act
+    interleaver = InterleavedStaircases(
+        [(500, FakeStaircase()), (1000, FakeStaircase())])
+    # Assert
+    assert interleaver.freqs == [500, 1000]
+
+
+def test_repeated_frequencies_rejected():
+    # Assert
+    with pytest.raises(ValueError, match="1000"):
+        InterleavedStaircases(
+            [(1000, FakeStaircase()), (500, FakeStaircase()),
+             (1000, FakeStaircase())])
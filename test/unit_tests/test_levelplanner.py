@@ -0,0 +1,102 @@
+""" Unit tests for LevelPlanner. """
+
+###########
+# Imports #
+###########
+# Third party
+import numpy as np
+
+# Testing
+import pytest
+
+# Custom Modules
+from models.levelplanner import LevelPlanner
+from models.levelplanner import crest_factor_db
+from test.unit_tests.fakes import FakeStimulusModel
+from test.unit_tests.fakes import calc_level
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def stim_model():
+    return FakeStimulusModel()
+
+@pytest.fixture
+def planner(stim_model):
+    return LevelPlanner(
+        stim_model=stim_model,
+        freq=1000,
+        start_level=30,
+        step_sizes=[10, 5, 2],
+        min_level=-50,
+        max_level=90,
+        calc_level=calc_level
+    )
+
+##############
+# Unit Tests #
+##############
+def test_reachable_levels():
+    # Act
+    levels = LevelPlanner.reachable_levels(
+        start_level=3, step_sizes=[4], min_level=0, max_level=10)
+    # Assert: clamping at the limits opens up new levels
+    assert list(levels) == [0, 2, 3, 4, 6, 7, 8, 10]
+
+
+def test_every_level_on_the_grid(planner):
+    # Assert: steps of 2 and 5 reach every integer in range
+    assert list(planner.levels) == list(range(-50, 91))
+
+
+def test_lookup(planner):
+    # Act
+    desired, adjusted = planner.lookup(42)
+    # Assert
+    assert desired == 52
+    assert adjusted == -48
+
+
+def test_lookup_matches_direct_calculation(planner):
+    # Arrange
+    stim_model = FakeStimulusModel()
+    for level in planner.levels:
+        # Act
+        desired, adjusted = planner.lookup(level)
+        # Assert: same as calculating the level during the trial
+        expected = stim_model.calc_presentation_lvl(stair_lvl=level,
+                                                    freq=1000)
+        assert desired == expected
+        assert adjusted == calc_level(expected)
+
+
+def test_lookup_needs_no_calculation(planner, stim_model):
+    # Arrange
+    calls = stim_model.calls
+    # Act
+    for level in range(-50, 91):
+        planner.lookup(level)
+    # Assert
+    assert stim_model.calls == calls
+
+
+def test_lookup_unreachable_level(planner):
+    # Assert
+    with pytest.raises(KeyError):
+        planner.lookup(30.5)
+
+
+def test_clipping_levels(planner):
+    # Act: adjusted = level - 90, plus a 3 dB crest factor
+    clipping = planner.clipping_levels()
+    # Assert
+    assert list(clipping) == [87, 88, 89, 90]
+
+
+def test_crest_factor_of_sine():
+    # Arrange
+    sine = np.sin(2 * np.pi * np.arange(1000) / 100)
+    # Assert
+    assert crest_factor_db(sine) == pytest.approx(3.01, abs=0.01)
@@ -0,0 +1,118 @@
+""" Unit tests for QuestHandler. """
+
+###########
+# Imports #
+###########
+# Third party
+import numpy as np
+import pandas as pd
+
+# Testing
+import pytest
+
+# Custom Modules
+from models.questhandler import QuestHandler
+from models.observer import Observer
+from models.observer import default_settings
+from models.staircaseoptimizer import target_level
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def quest():
+    return QuestHandler(start_val=30, min_val=-50, max_val=90, step=2,
+                        stop_sd=2.0)
+
+
+def run_track(quest, observer, freq=1000):
+    while quest.status:
+        if observer.respond(quest.current_level, freq):
+            quest.add_response(1)
+        else:
+            quest.add_response(-1)
+    return quest
+
+##############
+# Unit Tests #
+##############
+def test_first_level_is_start(quest):
+    # Assert
+    assert quest.current_level == 30
+
+
+def test_levels_on_step_grid(quest):
+    # Arrange
+    observer = Observer({1000: 10}, seed=0)
+    # Act
+    run_track(quest, observer)
+    # Assert
+    levels = np.array([dp.level for dp in quest.dw.datapoints])
+    assert np.all((levels - 30) % 2 == 0)
+
+
+def test_stops_at_criterion(quest):
+    # Arrange
+    observer = Observer({1000: 10}, seed=1)
+    # Act
+    run_track(quest, observer)
+    # Assert
+    assert quest.threshold_sd <= 2.0
+    assert quest.min_trials <= len(quest.dw.datapoints) < quest.max_trials
+
+
+def test_estimate_is_unbiased():
+    # Arrange
+    target = target_level(10)
+    errors = []
+    # Act
+    for seed in range(200):
+        quest = QuestHandler(start_val=30, min_val=-50, max_val=90,
+                             step=1, stop_sd=2.0)
+        run_track(quest, Observer({1000: 10}, seed=seed))
+        errors.append(quest.threshold - target)
+    # Assert
+    assert abs(np.mean(errors)) < 1.0
+    assert np.std(errors) < 4.0
+
+
+def test_estimate_follows_responses(quest):
+    # Act
+    quest.add_response(1)
+    after_correct = quest.threshold
+    quest.add_response(-1)
+    # Assert
+    assert after_correct < 30
+    assert quest.threshold > after_correct
+
+
+def test_no_responses_after_stop(quest):
+    # Arrange
+    quest.status = False
+    # Assert
+    with pytest.raises(RuntimeError):
+        quest.add_response(1)
+
+
+def test_fewer_trials_than_staircase(tmp_path):
+    # Arrange
+    pytest.importorskip('tmpy.handlers')
+    from models.sessionsimulator import simulate_session
+    thresholds = {500: 10, 1000: 20}
+    counts = dict()
+    # Act
+    for estimator in ('Staircase', 'QUEST'):
+        settings = default_settings(test_freqs='500, 1000',
+                                    estimator=estimator, num_reversals=8,
+                                    step_sizes='5, 2', stop_sd_dB=3.0)
+        filepath = str(tmp_path / f"{estimator}.csv")
+        counts[estimator] = np.mean([
+            simulate_session(filepath, thresholds, settings=settings,
+                             seed=seed)
+            for seed in range(20)
+        ])
+    # Assert: QUEST records have the same schema
+    data = pd.read_csv(tmp_path / 'QUEST.csv')
+    assert data['reversal'].dtype == bool
+    assert counts['QUEST'] < counts['Staircase']
@@ -0,0 +1,91 @@
+""" Unit tests for RecordWriter. """
+
+###########
+# Imports #
+###########
+# Standard library
+import csv
+import os
+
+# Testing
+import pytest
+
+# Custom Modules
+from models.recordwriter import RecordWriter
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def filepath(tmp_path):
+    return str(tmp_path / 'Data' / 'test.csv')
+
+
+def read_rows(filepath):
+    with open(filepath, newline='') as f:
+        return list(csv.DictReader(f))
+
+##############
+# Unit Tests #
+##############
+def test_records_written_in_order(filepath):
+    # Arrange
+    writer = RecordWriter(filepath, batch_size=3)
+    # Act
+    for trial in range(10):
+        writer.write({'trial': trial, 'response': trial % 2})
+    writer.flush(timeout=5)
+    # Assert
+    rows = read_rows(filepath)
+    assert [int(row['trial']) for row in rows] == list(range(10))
+    assert writer.queue_depth == 0
+    assert writer.write_latency_ms
+    writer.close(timeout=5)
+
+
+def test_appends_without_second_header(filepath):
+    # Arrange
+    for _ in range(2):
+        writer = RecordWriter(filepath)
+        writer.write({'trial': 1})
+        # Act
+        writer.close(timeout=5)
+    # Assert
+    assert len(read_rows(filepath)) == 2
+
+
+def test_flush_without_records(filepath):
+    # Act
+    RecordWriter(filepath).flush(timeout=5)
+    # Assert
+    assert not os.path.exists(filepath)
+
+
+def test_write_error_is_raised(tmp_path):
+    # Arrange: the parent "directory" is a file
+    (tmp_path / 'Data').write_text('')
+    writer = RecordWriter(str(tmp_path / 'Data' / 'test.csv'))
+    writer.write({'trial': 1})
+    # Assert
+    with pytest.raises(OSError):
+        writer.flush(timeout=5)
+    with pytest.raises(OSError):
+        writer.write({'trial': 2})
+
+
+def test_unexpected_error_is_raised(filepath):
+    # Arrange: a value the csv module cannot format
+    class Unprintable:
+        def __str__(self):
+            raise ValueError("cannot format")
+
+    writer = RecordWriter(filepath)
+    writer.write({'trial': 1})
+    writer.write({'trial': Unprintable()})
+    # Assert: waiters are released and the error is raised
+    with pytest.raises(ValueError):
+        writer.flush(timeout=5)
+    with pytest.raises(ValueError):
+        writer.close(timeout=5)
+    assert writer._thread is None
@@ -0,0 +1,122 @@
+""" Unit tests for the headless scoring command line. """
+
+###########
+# Imports #
+###########
+# Testing
+import pytest
+
+# Data Science
+import pandas as pd
+
+# System
+import os
+import subprocess
+import sys
+
+# Custom Modules
+import score_thresholds
+from models.trialtimer import TIMING_DIRNAME
+
+#############
+# Constants #
+#############
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+# Run the scorer with the GUI/audio dependencies made unimportable
+NO_GUI_RUNNER = """
+import runpy
+import sys
+for name in ('tmpy', 'tkinter', 'sounddevice', 'soundfile'):
+    sys.modules[name] = None
+sys.argv = ['score_thresholds.py'] + sys.argv[1:]
+runpy.run_path('score_thresholds.py', run_name='__main__')
+"""
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def study_tree(tmpdir):
+    # Two sites with one session each
+    for site, subject in [('site_a', '1234'), ('site_b', '5678')]:
+        folder = tmpdir.mkdir(site).mkdir('data')
+        pd.DataFrame({
+            "subject": [subject] * 4,
+            "condition": ['A'] * 4,
+            "test_freq": [1000] * 4,
+            "desired_level_dB": [30, 35, 40, 45],
+            "reversal": [True, False, True, True],
+        }).to_csv(os.path.join(folder, "session.csv"), index=False)
+    return tmpdir
+
+
+##############
+# Unit Tests #
+##############
+def test_main_recursive(study_tree):
+    output = os.path.join(study_tree, 'out.csv')
+    assert score_thresholds.main(
+        [str(study_tree), '-r', '-n', '2', '-o', output]) == 0
+    thresholds = pd.read_csv(output, dtype={'subject': str})
+    assert list(thresholds['subject']) == ['1234', '5678']
+    assert list(thresholds['threshold']) == [42.5, 42.5]
+
+
+def test_main_skips_timing_files(study_tree):
+    # Arrange: a timing sidecar next to one session
+    timing_dir = study_tree.join('site_a', 'data').mkdir(TIMING_DIRNAME)
+    pd.DataFrame({'trial': [1], 'save_ms': [0.5]}).to_csv(
+        os.path.join(timing_dir, 'session_timing.csv'), index=False)
+    output = os.path.join(study_tree, 'out.csv')
+    # Act
+    assert score_thresholds.main(
+        [str(study_tree), '-r', '-n', '2', '-o', output]) == 0
+    # Assert
+    assert list(pd.read_csv(output)['threshold']) == [42.5, 42.5]
+
+
+def test_main_glob(study_tree):
+    output = os.path.join(study_tree, 'out.csv')
+    pattern = os.path.join(study_tree, 'site_*', 'data')
+    assert score_thresholds.main([pattern, '-n', '2', '-o', output]) == 0
+    assert len(pd.read_csv(output)) == 2
+
+
+def test_main_non_recursive_finds_nothing(study_tree):
+    output = os.path.join(study_tree, 'out.csv')
+    assert score_thresholds.main([str(study_tree), '-n', '2',
+                                  '-o', output]) == 1
+    assert not os.path.exists(output)
+
+
+def test_main_invalid_reversals(study_tree):
+    output = os.path.join(study_tree, 'out.csv')
+    assert score_thresholds.main(
+        [str(study_tree), '-r', '-n', '0', '-o', output]) == 1
+
+
+def test_main_sweep(study_tree):
+    output = os.path.join(study_tree, 'out.csv')
+    assert score_thresholds.main(
+        [str(study_tree), '-r', '-n', '1', '2', '-o', output]) == 0
+    sweep = pd.read_csv(output)
+    assert list(sweep['threshold_1']) == [45, 45]
+    assert list(sweep['threshold_2']) == [42.5, 42.5]
+
+
+def test_cli_runs_without_gui_dependencies(study_tree):
+    # Arrange
+    output = os.path.join(study_tree, 'out.csv')
+    env = dict(os.environ)
+    env.pop('PYTHONPATH', None)
+    # Act
+    result = subprocess.run(
+        [sys.executable, '-c', NO_GUI_RUNNER, str(study_tree), '-r',
+         '-n', '2', '-o', output],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    # Assert
+    assert result.returncode == 0, result.stderr
+    assert len(pd.read_csv(output)) == 2
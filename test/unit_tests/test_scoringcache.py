@@ -0,0 +1,105 @@
+""" Unit tests for ScoringCache. """
+
+###########
+# Imports #
+###########
+# Testing
+import pytest
+
+# Data Science
+import pandas as pd
+
+# System
+import os
+
+# Custom Modules
+from models.scoringcache import ScoringCache
+from models.scoringmodel import DTYPES
+from models.scoringmodel import KEYS
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def trial_file(tmpdir):
+    path = os.path.join(tmpdir, "session.csv")
+    pd.DataFrame({
+        "subject": ['1234'] * 4,
+        "condition": ['A'] * 4,
+        "test_freq": [1000] * 4,
+        "desired_level_dB": [30.0, 35.0, 40.0, 45.0],
+        "reversal": [True, False, True, True],
+    }).to_csv(path, index=False)
+    return path
+
+
+def _read(path):
+    return pd.read_csv(path, dtype=DTYPES)
+
+
+##############
+# Unit Tests #
+##############
+def test_new_file_is_not_current(tmpdir, trial_file):
+    cache = ScoringCache(str(tmpdir), DTYPES, KEYS)
+    assert not cache.is_current(trial_file)
+
+
+def test_update_keeps_reversal_rows_only(tmpdir, trial_file):
+    cache = ScoringCache(str(tmpdir), DTYPES, KEYS)
+    cache.update(trial_file, _read(trial_file))
+    revs = cache.get_reversals([trial_file])
+    assert list(revs['desired_level_dB']) == [30, 40, 45]
+
+
+def test_update_keeps_last_row_of_track_without_reversals(tmpdir):
+    path = os.path.join(tmpdir, "session.csv")
+    pd.DataFrame({
+        "subject": ['1234'] * 3,
+        "condition": ['A'] * 3,
+        "test_freq": [1000] * 3,
+        "desired_level_dB": [30.0, 25.0, 20.0],
+        "reversal": [False] * 3,
+    }).to_csv(path, index=False)
+    cache = ScoringCache(str(tmpdir), DTYPES, KEYS)
+    cache.update(path, _read(path))
+    revs = cache.get_reversals([path])
+    assert list(revs['desired_level_dB']) == [20]
+    assert not revs['reversal'].any()
+
+
+def test_cache_round_trip(tmpdir, trial_file):
+    cache = ScoringCache(str(tmpdir), DTYPES, KEYS)
+    cache.update(trial_file, _read(trial_file))
+    cache.save()
+
+    reloaded = ScoringCache(str(tmpdir), DTYPES, KEYS)
+    assert reloaded.is_current(trial_file)
+    pd.testing.assert_frame_equal(
+        reloaded.get_reversals([trial_file]),
+        cache.get_reversals([trial_file])
+    )
+
+
+def test_touched_file_with_same_contents_is_current(tmpdir, trial_file):
+    cache = ScoringCache(str(tmpdir), DTYPES, KEYS)
+    cache.update(trial_file, _read(trial_file))
+    stat = os.stat(trial_file)
+    os.utime(trial_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.is_current(trial_file)
+
+
+def test_changed_file_is_not_current(tmpdir, trial_file):
+    cache = ScoringCache(str(tmpdir), DTYPES, KEYS)
+    cache.update(trial_file, _read(trial_file))
+    with open(trial_file, 'a') as f:
+        f.write("1234,A,1000,50.0,True\n")
+    assert not cache.is_current(trial_file)
+
+
+def test_prune_removes_missing_files(tmpdir, trial_file):
+    cache = ScoringCache(str(tmpdir), DTYPES, KEYS)
+    cache.update(trial_file, _read(trial_file))
+    cache.prune([])
+    assert cache.manifest == {}
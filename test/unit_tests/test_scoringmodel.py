@@ -14,6 +14,7 @@ import pandas as pd
 import os
 
 # Custom Modules
+from models.scoringcache import CACHE_DIRNAME
 from models.scoringmodel import ScoringModel
 
 
@@ -57,7 +58,7 @@ def temp_csv_dir(tmpdir):
 @pytest.fixture
 def scoring_model(temp_csv_dir, monkeypatch):
     # Patch the file dialog to return the temporary directory
-    monkeypatch.setattr("models.scoringmodel.filedialog.askdirectory", 
+    monkeypatch.setattr("tkinter.filedialog.askdirectory", 
                         lambda: temp_csv_dir
     )
     # Create ScoringModel instance
@@ -80,8 +81,9 @@ def test__organize_data_output_columns(scoring_model):
     ["subject", "condition", "test_freq", "desired_level_dB", "reversal"]
 
 def test__organize_data_output_subjects(scoring_model):
-    assert list(scoring_model.data.iloc[:,0]) == list(np.repeat(1234, 4))\
-          + list(np.repeat(5678, 4))
+    # Subject IDs are always read as strings
+    assert list(scoring_model.data.iloc[:,0]) == list(np.repeat('1234', 4))\
+          + list(np.repeat('5678', 4))
 
 def test__organize_data_output_condition(scoring_model):
     assert list(scoring_model.data.iloc[:,1]) == list(np.repeat('A', 8))
@@ -94,6 +96,88 @@ def test__organize_data_output_reversals(scoring_model):
           [True, False, True, True, True, True, False, True]
 
 
+def test__organize_data_parallel_matches_serial(temp_csv_dir, monkeypatch):
+    monkeypatch.setattr("tkinter.filedialog.askdirectory",
+                        lambda: temp_csv_dir
+    )
+    serial = ScoringModel()
+    parallel = ScoringModel(workers=2)
+    pd.testing.assert_frame_equal(serial.data, parallel.data)
+
+def test__organize_data_ingest_stats(scoring_model):
+    assert scoring_model.ingest_stats['files'] == 2
+    assert scoring_model.ingest_stats['rows'] == 8
+    assert scoring_model.ingest_stats['rows_per_sec'] > 0
+
+def test__organize_data_incremental_matches_full(temp_csv_dir, monkeypatch):
+    monkeypatch.setattr("tkinter.filedialog.askdirectory",
+                        lambda: temp_csv_dir
+    )
+    monkeypatch.setattr(ScoringModel, "write_to_csv", lambda self, _: None)
+    full = ScoringModel()
+    full.score(2)
+    incremental = ScoringModel(incremental=True)
+    incremental.score(2)
+    pd.testing.assert_frame_equal(full.thresholds_df, 
+                                  incremental.thresholds_df)
+
+def test__organize_data_incremental_keeps_tracks_without_reversals(
+        temp_csv_dir, monkeypatch):
+    # A track that never reversed scores NaN in full scoring
+    pd.DataFrame({
+        "subject": ['9999'] * 3,
+        "condition": ['A'] * 3,
+        "test_freq": [1000] * 3,
+        "desired_level_dB": [20, 15, 10],
+        "reversal": [False] * 3,
+    }).to_csv(os.path.join(temp_csv_dir, "file3.csv"), index=False)
+    monkeypatch.setattr(ScoringModel, "write_to_csv", lambda self, _: None)
+    full = ScoringModel(directory=str(temp_csv_dir))
+    full.score(2)
+    assert full.thresholds_df.shape == (3, 4)
+    # Fresh and cached incremental runs score the same rows
+    for _ in range(2):
+        incremental = ScoringModel(directory=str(temp_csv_dir),
+                                   incremental=True)
+        incremental.score(2)
+        pd.testing.assert_frame_equal(full.thresholds_df,
+                                      incremental.thresholds_df)
+
+def test__organize_data_incremental_reads_only_new_files(temp_csv_dir, 
+                                                         monkeypatch):
+    monkeypatch.setattr("tkinter.filedialog.askdirectory",
+                        lambda: temp_csv_dir
+    )
+    ScoringModel(incremental=True)
+
+    # Add a third session
+    pd.DataFrame({
+        "subject": ['9999', '9999'],
+        "condition": ['A', 'A'],
+        "test_freq": [1000, 1000],
+        "desired_level_dB": [20, 25],
+        "reversal": [True, True],
+    }).to_csv(os.path.join(temp_csv_dir, "file3.csv"), index=False)
+
+    s = ScoringModel(incremental=True)
+    assert s.ingest_stats['files'] == 1
+    # Only reversal rows (and the last row of each track) are kept
+    assert len(s.data) == 8
+
+
+def test__organize_data_incremental_without_writable_cache(temp_csv_dir,
+                                                          monkeypatch):
+    # A file where the cache folder would go makes the cache
+    # unreadable and unwritable, as in a read-only data directory
+    open(os.path.join(temp_csv_dir, CACHE_DIRNAME), 'w').close()
+    monkeypatch.setattr(ScoringModel, "write_to_csv", lambda self, _: None)
+    full = ScoringModel(directory=str(temp_csv_dir))
+    full.score(2)
+    incremental = ScoringModel(directory=str(temp_csv_dir), incremental=True)
+    incremental.score(2)
+    pd.testing.assert_frame_equal(full.thresholds_df,
+                                  incremental.thresholds_df)
+
 
 def test__avg_revs(scoring_model):
     """ Have to make appropriate CSV files earlier
@@ -134,3 +218,144 @@ def test_score_threshold_data_frame(scoring_model, monkeypatch):
     assert scoring_model.thresholds_df.shape == (2,4)
     assert list(scoring_model.thresholds_df.columns) ==\
           ['subject', 'condition', 'test_freq', 'threshold']
+
+def test__last_n_means_matches_avg_revs(scoring_model):
+    # Random tracks of varying length, including one without reversals
+    rng = np.random.default_rng(42)
+    n_rows = 2000
+    data = pd.DataFrame({
+        "subject": rng.choice(['P1', 'P2', 'P3'], n_rows),
+        "condition": rng.choice(['A', 'B'], n_rows),
+        "test_freq": rng.choice([500, 1000, 2000, 4000], n_rows),
+        "desired_level_dB": np.round(rng.uniform(-10, 80, n_rows), 2),
+        "reversal": rng.random(n_rows) < 0.3,
+    })
+    data.loc[data['subject'] == 'P3', 'reversal'] = False
+
+    for n in range(1, 12):
+        expected = data.groupby(['subject', 'condition', 'test_freq']
+            ).apply(scoring_model._avg_revs, num_reversals=n)
+        actual = scoring_model._last_n_means(data, n)
+        assert list(actual.index) == list(expected.index)
+        np.testing.assert_array_equal(actual.to_numpy(), 
+                                      expected.to_numpy(dtype=float))
+
+def test_score_thresholds(scoring_model, monkeypatch):
+    monkeypatch.setattr(ScoringModel, "write_to_csv", lambda self, _: None)
+    scoring_model.score(2)
+    assert list(scoring_model.thresholds_df['threshold']) == [42.5, 60]
+
+def test_score_stream_matches_in_memory(tmpdir, monkeypatch):
+    # Tracks spread over several files, scored in tiny chunks
+    rng = np.random.default_rng(7)
+    for i in range(4):
+        n_rows = 300
+        pd.DataFrame({
+            "subject": rng.choice(['P1', 'P2'], n_rows),
+            "condition": rng.choice(['A', 'B'], n_rows),
+            "test_freq": rng.choice([500, 1000], n_rows),
+            "desired_level_dB": np.round(rng.uniform(-10, 80, n_rows), 2),
+            "reversal": rng.random(n_rows) < 0.3,
+        }).to_csv(os.path.join(tmpdir, f"file{i}.csv"), index=False)
+    monkeypatch.setattr("tkinter.filedialog.askdirectory",
+                        lambda: tmpdir
+    )
+    s = ScoringModel()
+    s_stream = ScoringModel(stream=True)
+    assert not hasattr(s_stream, 'data')
+
+    for n in [1, 3, 6]:
+        expected = s._last_n_means(s.data, n)
+        actual = s_stream._stream_thresholds(n, chunksize=50)
+        assert list(actual.index) == list(expected.index)
+        np.testing.assert_array_equal(actual.to_numpy(), expected.to_numpy())
+
+def test_sweep_matches_score(scoring_model, monkeypatch):
+    monkeypatch.setattr(ScoringModel, "write_to_csv", lambda self, _: None)
+    scoring_model.sweep([1, 2, 3])
+    for n in [1, 2, 3]:
+        scoring_model.score(n)
+        assert list(scoring_model.sweep_df[f'threshold_{n}']) ==\
+            list(scoring_model.thresholds_df['threshold'])
+
+def test_sweep_diagnostics(scoring_model, monkeypatch):
+    monkeypatch.setattr(ScoringModel, "write_to_csv", lambda self, _: None)
+    scoring_model.sweep([2])
+    sweep = scoring_model.sweep_df
+    assert list(sweep['sd_2']) == [3.54, 7.07]
+    assert list(sweep['num_trials']) == [4, 4]
+    assert list(sweep['num_reversals']) == [3, 3]
+    assert list(sweep['trials_to_first_reversal']) == [1, 1]
+    # No staircase level columns in these files
+    assert sweep['ended_at_limit'].isna().all()
+
+def test_sweep_ended_at_limit(tmpdir, monkeypatch):
+    monkeypatch.setattr(ScoringModel, "write_to_csv", lambda self, _: None)
+    pd.DataFrame({
+        "subject": ['1', '1', '2', '2', '3', '3'],
+        "condition": ['A'] * 6,
+        "test_freq": [1000] * 6,
+        "desired_level_dB": [10, 5, 60, 70, 30, 25],
+        "reversal": [False, True, False, True, False, True],
+        "staircase_level": [-40, -50, 80, 90, 20, 15],
+        "min_level": [-50] * 6,
+        "max_level": [90] * 6,
+    }).to_csv(os.path.join(tmpdir, "limits.csv"), index=False)
+    s = ScoringModel(directory=str(tmpdir), diagnostics=True)
+    s.sweep([1])
+    assert list(s.sweep_df['ended_at_limit']) == ['min_level', 'max_level', '']
+    assert list(s.sweep_df['trials_to_first_reversal']) == [2, 2, 2]
+
+def test_sweep_error_raised_in_stream_mode(temp_csv_dir):
+    s = ScoringModel(directory=str(temp_csv_dir), stream=True)
+    with pytest.raises(ValueError):
+        s.sweep([2])
+
+def test_score_skips_rows_with_blank_keys(tmpdir, monkeypatch):
+    # One blank subject, condition and test_freq cell each
+    monkeypatch.setattr(ScoringModel, "write_to_csv", lambda self, _: None)
+    with open(os.path.join(tmpdir, "blank.csv"), 'w') as f:
+        f.write("subject,condition,test_freq,desired_level_dB,reversal\n"
+                "1,A,1000,30,True\n"
+                ",A,1000,99,True\n"
+                "1,,1000,99,True\n"
+                "1,A,,99,True\n"
+                "1,A,1000,40,True\n")
+    s = ScoringModel(directory=str(tmpdir), diagnostics=True)
+    s.score(2)
+    assert list(s.thresholds_df['threshold']) == [35.0]
+    s.sweep([2])
+    assert list(s.sweep_df['threshold_2']) == [35.0]
+    assert list(s.sweep_df['num_trials']) == [2]
+    s_stream = ScoringModel(directory=str(tmpdir), stream=True)
+    s_stream.score(2)
+    assert list(s_stream.thresholds_df['threshold']) == [35.0]
+
+def test_score_uses_quest_estimates(tmpdir, monkeypatch):
+    # A QUEST track is scored from its last estimate, not its
+    # reversals; a staircase track in the same file is unchanged
+    monkeypatch.setattr(ScoringModel, "write_to_csv", lambda self, _: None)
+    with open(os.path.join(tmpdir, "quest.csv"), 'w') as f:
+        f.write("subject,condition,test_freq,desired_level_dB,reversal,"
+                "estimator,threshold_estimate\n"
+                "1,A,500,30,True,Staircase,\n"
+                "1,A,500,40,True,Staircase,\n"
+                "1,A,1000,30,True,QUEST,28.5\n"
+                "1,A,1000,50,False,QUEST,31.25\n"
+                "1,A,1000,40,True,QUEST,32.75\n")
+    # Older files without the estimate columns can be scored alongside
+    with open(os.path.join(tmpdir, "old.csv"), 'w') as f:
+        f.write("subject,condition,test_freq,desired_level_dB,reversal\n"
+                "2,A,500,20,True\n"
+                "2,A,500,30,True\n")
+    expected = [35.0, 32.75, 25.0]
+    # (incremental twice: from the files, then from the cache)
+    for kwargs in [{}, {'stream': True}, {'incremental': True},
+                   {'incremental': True}]:
+        s = ScoringModel(directory=str(tmpdir), **kwargs)
+        s.score(2)
+        assert list(s.thresholds_df['threshold']) == expected, kwargs
+    s = ScoringModel(directory=str(tmpdir))
+    s.sweep([2])
+    assert list(s.sweep_df['threshold_2']) == expected
+    assert np.isnan(s.sweep_df['sd_2'][1])
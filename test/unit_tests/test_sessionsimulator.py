@@ -0,0 +1,103 @@
+""" Unit tests for the session simulator. """
+
+###########
+# Imports #
+###########
+# Standard library
+import glob
+import os
+
+# Third party
+import numpy as np
+import pandas as pd
+
+# Testing
+import pytest
+
+# Custom Modules
+from models.scoringmodel import ScoringModel
+from models.observer import Observer
+from models.observer import default_settings
+from models.sessionsimulator import run_simulations
+from models.sessionsimulator import simulate_session
+from models.sessionsnapshot import RECORD_FIELDS
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def settings():
+    return default_settings(test_freqs='500, 1000', num_reversals=6)
+
+##############
+# Unit Tests #
+##############
+def test_observer_psychometric_function():
+    # Arrange
+    observer = Observer({1000: 20}, slope=2, lapse=0)
+    # Assert
+    assert observer.p_correct(20, 1000) == pytest.approx(0.75)
+    assert observer.p_correct(-40, 1000) == pytest.approx(0.5)
+    assert observer.p_correct(80, 1000) == pytest.approx(1.0)
+
+
+def test_session_csv_schema(tmp_path, settings):
+    # Arrange
+    filepath = str(tmp_path / 'sim.csv')
+    # Act
+    trials = simulate_session(filepath, {500: 10, 1000: 20},
+                              settings=settings, seed=1)
+    # Assert
+    data = pd.read_csv(filepath)
+    assert list(data.columns) == list(RECORD_FIELDS)
+    assert len(data) == trials
+    assert list(data['trial']) == list(range(1, trials + 1))
+    assert set(data['test_freq']) == {500, 1000}
+    assert (data.groupby('test_freq')['reversal'].sum() == 6).all()
+
+
+def test_sessions_are_reproducible(tmp_path, settings):
+    # Act
+    for name in ('a.csv', 'b.csv'):
+        simulate_session(str(tmp_path / name), {500: 10, 1000: 20},
+                         settings=settings, seed=7)
+    # Assert
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'a.csv'),
+                                  pd.read_csv(tmp_path / 'b.csv'))
+
+
+def test_simulations_can_be_scored(tmp_path):
+    # Act
+    sim_dir = str(tmp_path / 'sims')
+    stats = run_simulations(sim_dir, 4, thresholds={500: 10},
+                            workers=2, test_freqs='500', num_reversals=8)
+    s = ScoringModel(directory=sim_dir,
+                     output=str(tmp_path / 'thresholds.csv'))
+    s.score(6)
+    # Assert
+    assert stats['sessions'] == 4
+    assert len(glob.glob(os.path.join(sim_dir, '*.csv'))) == 4
+    assert len(s.thresholds_df) == 4
+    assert np.all(np.abs(s.thresholds_df['threshold'] - 10) < 15)
+
+
+def test_quest_session_records_estimates(tmp_path):
+    # Arrange
+    settings = default_settings(test_freqs='1000', estimator='QUEST',
+                                quest_min_trials=4, quest_max_trials=12)
+    filepath = str(tmp_path / 'quest.csv')
+    # Act
+    trials = simulate_session(filepath, {1000: 10}, settings=settings,
+                              seed=2)
+    # Assert
+    data = pd.read_csv(filepath)
+    assert 4 <= trials <= 12
+    assert (data['estimator'] == 'QUEST').all()
+    assert data['threshold_estimate'].notna().all()
+    assert (data['threshold_sd'] > 0).all()
+    s = ScoringModel(directory=str(tmp_path),
+                     output=str(tmp_path / 'thresholds.csv'))
+    s.score(6)
+    assert s.thresholds_df['threshold'][0] == \
+        data['threshold_estimate'].iloc[-1]
@@ -0,0 +1,77 @@
+""" Unit tests for SessionSnapshot. """
+
+###########
+# Imports #
+###########
+# Testing
+import pytest
+
+# Custom Modules
+from models.sessionsnapshot import RECORD_FIELDS
+from models.sessionsnapshot import RUN_FIELDS
+from models.sessionsnapshot import SessionSnapshot
+from test.unit_tests.fakes import FakeVar
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def settings():
+    return {field: FakeVar(f"{field}_value") for field in RUN_FIELDS
+            if field != 'test_freq'}
+
+@pytest.fixture
+def snapshot(settings):
+    return SessionSnapshot.from_settings(settings, test_freq=1000)
+
+@pytest.fixture
+def trial_values():
+    return {
+        'trial': 3,
+        'adjusted_level_dB': -30.0,
+        'desired_level_dB': 70.0,
+        'response': 1,
+        'reversal': False,
+        'staircase_level': 20.0,
+        'threshold_estimate': '',
+        'threshold_sd': '',
+    }
+
+##############
+# Unit Tests #
+##############
+def test_record_has_all_fields_in_order(snapshot, trial_values):
+    # Act
+    record = snapshot.record(**trial_values)
+    # Assert
+    assert tuple(record) == RECORD_FIELDS
+    assert record['subject'] == 'subject_value'
+    assert record['test_freq'] == 1000
+    assert record['staircase_level'] == 20.0
+
+
+def test_settings_read_once_per_run(settings, snapshot, trial_values):
+    # Arrange
+    reads = sum(var.reads for var in settings.values())
+    # Act
+    for trial in range(10):
+        snapshot.record(**dict(trial_values, trial=trial))
+    # Assert
+    assert sum(var.reads for var in settings.values()) == reads
+
+
+def test_snapshot_is_read_only(snapshot):
+    # Assert
+    with pytest.raises(AttributeError):
+        snapshot.subject = 'other'
+    with pytest.raises(AttributeError):
+        snapshot.new_field = 1
+
+
+def test_missing_trial_value(snapshot, trial_values):
+    # Arrange
+    del trial_values['response']
+    # Assert
+    with pytest.raises(KeyError):
+        snapshot.record(**trial_values)
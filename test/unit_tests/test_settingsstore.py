@@ -0,0 +1,126 @@
+""" Unit tests for SettingsStore. """
+
+###########
+# Imports #
+###########
+# Testing
+import pytest
+
+# Custom Modules
+from models.settingsstore import SettingsStore
+from test.unit_tests.fakes import FakeVar
+
+
+############
+# Fixtures #
+############
+class FakeRoot:
+    """ Stand-in for Tk after(); callbacks run when run() is called. """
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, ms, callback):
+        self._next_id += 1
+        self.pending[self._next_id] = callback
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run(self):
+        pending, self.pending = self.pending, {}
+        for callback in pending.values():
+            callback()
+
+
+class FakeSettingsModel:
+    """ Stand-in for the settings model; save() records a copy of the
+        values it would write.
+    """
+    def __init__(self):
+        self.fields = {
+            'subject': {'type': 'str', 'value': '999'},
+            'adjusted_level_dB': {'type': 'float', 'value': -25.0},
+        }
+        self.saved = []
+
+    def set(self, key, value):
+        self.fields[key]['value'] = value
+
+    def save(self):
+        self.saved.append({key: data['value']
+                           for key, data in self.fields.items()})
+
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+@pytest.fixture
+def settings_model():
+    return FakeSettingsModel()
+
+@pytest.fixture
+def settings(settings_model):
+    return {key: FakeVar(data['value'])
+            for key, data in settings_model.fields.items()}
+
+@pytest.fixture
+def store(root, settings_model, settings):
+    return SettingsStore(root, settings_model, settings)
+
+##############
+# Unit Tests #
+##############
+def test_no_write_when_unchanged(store, settings_model):
+    # Act
+    written = store.flush()
+    # Assert
+    assert not written
+    assert store.writes == 0
+    assert not settings_model.saved
+
+
+def test_rapid_saves_merge_into_one_write(root, store, settings,
+                                          settings_model):
+    # Act
+    for level in range(10):
+        settings['adjusted_level_dB'].set(float(level))
+        store.save()
+    root.run()
+    # Assert
+    assert store.writes == 1
+    assert settings_model.saved == [
+        {'subject': '999', 'adjusted_level_dB': 9.0}]
+
+
+def test_dirty_tracks_changed_keys(store, settings):
+    # Act
+    settings['subject'].set('P1')
+    # Assert
+    assert store.dirty() == ['subject']
+    store.flush()
+    assert store.dirty() == []
+
+
+def test_flush_cancels_pending_save(root, store, settings):
+    # Arrange
+    settings['subject'].set('P1')
+    store.save()
+    # Act
+    store.flush()
+    root.run()
+    # Assert
+    assert store.writes == 1
+    assert not root.pending
+
+
+def test_writes_through_model_save(store, settings, settings_model):
+    # Arrange
+    settings['subject'].set('P1')
+    # Act
+    store.flush()
+    # Assert
+    assert settings_model.saved == [
+        {'subject': 'P1', 'adjusted_level_dB': -25.0}]
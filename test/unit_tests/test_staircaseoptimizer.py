@@ -0,0 +1,129 @@
+""" Unit tests for the staircase optimizer. """
+
+###########
+# Imports #
+###########
+# Third party
+import numpy as np
+
+# Testing
+import pytest
+
+# Custom Modules
+from models.observer import Observer
+from models.staircaseoptimizer import TARGET_P
+from models.staircaseoptimizer import evaluate_grid
+from models.staircaseoptimizer import simulate_tracks
+from models.staircaseoptimizer import target_level
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def track_args():
+    return dict(
+        step_sizes=[4, 2],
+        num_reversals=8,
+        rapid_descend=False,
+        starting_level=30,
+        min_level=-50,
+        max_level=90,
+        threshold=10,
+        slope=2.0,
+        lapse=0.0,
+    )
+
+##############
+# Unit Tests #
+##############
+def test_target_level():
+    # Arrange
+    observer = Observer({0: 10}, slope=2, lapse=0.02)
+    # Act
+    level = target_level(10, slope=2, lapse=0.02)
+    # Assert
+    assert observer.p_correct(level, 0) == pytest.approx(TARGET_P)
+
+
+def test_tracks_converge_on_target(track_args):
+    # Act
+    tracks = simulate_tracks(20000, seed=1, score_reversals=6,
+                             **track_args)
+    # Assert
+    assert tracks['finished'].all()
+    target = target_level(10, slope=2, lapse=0)
+    assert np.mean(tracks['threshold']) == pytest.approx(target, abs=0.5)
+
+
+def test_reproducible(track_args):
+    # Act
+    first = simulate_tracks(100, seed=3, **track_args)
+    second = simulate_tracks(100, seed=3, **track_args)
+    # Assert
+    np.testing.assert_array_equal(first['trials'], second['trials'])
+
+
+def test_unfinished_tracks(track_args):
+    # Arrange: an observer who is always correct never reverses
+    track_args['threshold'] = -1000
+    # Act
+    tracks = simulate_tracks(10, max_trials=50, seed=0, **track_args)
+    # Assert
+    assert not tracks['finished'].any()
+    assert np.all(tracks['trials'] == 50)
+    assert np.all(np.isnan(tracks['threshold']))
+
+
+def test_tracks_match_app_staircase(track_args):
+    # Arrange: the app's staircase, created from the same settings
+    pytest.importorskip('tmpy.handlers')
+    from models.observer import default_settings
+    from models.trackfactory import create_staircase
+    settings = default_settings(
+        step_sizes='4, 2',
+        num_reversals=track_args['num_reversals'],
+        rapid_descend_bool=track_args['rapid_descend'],
+        starting_level=track_args['starting_level'],
+        min_level=track_args['min_level'],
+        max_level=track_args['max_level'],
+        estimator='Staircase'
+    )
+    responses = np.random.default_rng(5).random((3, 200)) < 0.75
+    # Act
+    tracks = simulate_tracks(3, responses=responses, record_levels=True,
+                             max_trials=200, **track_args)
+    # Assert: same level on every trial, same trial count
+    for track in range(3):
+        staircase = create_staircase(settings)
+        levels = []
+        while staircase.status and len(levels) < 200:
+            levels.append(staircase.current_level)
+            staircase.add_response(1 if responses[track, len(levels) - 1]
+                                   else -1)
+        assert tracks['trials'][track] == len(levels)
+        np.testing.assert_array_equal(
+            tracks['levels'][track, :len(levels)], levels)
+
+
+def test_invalid_score_reversals(track_args):
+    # Assert
+    with pytest.raises(ValueError):
+        simulate_tracks(10, score_reversals=9, **track_args)
+
+
+def test_evaluate_grid():
+    # Act
+    results = evaluate_grid(
+        step_sizes=[[10, 5, 2], [5, 2]],
+        num_reversals=[5, 8],
+        rapid_descend=[True, False],
+        starting_level=[30],
+        threshold=20,
+        num_tracks=500
+    )
+    # Assert
+    assert len(results) == 8
+    assert set(results['step_sizes']) == {"10, 5, 2", "5, 2"}
+    assert results['mean_trials'].is_monotonic_increasing
+    assert (results['finished'] == 1).all()
@@ -0,0 +1,108 @@
+""" Unit tests for StimulusModel's stimulus cache, prefetching and
+    batched synthesis. Only models.stimulusmodel (and the tmpy signal
+    functions it uses) is imported, so these run without the GUI
+    packages that test_stimulusmodel needs.
+"""
+
+###########
+# Imports #
+###########
+# Standard library
+import os
+import sys
+
+# Third party
+import numpy as np
+
+# Testing
+import pytest
+
+# Add custom path
+try:
+    sys.path.append(os.environ['TMPY'])
+except KeyError:
+    pass
+
+tmsignals = pytest.importorskip('tmpy.dsp.tmsignals')
+
+# Custom Modules
+from models.stimulusmodel import LEVEL_TOLERANCE_DB
+from models.stimulusmodel import StimulusModel
+from test.unit_tests.fakes import FakeVar
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def create_sessionpars():
+    sessionpars = {
+        'subject': FakeVar('P1234'),
+        'num_stim_chans': FakeVar(1),
+        'test_freqs': FakeVar('500, 1000, 2000, 4000'),
+    }
+    return sessionpars
+
+@pytest.fixture()
+def stim_model(create_sessionpars):
+    return StimulusModel(create_sessionpars)
+
+##############
+# Unit Tests #
+##############
+def test_create_stimulus_cached(stim_model):
+    sig = stim_model.create_stimulus(1,48000,1000,5,5)
+    assert stim_model.create_stimulus(1,48000,1000,5,5) is sig
+
+
+def test_create_stimulus_cache_key_includes_chans(stim_model):
+    sig = stim_model.create_stimulus(1,48000,1000,5,5)
+    stim_model.sessionpars['num_stim_chans'].set(3)
+    assert stim_model.create_stimulus(1,48000,1000,5,5).shape[1] == 3
+    assert sig.shape[1] == 1
+
+
+def test_create_stimulus_cache_evicts_lru(create_sessionpars):
+    # Budget fits a single 1-second, 1-channel stimulus
+    stim_model = StimulusModel(create_sessionpars, cache_budget_mb=0.5)
+    stim_model.create_stimulus(1,48000,1000,5,5)
+    stim_model.create_stimulus(1,48000,2000,5,5)
+    assert len(stim_model._cache) == 1
+    assert stim_model._cache_bytes <= stim_model.cache_budget
+
+
+def test_prefetch(stim_model):
+    stim_model.prefetch(1,48000,4000,5,5)
+    sig = stim_model.create_stimulus(1,48000,4000,5,5)
+    assert sig.shape == (48000, 1)
+    assert stim_model.create_stimulus(1,48000,4000,5,5) is sig
+
+
+def test_create_stimulus_matches_per_channel_synthesis(stim_model):
+    # Batched synthesis must match gating/scaling each channel separately
+    stim_model.sessionpars['num_stim_chans'].set(3)
+    phis = stim_model._get_random_phis()
+    sig = stim_model.create_stimulus(1,48000,1000,5,5)
+    for ii, phi in enumerate(phis):
+        wt = tmsignals.warble_tone(
+            dur=1, fs=48000, fc=1000, phi=phi, mod_rate=5, mod_depth=5)
+        wt = tmsignals.doGate(wt, rampdur=0.04, fs=48000)
+        wt = tmsignals.setRMS(wt, -40)
+        assert sig[:, ii] == pytest.approx(wt, abs=1e-9)
+    assert sig.flags['C_CONTIGUOUS']
+
+
+def test_create_stimulus_float32(create_sessionpars):
+    stim_model = StimulusModel(create_sessionpars, dtype='float32')
+    sig = stim_model.create_stimulus(1,48000,1000,5,5)
+    assert sig.dtype == 'float32'
+    # Level stays within tolerance of the float64 stimulus
+    ref = StimulusModel(create_sessionpars).create_stimulus(1,48000,1000,5,5)
+    rms = lambda x: 20 * np.log10(np.sqrt(np.mean(x.astype(float)**2)))
+    assert abs(rms(sig) - rms(ref)) < LEVEL_TOLERANCE_DB
+
+
+def test_check_level_raises(stim_model):
+    sig = np.full((100, 1), 10 ** (-39 / 20), dtype='float32')
+    with pytest.raises(ValueError):
+        stim_model._check_level(sig, -40)
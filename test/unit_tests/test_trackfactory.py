@@ -0,0 +1,66 @@
+""" Unit tests for the staircase and level plan factory. """
+
+###########
+# Imports #
+###########
+# Testing
+import pytest
+
+pytest.importorskip('tmpy.handlers')
+
+# Custom Modules
+from models.questhandler import QuestHandler
+from models.observer import default_settings
+from models.trackfactory import create_level_plan
+from models.trackfactory import create_staircase
+from models.trackfactory import get_step_sizes
+from models.trackfactory import trial_levels
+from test.unit_tests.fakes import FakeStimulusModel
+from test.unit_tests.fakes import calc_level
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def settings():
+    return default_settings(step_sizes='10, 5', starting_level=30,
+                            min_level=0, max_level=60)
+
+##############
+# Unit Tests #
+##############
+def test_get_step_sizes(settings):
+    # Assert
+    assert get_step_sizes(settings) == [10, 5]
+
+
+def test_create_staircase_follows_estimator(settings):
+    # Act
+    staircase = create_staircase(settings)
+    settings['estimator'].set('QUEST')
+    quest = create_staircase(settings)
+    # Assert
+    assert not isinstance(staircase, QuestHandler)
+    assert staircase.current_level == 30
+    assert isinstance(quest, QuestHandler)
+
+
+def test_trial_levels_uses_plan(settings):
+    # Arrange
+    plan = create_level_plan(settings, FakeStimulusModel(), 1000,
+                             calc_level)
+    # Act
+    levels = trial_levels(plan, FakeStimulusModel(), 1000, 25, calc_level)
+    # Assert
+    assert levels == (35.0, -65.0)
+
+
+def test_trial_levels_falls_back_outside_plan(settings):
+    # Arrange
+    plan = create_level_plan(settings, FakeStimulusModel(), 1000,
+                             calc_level)
+    # Act: 33 dB cannot be reached with 10 and 5 dB steps from 30 dB
+    levels = trial_levels(plan, FakeStimulusModel(), 1000, 33, calc_level)
+    # Assert
+    assert levels == (43.0, -57.0)
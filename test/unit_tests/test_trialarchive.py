@@ -0,0 +1,102 @@
+""" Unit tests for trialarchive. """
+
+###########
+# Imports #
+###########
+# Testing
+import pytest
+
+# Data Science
+import numpy as np
+import pandas as pd
+
+# System
+import os
+
+# Custom Modules
+from models import trialarchive
+from models.scoringmodel import ScoringModel
+
+# Archives require pyarrow
+pytest.importorskip('pyarrow')
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def temp_csv_dir(tmpdir):
+    # Two sessions, including a subject ID with a leading zero
+    # and a repeated session settings column
+    csv_dir = tmpdir.mkdir("csv")
+    for i, subject in enumerate(['0012', '5678']):
+        pd.DataFrame({
+            "trial": [1, 2, 3, 4],
+            "subject": np.repeat(subject, 4),
+            "condition": np.repeat('A', 4),
+            "step_sizes": np.repeat('10, 5, 2', 4),
+            "test_freq": np.repeat(1000, 4),
+            "desired_level_dB": [30.5, 35, 40, 45],
+            "reversal": [True, False, True, True],
+        }).to_csv(os.path.join(csv_dir, f"file{i}.csv"), index=False)
+    return csv_dir
+
+
+##############
+# Unit Tests #
+##############
+@pytest.mark.parametrize('suffix', trialarchive.ARCHIVE_SUFFIXES)
+def test_compact_round_trip(temp_csv_dir, tmpdir, suffix):
+    archive = os.path.join(tmpdir, "cohort" + suffix)
+    assert trialarchive.compact(temp_csv_dir, archive) == 8
+
+    data = trialarchive.read_archive(archive)
+    assert list(data['subject'].unique()) == ['0012', '5678']
+    assert isinstance(data['step_sizes'].dtype, pd.CategoricalDtype)
+    assert data['desired_level_dB'].dtype == 'float64'
+    assert list(data['source_file'].unique()) == ['file0.csv', 'file1.csv']
+
+
+def test_read_archive_projection(temp_csv_dir, tmpdir):
+    archive = os.path.join(tmpdir, "cohort.parquet")
+    trialarchive.compact(temp_csv_dir, archive)
+    data = trialarchive.read_archive(archive, columns=['subject', 'reversal'])
+    assert list(data.columns) == ['subject', 'reversal']
+
+
+def test_compact_invalid_suffix(temp_csv_dir, tmpdir):
+    with pytest.raises(ValueError):
+        trialarchive.compact(temp_csv_dir, os.path.join(tmpdir, "cohort.csv"))
+
+
+@pytest.mark.parametrize('subfolder', ['', 'archive'])
+def test_compact_refuses_archive_in_data_folder(temp_csv_dir, subfolder):
+    archive = os.path.join(temp_csv_dir, subfolder, "cohort.parquet")
+    with pytest.raises(ValueError):
+        trialarchive.compact(temp_csv_dir, archive)
+    assert not os.path.exists(archive)
+
+
+def test_score_archive_matches_csv(temp_csv_dir, tmpdir, monkeypatch):
+    archive_dir = tmpdir.mkdir("archive")
+    trialarchive.compact(temp_csv_dir, os.path.join(archive_dir, "a.parquet"))
+    monkeypatch.setattr(ScoringModel, "write_to_csv", lambda self, _: None)
+
+    results = []
+    for directory in [temp_csv_dir, archive_dir]:
+        monkeypatch.setattr("tkinter.filedialog.askdirectory",
+                            lambda: directory)
+        s = ScoringModel()
+        s.score(2)
+        results.append(s.thresholds_df)
+
+    pd.testing.assert_frame_equal(results[0], results[1])
+
+
+@pytest.mark.parametrize('suffix', trialarchive.ARCHIVE_SUFFIXES)
+def test_iter_archive(temp_csv_dir, tmpdir, suffix):
+    archive = os.path.join(tmpdir, "cohort" + suffix)
+    trialarchive.compact(temp_csv_dir, archive)
+    chunks = list(trialarchive.iter_archive(archive, ['subject'], 3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 2]
+    assert list(chunks[0].columns) == ['subject']
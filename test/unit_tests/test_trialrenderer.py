@@ -0,0 +1,72 @@
+""" Unit tests for TrialRenderer. """
+
+###########
+# Imports #
+###########
+# Third party
+import numpy as np
+
+# Testing
+import pytest
+
+# Custom Modules
+from models.trialrenderer import TrialRenderer
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def renderer():
+    return TrialRenderer(fs=1000, lead_in=0.5, isi=0.5)
+
+@pytest.fixture
+def stim():
+    return np.ones((200, 2), dtype=np.float32)
+
+##############
+# Unit Tests #
+##############
+@pytest.mark.parametrize('interval, start', [(1, 500), (2, 1250)])
+def test_stimulus_in_assigned_interval(renderer, stim, interval, start):
+    # Act
+    buffer, _ = renderer.render(stim, interval, interval_dur=0.25)
+    # Assert
+    assert buffer.shape == (1500, 2)
+    assert buffer.dtype == np.float32
+    assert np.all(buffer[start:start + 200] == 1)
+    assert np.count_nonzero(buffer) == stim.size
+
+
+def test_boundaries(renderer, stim):
+    # Act
+    _, bounds = renderer.render(stim, 1, interval_dur=0.25)
+    # Assert
+    assert bounds == {1: (0.5, 0.75), 2: (1.25, 1.5)}
+
+
+def test_buffer_is_reused_and_cleared(renderer, stim):
+    # Act
+    first, _ = renderer.render(stim, 1, interval_dur=0.25)
+    second, _ = renderer.render(stim, 2, interval_dur=0.25)
+    # Assert
+    assert first is second
+    assert not np.any(second[500:700])
+
+
+def test_buffer_level_keeps_stimulus_level(renderer, stim):
+    # Arrange
+    buffer, _ = renderer.render(stim * 0.1, 1, interval_dur=0.25)
+    # Act
+    level = renderer.buffer_level(-20)
+    # Assert: scaling the whole buffer to level puts the stimulus at -20
+    buffer_rms = np.sqrt(np.mean(buffer[:, 0].astype(np.float64) ** 2))
+    gain = 10 ** (level / 20) / buffer_rms
+    stim_rms = np.sqrt(np.mean((buffer[500:700, 0] * gain) ** 2))
+    assert 20 * np.log10(stim_rms) == pytest.approx(-20)
+
+
+def test_stimulus_longer_than_interval(renderer, stim):
+    # Assert
+    with pytest.raises(ValueError):
+        renderer.render(stim, 1, interval_dur=0.1)
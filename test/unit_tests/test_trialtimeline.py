@@ -0,0 +1,146 @@
+""" Unit tests for TrialTimeline. A fake clock and event loop run in
+    simulated time, so the tests do not depend on the machine's load.
+"""
+
+###########
+# Imports #
+###########
+# Standard library
+import heapq
+import itertools
+
+# Testing
+import pytest
+
+# Custom Modules
+from models.trialtimeline import TrialTimeline
+
+
+############
+# Fixtures #
+############
+class FakeClock:
+    """ Simulated monotonic clock. Each reading takes tick seconds,
+        so busy-waiting on it makes progress.
+    """
+    def __init__(self, tick=1e-6):
+        self.now = 0.0
+        self.tick = tick
+
+    def __call__(self):
+        now = self.now
+        self.now += self.tick
+        return now
+
+
+class FakeRoot:
+    """ Stand-in for the Tk after() event loop, in simulated time.
+        Callbacks run exactly when due; delays keeps every after()
+        request (ms).
+    """
+    def __init__(self, clock):
+        self.clock = clock
+        self.delays = []
+        self._queue = []
+        self._ids = itertools.count()
+        self._cancelled = set()
+
+    def after(self, ms, callback):
+        after_id = next(self._ids)
+        self.delays.append(ms)
+        due = self.clock.now + ms / 1000
+        heapq.heappush(self._queue, (due, after_id, callback))
+        return after_id
+
+    def after_cancel(self, after_id):
+        self._cancelled.add(after_id)
+
+    def mainloop(self):
+        while self._queue:
+            due, after_id, callback = heapq.heappop(self._queue)
+            self.clock.now = max(self.clock.now, due)
+            if after_id not in self._cancelled:
+                callback()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def root(clock):
+    return FakeRoot(clock)
+
+
+@pytest.fixture
+def timeline(root, clock):
+    return TrialTimeline(root, clock=clock)
+
+
+##############
+# Unit Tests #
+##############
+def test_events_run_in_order(root, timeline):
+    calls = []
+    timeline.add(0.06, lambda: calls.append('b'), 'b')
+    timeline.add(0.02, lambda: calls.append('a'), 'a')
+    timeline.start(on_done=lambda: calls.append('done'))
+    root.mainloop()
+    assert calls == ['a', 'b', 'done']
+    assert not timeline.running
+
+
+def test_coarse_wait_then_fine_checks(root, timeline):
+    timeline.add(0.1, lambda: None)
+    timeline.start()
+    # One coarse wait, up to COARSE_MARGIN before the deadline
+    assert root.delays == [84]
+    root.mainloop()
+    # Then 1 ms re-checks (never after(0)) until the last millisecond
+    assert root.delays[1:] == [1] * 15
+
+
+def test_events_run_on_time(root, clock, timeline):
+    times = []
+    for offset in [0.02, 0.05, 0.08]:
+        timeline.add(offset, lambda: times.append(clock.now))
+    timeline.start()
+    root.mainloop()
+    # Callbacks run within three clock readings of their deadline
+    # (the last spin, the jitter measurement and the callback's own)
+    assert [t - timeline._t0 for t in times] == \
+        pytest.approx([0.02, 0.05, 0.08], abs=3 * clock.tick)
+    # Measured lateness is at most two readings, and never early
+    assert len(timeline.jitter) == 3
+    assert all(0 < err <= 2 * clock.tick * 1000
+               for _, err in timeline.jitter)
+
+
+def test_late_event_does_not_delay_later_events(root, clock, timeline):
+    times = []
+
+    def slow_callback():
+        # The first callback takes 30 ms
+        times.append(clock.now)
+        clock.now += 0.03
+
+    timeline.add(0.01, slow_callback, 'slow')
+    timeline.add(0.02, lambda: times.append(clock.now), 'late')
+    timeline.add(0.05, lambda: times.append(clock.now), 'on time')
+    timeline.start()
+    root.mainloop()
+    # 'late' runs as soon as possible; 'on time' keeps its deadline
+    jitter = dict(timeline.jitter)
+    assert jitter['late'] == pytest.approx(20, abs=0.01)
+    assert times[2] - timeline._t0 == pytest.approx(0.05, abs=3 * clock.tick)
+    assert 0 < jitter['on time'] <= 2 * clock.tick * 1000
+
+
+def test_cancel(root, timeline):
+    calls = []
+    timeline.add(0.05, lambda: calls.append('a'))
+    timeline.start(on_done=lambda: calls.append('done'))
+    timeline.cancel()
+    root.mainloop()
+    assert calls == []
@@ -0,0 +1,80 @@
+""" Unit tests for TrialTimer. """
+
+###########
+# Imports #
+###########
+# Standard library
+import csv
+
+# Testing
+import pytest
+
+# Custom Modules
+from models.trialtimer import TIMING_FIELDS
+from models.trialtimer import TrialTimer
+
+
+############
+# Fixtures #
+############
+@pytest.fixture
+def timer(tmp_path):
+    return TrialTimer(tmp_path / 'Timing' / 'session_timing.csv')
+
+##############
+# Unit Tests #
+##############
+def test_end_trial_writes_row(timer):
+    # Arrange
+    timer.mark('response')
+    with timer.measure('save'):
+        pass
+    with timer.measure('audio_submit'):
+        pass
+    timer.mark('onset')
+    # Act
+    timer.end_trial(2)
+    timer.close()
+    # Assert
+    with open(timer.filepath, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == TIMING_FIELDS
+    assert rows[0]['trial'] == '2'
+    assert float(rows[0]['response_to_onset_ms']) >= 0
+    assert float(rows[0]['save_ms']) >= 0
+    assert rows[0]['flush_ms'] == ''
+
+
+def test_measure_accumulates(timer):
+    # Arrange
+    timer._durations['level'] = 1.0
+    # Act
+    with timer.measure('level'):
+        pass
+    timer.end_trial(1)
+    # Assert
+    assert timer.rows[0]['level_ms'] >= 1.0
+
+
+def test_unmark_skips_response_to_onset(timer):
+    # Arrange
+    timer.mark('response')
+    timer.unmark('response')
+    timer.mark('onset')
+    # Act
+    timer.end_trial(1)
+    # Assert
+    assert timer.rows[0]['response_to_onset_ms'] == ''
+
+
+def test_summary_percentiles(timer):
+    # Arrange
+    for trial in range(1, 101):
+        timer._durations['save'] = float(trial)
+        timer.end_trial(trial)
+    # Act
+    summary = timer.summary()
+    # Assert
+    assert summary['save_ms']['p50'] == pytest.approx(50.5)
+    assert summary['save_ms']['p99'] == pytest.approx(99.01)
+    assert 'level_ms' not in summary
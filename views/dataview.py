@@ -91,6 +91,15 @@ class ThresholdDialog(tk.Toplevel):
         ttk.Button(lfrm_options, text="Browse", 
                    command=self._create_scoring_class).grid(row=25, 
                     column=10, sticky='w', pady=(0, 10))
+
+        # Incremental scoring (off by default: it writes a cache
+        # folder into the data directory)
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(lfrm_options,
+            text="Only read new or changed files\n(keeps a cache in " +
+                "the data directory)",
+            variable=self.incremental_var
+            ).grid(row=15, column=10, sticky='w', pady=(0, 10))
         
         # Number of reversals entry box
         self.num_reversals_var = tk.IntVar(value=0)
@@ -131,7 +140,9 @@ class ThresholdDialog(tk.Toplevel):
     def _create_scoring_class(self):
         """ Instantiate Scoring Model. """
         # Instantiate ScoringModel object
-        self.s = scoringmodel.ScoringModel()
+        # (if incremental, only new or changed files are read from disk)
+        self.s = scoringmodel.ScoringModel(
+            incremental=self.incremental_var.get())
 
         # Retrieve and truncate threshold data directory path
         short_thresh_data_path = truncate_path(
@@ -101,6 +101,19 @@ class SettingsView(tk.Toplevel):
             hover_delay=tt_delay
         )
 
+        # Profiling
+        chk_profiling = ttk.Checkbutton(frm_session, text="Profile Session",
+            takefocus=0, variable=self.sessionpars['profiling'])
+        chk_profiling.grid(row=20, column=5,  columnspan=20, sticky='w', 
+            **widget_options)
+        profiling_tt = Hovertip(
+            anchor_widget=chk_profiling,
+            text="Save a performance profile to the config directory " +
+                "when the app closes. Takes effect the next time the " +
+                "app starts.",
+            hover_delay=tt_delay
+        )
+
 
         # STIMULUS #
         # Number of channels for stimulus
@@ -220,6 +233,81 @@ class SettingsView(tk.Toplevel):
             state='readonly'
         ).grid(row=30, column=10, sticky='w')
 
+        # Interleaving
+        lbl_interleave = ttk.Label(frm_staircase, text="Interleave:")
+        lbl_interleave.grid(row=35, column=5, sticky='e', **widget_options)
+        interleave_tt = Hovertip(
+            anchor_widget=lbl_interleave,
+            text="Run all frequencies at once, choosing the frequency " + \
+                "of each trial:\nRandom: any unfinished frequency\n" + \
+                "Round Robin: each frequency in turn\nMost Uncertain: " + \
+                "the frequency with the fewest reversals\nOff: test " + \
+                "frequencies one after another.",
+            hover_delay=tt_delay
+        )
+        vlist = ["Off", "Random", "Round Robin", "Most Uncertain"]
+        ttk.Combobox(
+            frm_staircase,
+            textvariable=self.sessionpars['interleave_policy'],
+            values=vlist,
+            state='readonly'
+        ).grid(row=35, column=10, sticky='w')
+
+        # Estimator
+        lbl_estimator = ttk.Label(frm_staircase, text="Estimator:")
+        lbl_estimator.grid(row=40, column=5, sticky='e', **widget_options)
+        estimator_tt = Hovertip(
+            anchor_widget=lbl_estimator,
+            text="Staircase: 1-up/2-down until all reversals are " + \
+                "collected.\nQUEST: Bayesian estimate that stops once " + \
+                "the threshold is known to within the stopping SD.",
+            hover_delay=tt_delay
+        )
+        vlist = ["Staircase", "QUEST"]
+        ttk.Combobox(
+            frm_staircase,
+            textvariable=self.sessionpars['estimator'],
+            values=vlist,
+            state='readonly'
+        ).grid(row=40, column=10, sticky='w')
+
+        # Stopping SD
+        lbl_stop_sd = ttk.Label(frm_staircase, text="Stopping SD (dB):")
+        lbl_stop_sd.grid(row=45, column=5, sticky='e', **widget_options)
+        stop_sd_tt = Hovertip(
+            anchor_widget=lbl_stop_sd,
+            text="QUEST only: stop once the SD of the threshold " + \
+                "estimate is at most this value.",
+            hover_delay=tt_delay
+        )
+        ttk.Entry(frm_staircase, width=20,
+            textvariable=self.sessionpars['stop_sd_dB']
+            ).grid(row=45, column=10, sticky='w')
+
+        # QUEST trial limits
+        lbl_min_trials = ttk.Label(frm_staircase, text="Min. Trials:")
+        lbl_min_trials.grid(row=50, column=5, sticky='e', **widget_options)
+        min_trials_tt = Hovertip(
+            anchor_widget=lbl_min_trials,
+            text="QUEST only: never stop before this many trials.",
+            hover_delay=tt_delay
+        )
+        ttk.Entry(frm_staircase, width=20,
+            textvariable=self.sessionpars['quest_min_trials']
+            ).grid(row=50, column=10, sticky='w')
+
+        lbl_max_trials = ttk.Label(frm_staircase, text="Max. Trials:")
+        lbl_max_trials.grid(row=55, column=5, sticky='e', **widget_options)
+        max_trials_tt = Hovertip(
+            anchor_widget=lbl_max_trials,
+            text="QUEST only: stop after this many trials, even if " + \
+                "the stopping SD has not been reached.",
+            hover_delay=tt_delay
+        )
+        ttk.Entry(frm_staircase, width=20,
+            textvariable=self.sessionpars['quest_max_trials']
+            ).grid(row=55, column=10, sticky='w')
+
         # Submit button
         btn_submit = ttk.Button(self, text="Submit", command=self._on_submit)
         btn_submit.grid(row=40, column=5, columnspan=2, pady=(0, 10))